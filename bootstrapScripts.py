@@ -0,0 +1,152 @@
+"""
+Bootstrap confidence intervals for shooting splits of all the players at once. Resampling a player's shots with
+replacement only changes how many of them were two pointers made, three pointers made and misses - so every resample
+of every player is a single multinomial draw over these three outcomes, and all the resamples of all the players are
+drawn as one (resamples x players) array.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+import shotChartScripts
+
+default_number_of_resamples = 2000
+default_confidence_level = 0.95
+
+
+def get_efg_percentage_resamples(
+        field_goal_makes: np.ndarray, three_pointer_makes: np.ndarray, field_goal_attempts: np.ndarray,
+        number_of_resamples: int = default_number_of_resamples, random_generator: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    """
+    :param field_goal_makes: The FGM of every player
+    :param three_pointer_makes: The FG3M of every player
+    :param field_goal_attempts: The FGA of every player
+    :param number_of_resamples: The number of bootstrap resamples
+    :param random_generator: The generator to draw the resamples with. A new one if None
+    :return: A (resamples x players) array of the EFG% of every resample of the shots of every player (0 for players
+    with no shots)
+    """
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+    field_goal_attempts = np.asarray(field_goal_attempts, dtype=np.int64)
+    outcomes_counts = np.stack([np.asarray(field_goal_makes) - np.asarray(three_pointer_makes),
+                                np.asarray(three_pointer_makes),
+                                field_goal_attempts - np.asarray(field_goal_makes)], axis=1).astype(np.float64)
+    outcomes_probabilities = np.divide(outcomes_counts, field_goal_attempts[:, None],
+                                       out=np.tile([0, 0, 1.0], (len(field_goal_attempts), 1)),
+                                       where=field_goal_attempts[:, None] > 0)
+    resampled_outcomes_counts = random_generator.multinomial(
+        field_goal_attempts, outcomes_probabilities, size=(number_of_resamples, len(field_goal_attempts)))
+    resampled_three_pointer_makes = resampled_outcomes_counts[..., 1]
+    resampled_field_goal_makes = resampled_outcomes_counts[..., 0] + resampled_three_pointer_makes
+    return shotChartScripts.get_efg_percentage_of_arrays(resampled_field_goal_makes, resampled_three_pointer_makes,
+                                                         field_goal_attempts)
+
+
+def get_confidence_intervals(resamples: np.ndarray, confidence_level: float = default_confidence_level) \
+        -> tuple[np.ndarray, np.ndarray]:
+    """
+    :param resamples: A (resamples x players) array of a metric
+    :param confidence_level: The portion of the resamples inside the interval
+    :return: tuple of the lower and the upper bounds (percentiles) of every player
+    """
+    tail_percentage = 100 * (1 - confidence_level) / 2
+    lower_bounds, upper_bounds = np.percentile(resamples, [tail_percentage, 100 - tail_percentage], axis=0)
+    return lower_bounds, upper_bounds
+
+
+def get_efg_percentage_confidence_intervals_df(
+        shooting_df: DataFrame, prefix: str = '', number_of_resamples: int = default_number_of_resamples,
+        confidence_level: float = default_confidence_level, random_generator: Optional[np.random.Generator] = None
+) -> DataFrame:
+    """
+    :param shooting_df: A df indexed by PLAYER_ID with the FGM, FG3M and FGA of every player
+    :param prefix: The prefix of the stats columns (OPEN_, LEFT_...)
+    :param number_of_resamples: The number of bootstrap resamples
+    :param confidence_level: The portion of the resamples inside the interval
+    :param random_generator: The generator to draw the resamples with. A new one if None
+    :return: A df with the same index, with FGA, EFG_PCT and its interval bounds (EFG_PCT_LOW and EFG_PCT_HIGH)
+    """
+    field_goal_makes, three_pointer_makes, field_goal_attempts = (
+        shooting_df[prefix + stat].to_numpy(dtype=np.int64) for stat in ['FGM', 'FG3M', 'FGA'])
+    resamples = get_efg_percentage_resamples(field_goal_makes, three_pointer_makes, field_goal_attempts,
+                                             number_of_resamples=number_of_resamples,
+                                             random_generator=random_generator)
+    lower_bounds, upper_bounds = get_confidence_intervals(resamples, confidence_level=confidence_level)
+    return DataFrame({
+        'FGA': field_goal_attempts,
+        'EFG_PCT': shotChartScripts.get_efg_percentage_of_arrays(field_goal_makes, three_pointer_makes,
+                                                                 field_goal_attempts),
+        'EFG_PCT_LOW': lower_bounds,
+        'EFG_PCT_HIGH': upper_bounds,
+    }, index=shooting_df.index)
+
+
+def get_efg_percentage_diff_confidence_intervals_df(
+        shooting_df: DataFrame, first_prefix: str, second_prefix: str,
+        number_of_resamples: int = default_number_of_resamples, confidence_level: float = default_confidence_level,
+        random_generator: Optional[np.random.Generator] = None
+) -> DataFrame:
+    """
+    The shots of both groups are resampled independently (every resample keeps the number of shots of every group)
+
+    :param shooting_df: A df indexed by PLAYER_ID with the FGM, FG3M and FGA of two groups of shots of every player
+    :param first_prefix: The prefix of the stats columns of the first group (OPEN_, LEFT_...)
+    :param second_prefix: The prefix of the stats columns of the second group (TIGHT_, RIGHT_...)
+    :param number_of_resamples: The number of bootstrap resamples
+    :param confidence_level: The portion of the resamples inside the interval
+    :param random_generator: The generator to draw the resamples with. A new one if None
+    :return: A df with the same index, with the FGA of both groups, EFG_PCT_DIFF (first minus second) and its interval
+    bounds (EFG_PCT_DIFF_LOW and EFG_PCT_DIFF_HIGH)
+    """
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+    efg_percentages, resamples = [], []
+    for prefix in [first_prefix, second_prefix]:
+        field_goal_makes, three_pointer_makes, field_goal_attempts = (
+            shooting_df[prefix + stat].to_numpy(dtype=np.int64) for stat in ['FGM', 'FG3M', 'FGA'])
+        efg_percentages.append(shotChartScripts.get_efg_percentage_of_arrays(field_goal_makes, three_pointer_makes,
+                                                                             field_goal_attempts))
+        resamples.append(get_efg_percentage_resamples(field_goal_makes, three_pointer_makes, field_goal_attempts,
+                                                      number_of_resamples=number_of_resamples,
+                                                      random_generator=random_generator))
+    lower_bounds, upper_bounds = get_confidence_intervals(resamples[0] - resamples[1],
+                                                          confidence_level=confidence_level)
+    return DataFrame({
+        f'{first_prefix}FGA': shooting_df[first_prefix + 'FGA'].to_numpy(),
+        f'{second_prefix}FGA': shooting_df[second_prefix + 'FGA'].to_numpy(),
+        'EFG_PCT_DIFF': efg_percentages[0] - efg_percentages[1],
+        'EFG_PCT_DIFF_LOW': lower_bounds,
+        'EFG_PCT_DIFF_HIGH': upper_bounds,
+    }, index=shooting_df.index)
+
+
+def get_shooting_after_makes_df(shot_chart_df: DataFrame, number_of_previous_shots: int = 1) -> DataFrame:
+    """
+    :param shot_chart_df: A shot chart df of any number of players
+    :param number_of_previous_shots: The number of consecutive makes before the shots
+    :return: A df indexed by PLAYER_ID with the FGM, FG3M and FGA of the shots after the makes
+    """
+    previous_shots_df = shotChartScripts.get_efg_percentage_by_previous_shots_results(
+        shot_chart_df, max_number_of_previous_shots=number_of_previous_shots)
+    after_makes_df = previous_shots_df[
+        (previous_shots_df['PREVIOUS_SHOTS_RESULT'] == shotChartScripts.SHOT_RESULT_MADE) &
+        (previous_shots_df['NUMBER_OF_PREVIOUS_SHOTS'] == number_of_previous_shots)]
+    return after_makes_df.set_index('PLAYER_ID')[['FGM', 'FG3M', 'FGA']]
+
+
+def get_shooting_by_side_df(shot_chart_df: DataFrame) -> DataFrame:
+    """
+    :param shot_chart_df: A shot chart df of any number of players, after shotChartScripts.add_zone_codes
+    :return: A df indexed by PLAYER_ID with the FGM, FG3M and FGA of the shots from every side of the floor (with LEFT_,
+    CENTER_ and RIGHT_ prefixes)
+    """
+    zone_df = shotChartScripts.get_efg_percentage_by_zone(shot_chart_df, 'SHOT_SIDE_CODE', by_player=True)
+    sides_df = zone_df.pivot(index='PLAYER_ID', columns='SHOT_SIDE_CODE', values=['FGM', 'FG3M', 'FGA'])
+    sides_df = sides_df.reindex(columns=pd.MultiIndex.from_product([['FGM', 'FG3M', 'FGA'],
+                                                                    range(len(shotChartScripts.SHOT_SIDES))]),
+                                fill_value=0).fillna(0).astype(np.int64)
+    sides_df.columns = [f'{shotChartScripts.SHOT_SIDES[side_code].upper()}_{stat}'
+                        for stat, side_code in sides_df.columns]
+    return sides_df
@@ -0,0 +1,61 @@
+"""
+Shooting by the distance of the closest defender, for all the players at once. The closest defender rows of every
+player are stacked in one df, and the contested (tight) and uncontested (open) shooting of all the players is a single
+grouped aggregation over it.
+"""
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+import shotChartScripts
+
+close_def_dist_ranges = ['0-2 Feet - Very Tight', '2-4 Feet - Tight', '4-6 Feet - Open', '6+ Feet - Wide Open']
+# Contested - defender within 4 feet
+tight_close_def_dist_ranges = ['0-2 Feet - Very Tight', '2-4 Feet - Tight']
+TIGHT = 'Tight'
+OPEN = 'Open'
+
+
+def get_distance_groups(close_def_dist_range: Series) -> np.ndarray:
+    """
+    :param close_def_dist_range: The CLOSE_DEF_DIST_RANGE column of a closest defender df
+    :return: The distance group (Tight or Open) of every row
+    """
+    return np.where(close_def_dist_range.isin(tight_close_def_dist_ranges).to_numpy(), TIGHT, OPEN)
+
+
+def get_contested_shooting_df(closest_defender_df: DataFrame, id_column: str = 'PLAYER_ID') -> DataFrame:
+    """
+    :param closest_defender_df: Closest defender shooting rows (FGM, FGA, FG3M for every CLOSE_DEF_DIST_RANGE) of any
+    number of players
+    :param id_column: The column of the players ids
+    :return: A df indexed by the ids, with the FGM, FG3M, FGA and EFG_PCT of the tight and open shots (with TIGHT_ and
+    OPEN_ prefixes), FGA (all the shots), EFG_PCT_DIFF (open minus tight, 0 if one of them has no shots) and
+    OPEN_FGA_PCT (the portion of the shots that were open)
+    """
+    stats = ['FGM', 'FG3M', 'FGA']
+    grouped_df = closest_defender_df[stats].astype(np.float64).groupby(
+        [closest_defender_df[id_column].to_numpy(), get_distance_groups(closest_defender_df['CLOSE_DEF_DIST_RANGE'])]
+    ).sum()
+    # Every stat gets both distance groups, also when no row is in one of them
+    grouped_df = grouped_df.unstack(fill_value=0).reindex(columns=pd.MultiIndex.from_product([stats, [TIGHT, OPEN]]),
+                                                          fill_value=0)
+    grouped_df.index.name = id_column
+
+    contested_shooting_df = DataFrame(index=grouped_df.index)
+    for distance_group in [TIGHT, OPEN]:
+        prefix = f'{distance_group.upper()}_'
+        fgm, fg3m, fga = (grouped_df[(stat, distance_group)].to_numpy() for stat in stats)
+        contested_shooting_df[prefix + 'FGM'] = fgm
+        contested_shooting_df[prefix + 'FG3M'] = fg3m
+        contested_shooting_df[prefix + 'FGA'] = fga
+        contested_shooting_df[prefix + 'EFG_PCT'] = shotChartScripts.get_efg_percentage_of_arrays(fgm, fg3m, fga)
+    tight_fga = contested_shooting_df['TIGHT_FGA'].to_numpy()
+    open_fga = contested_shooting_df['OPEN_FGA'].to_numpy()
+    fga = tight_fga + open_fga
+    contested_shooting_df['FGA'] = fga
+    contested_shooting_df['EFG_PCT_DIFF'] = np.where(
+        (tight_fga > 0) & (open_fga > 0),
+        contested_shooting_df['OPEN_EFG_PCT'].to_numpy() - contested_shooting_df['TIGHT_EFG_PCT'].to_numpy(), 0)
+    contested_shooting_df['OPEN_FGA_PCT'] = np.divide(open_fga, fga, out=np.zeros(len(fga)), where=fga > 0)
+    return contested_shooting_df
@@ -2,14 +2,122 @@
 All objects that represent an nba game. NBAGame is the basic object.
 Also contains necessary imports functions and consts
 """
-from functools import cached_property
-from nba_api.stats.endpoints import BoxScoreSummaryV2, LeagueGameLog
+from functools import cached_property, lru_cache
+import numpy as np
+import pandas as pd
+from nba_api.stats.endpoints import BoxScoreSummaryV2, LeagueGameLog, ScheduleLeagueV2
 from nba_api.stats.library.parameters import Season, SeasonTypeAllStar
-from pandas import DataFrame
-from typing import Optional
+from nba_api.stats.static.teams import get_teams
+from pandas import DataFrame, Series
+from typing import Iterator, Optional, Type, Union
 
+import schemaScripts
 import utilsScripts
 
+# Old endpoints use mixed case id columns (Game_ID, Player_ID...). Game tables always use the upper case ones.
+id_columns_upper_case_names = {
+    'Game_ID': 'GAME_ID',
+    'Team_ID': 'TEAM_ID',
+    'Player_ID': 'PLAYER_ID',
+}
+
+national_tv_broadcasters = ['ESPN',
+                            'TNT',
+                            'ABC',
+                            # 'ESPN 2',
+                            # 'NBA TV'
+                            ]
+
+
+def _get_team_ids_by_abbreviation() -> dict[str, int]:
+    """ From the static teams data - no request is made """
+    return {team['abbreviation']: team['id'] for team in get_teams()}
+
+
+def add_game_context_columns(game_logs_df: DataFrame) -> DataFrame:
+    """
+    Adds context columns to a game logs df, using only the data that is already in it (MATCHUP is "GSW vs. CLE" for
+    home games and "GSW @ CLE" for road games):
+    IS_HOME, OPPONENT_TEAM_ABBREVIATION, OPPONENT_TEAM_ID (NA for teams that don't exist anymore) and REST_DAYS (the
+    number of days off before the game. NaN for the first game of every player/team in the df)
+
+    :param game_logs_df: A game logs df (player, team or league game logs)
+    :return: A copy of the df with the context columns
+    """
+    game_logs_df = game_logs_df.copy()
+    if game_logs_df.empty or 'MATCHUP' not in game_logs_df:
+        return game_logs_df
+    matchups = game_logs_df['MATCHUP'].astype(str)
+    game_logs_df['IS_HOME'] = matchups.str.contains(' vs. ', regex=False)
+    game_logs_df['OPPONENT_TEAM_ABBREVIATION'] = matchups.str.split().str[-1]
+    game_logs_df['OPPONENT_TEAM_ID'] = game_logs_df['OPPONENT_TEAM_ABBREVIATION'].map(
+        _get_team_ids_by_abbreviation()).astype('Int64')
+    if 'GAME_DATE' in game_logs_df:
+        game_dates = pd.to_datetime(game_logs_df['GAME_DATE'].astype(str), format='mixed').to_numpy()
+        entity_column = next((column for column in ['PLAYER_ID', 'Player_ID', 'TEAM_ID', 'Team_ID']
+                              if column in game_logs_df), None)
+        entity_codes = np.zeros(len(game_logs_df), dtype=np.int64) if entity_column is None else \
+            pd.factorize(game_logs_df[entity_column])[0]
+        # Sorting by player/team and then by date, so every game's previous game is right before it
+        order = np.lexsort((game_dates, entity_codes))
+        sorted_game_dates, sorted_entity_codes = game_dates[order], entity_codes[order]
+        days_since_previous_game = np.full(len(order), np.nan)
+        days_since_previous_game[1:] = (sorted_game_dates[1:] - sorted_game_dates[:-1]) / np.timedelta64(1, 'D')
+        days_since_previous_game[1:][sorted_entity_codes[1:] != sorted_entity_codes[:-1]] = np.nan
+        rest_days = np.empty(len(order))
+        rest_days[order] = days_since_previous_game - 1
+        game_logs_df['REST_DAYS'] = rest_days
+    return game_logs_df
+
+
+def get_season_from_game_id(game_id: str) -> str:
+    """
+    Game ids look like 0022300001 - the 4th and 5th digits are the year the season started in
+
+    :param game_id: The game id
+    :return: The season string ('2023-24')
+    """
+    two_digits_year = int(game_id[3:5])
+    return utilsScripts.get_season_from_year(two_digits_year + (1900 if two_digits_year >= 46 else 2000))
+
+
+@lru_cache(maxsize=None)
+def get_season_broadcasts_df(season: str) -> DataFrame:
+    """
+    The national broadcaster and the home/visitor teams of every game in the season (regular season and playoffs).
+    Costs a single request per season, and is cached for the rest of the session - don't change the returned df.
+
+    :param season: The season string ('2023-24')
+    :return: A df with GAME_ID, HOME_TEAM_ID, VISITOR_TEAM_ID and NATL_TV_BROADCASTER_ABBREVIATION columns
+    """
+    season_games_df = utilsScripts.get_stat_class(stat_class_class_object=ScheduleLeagueV2,
+                                                  season=season).season_games.get_data_frame()
+    # When a game has multiple national broadcasters, the columns are enumerated
+    # (nationalBroadcasters_0_broadcasterAbbreviation...), so the first of them is taken
+    broadcaster_columns = [column for column in season_games_df.columns if
+                           column.startswith('nationalBroadcasters') and column.endswith('broadcasterAbbreviation')]
+    broadcasters = season_games_df[broadcaster_columns].replace('', np.nan).bfill(axis=1).iloc[:, 0] \
+        if broadcaster_columns else pd.Series(np.nan, index=season_games_df.index)
+    return DataFrame({
+        'GAME_ID': season_games_df['gameId'].astype(str),
+        'HOME_TEAM_ID': season_games_df['homeTeam_teamId'],
+        'VISITOR_TEAM_ID': season_games_df['awayTeam_teamId'],
+        'NATL_TV_BROADCASTER_ABBREVIATION': broadcasters,
+    })
+
+
+def get_broadcasts_df(game_ids: Series) -> DataFrame:
+    """
+    :param game_ids: Game ids from any number of seasons
+    :return: The season broadcasts df rows of the games, indexed like the game ids. Games that are missing from the
+    schedule get NaN values
+    """
+    game_ids = game_ids.astype(str)
+    seasons = game_ids.map(get_season_from_game_id)
+    broadcasts_df = pd.concat([get_season_broadcasts_df(season) for season in seasons.unique()], ignore_index=True)
+    broadcasts_df = broadcasts_df.drop_duplicates('GAME_ID').set_index('GAME_ID')
+    return broadcasts_df.reindex(game_ids.to_numpy()).set_axis(game_ids.index)
+
 
 class NBAGame(utilsScripts.Loggable):
     """
@@ -55,31 +163,34 @@ class NBAGame(utilsScripts.Loggable):
 
     def initialize_stat_classes(self) -> None:
         """ Initializing all the classes, and setting them under self """
-        self.logger.info(f'Initializing stat classes for game {self.game_id} object..')
+        self.logger.debug('Initializing stat classes for game %s object..', self.game_id)
 
         for stat_class_name in self.get_stat_classes_names():
             try:
                 # This is to force the lru property to actually cache the value.
                 getattr(self, stat_class_name)
             except ValueError as e:
-                self.logger.warning(f"Couldn't initialize {stat_class_name} - Maybe it didn't exist")
+                self.logger.warning("Couldn't initialize %s - Maybe it didn't exist", stat_class_name)
                 self.logger.error(e, exc_info=True)
 
+    @cached_property
+    def _broadcast_series(self) -> Series:
+        """ The game's row in the season broadcasts df (shared by all the season's games) """
+        return get_broadcasts_df(Series([self.game_id])).iloc[0]
+
     def get_broadcasting_network(self) -> str:
-        return self.boxscore_summary.game_summary()[0]['NATL_TV_BROADCASTER_ABBREVIATION']
+        return self._broadcast_series['NATL_TV_BROADCASTER_ABBREVIATION']
 
     def is_game_on_national_tv(self, broadcasters_list: Optional[list[str]] = None) -> bool:
         if broadcasters_list is None:
-            broadcasters_list = ['ESPN',
-                                 'TNT',
-                                 'ABC',
-                                 # 'ESPN 2',
-                                 # 'NBA TV'
-                                 ]
+            broadcasters_list = national_tv_broadcasters
         return self.get_broadcasting_network() in broadcasters_list
 
     def is_team_hosting_game(self, team_id: int) -> bool:
-        return self.boxscore_summary.game_summary()[0]['HOME_TEAM_ID'] == team_id
+        # Game logs of the team itself already know whether it's a home game, with no need for a request
+        if 'IS_HOME' in self.game_dict and self.game_dict.get('TEAM_ID') == team_id:
+            return bool(self.game_dict['IS_HOME'])
+        return self._broadcast_series['HOME_TEAM_ID'] == team_id
 
 
 class NBAGameTeam(NBAGame):
@@ -102,65 +213,236 @@ class NBAGamePlayer(NBAGame):
 
     def __init__(self, game_df, initialize_stat_classes=False):
         super().__init__(game_df, initialize_stat_classes)
-        self.player_id = self.game_dict['Player_ID']
+        self.player_id = self.game_dict['PLAYER_ID'] if 'PLAYER_ID' in self.game_dict else \
+            self.game_dict['Player_ID']
+
+
+class GameRecord:
+    """
+    A light view of a single game (row) in a GameTable. Holds only a reference to the table and the row's position,
+    so iterating over thousands of games doesn't copy their data.
+    """
+    __slots__ = ('_game_table', '_position')
+
+    def __init__(self, game_table: 'GameTable', position: int):
+        self._game_table = game_table
+        self._position = position
+
+    def __getitem__(self, column: str):
+        games_df = self._game_table.games_df
+        return games_df.iat[self._position, games_df.columns.get_loc(column)]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._game_table.games_df.columns
+
+    def __repr__(self):
+        return f'GameRecord({self.game_id})'
+
+    @property
+    def game_id(self) -> str:
+        return self['GAME_ID']
+
+    def to_series(self) -> Series:
+        """ A copy of the game's row """
+        return self._game_table.games_df.iloc[self._position].copy()
+
+    def to_game_object(self, initialize_stat_classes: bool = False) -> 'NBAGame':
+        """ A full game object (with its own stat classes) for the game """
+        return self._game_table.game_object_class(self.to_series(), initialize_stat_classes=initialize_stat_classes)
+
+
+class GameTable:
+    """
+    A collection of games (of a player, a team or a league), kept as a single compact df instead of a game object for
+    every game. Filters are done on the whole df, and game objects are created only when asked for.
+    """
+    __slots__ = ('games_df', 'game_object_class')
+
+    def __init__(self, games_df: DataFrame, game_object_class: Type['NBAGame'] = None):
+        """
+
+        :param games_df: A game logs df (player, team or league game logs)
+        :param game_object_class: The class of the game objects that are created from the table's games
+        """
+        self.games_df = games_df.rename(columns=id_columns_upper_case_names).reset_index(drop=True)
+        self.game_object_class = NBAGame if game_object_class is None else game_object_class
+
+    def __len__(self) -> int:
+        return len(self.games_df)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        return (GameRecord(self, position) for position in range(len(self)))
+
+    def __getitem__(self, position: int) -> GameRecord:
+        if not -len(self) <= position < len(self):
+            raise IndexError(f'Game position {position} out of range')
+        return GameRecord(self, position % len(self))
+
+    def __repr__(self):
+        return f'GameTable({len(self)} games)'
+
+    @property
+    def game_ids(self) -> np.ndarray:
+        return self.games_df['GAME_ID'].to_numpy()
+
+    def filter(self, mask: Union[Series, np.ndarray]) -> 'GameTable':
+        """
+        :param mask: A boolean mask over the table's games
+        :return: A table of only the games where the mask is True
+        """
+        return GameTable(self.games_df[np.asarray(mask, dtype=bool)], self.game_object_class)
+
+    def filter_by_game_ids(self, game_ids) -> 'GameTable':
+        """
+        :param game_ids: The ids of the games to keep
+        :return: A table of only the games with those ids
+        """
+        return self.filter(self.games_df['GAME_ID'].isin(game_ids))
+
+    def is_national_tv_game(self, broadcasters_list: Optional[list[str]] = None) -> np.ndarray:
+        """
+        Uses the season broadcasts dfs - a single request per season, and not per game
+
+        :param broadcasters_list: The broadcasters that count as national tv
+        :return: A boolean mask over the table's games
+        """
+        if broadcasters_list is None:
+            broadcasters_list = national_tv_broadcasters
+        if self.games_df.empty:
+            return np.zeros(0, dtype=bool)
+        broadcasts_df = get_broadcasts_df(self.games_df['GAME_ID'])
+        return broadcasts_df['NATL_TV_BROADCASTER_ABBREVIATION'].isin(broadcasters_list).to_numpy()
+
+    def get_game_objects(self, initialize_stat_classes: bool = False) -> list['NBAGame']:
+        """ Full game objects for all the table's games. Use only when the per game stat classes are needed """
+        return [game_record.to_game_object(initialize_stat_classes) for game_record in self]
 
 
 class NBASingleSeasonGames:
     """
-    An object that represent a season of nba games
+    An object that represent a season of nba games. The games (a row for every team in every game) are kept in a
+    single df, with sorted indexes over it, so lookups by game, team, dates and opponent are binary searches.
     """
 
-    def __init__(self, season=Season.default, include_playoffs=False, include_preseason=False):
+    def __init__(self, season=Season.default, include_playoffs=False, include_preseason=False,
+                 games_df: Optional[DataFrame] = None):
         """
-        returns a list of short dict summaries for every nba game played in history
-        :return:
-        :rtype:NBASingleSeasonGames object
+
+        :param season: The season of the games
+        :param include_playoffs: Whether to add the playoff games or not
+        :param include_preseason: Whether to add the preseason games or not
+        :param games_df: League game logs to use instead of requesting them
+        :return: an object that represent a season of nba games
         """
-        games_objects = LeagueGameLog(season=season)
-        all_games_df = games_objects.league_game_log.get_data_frame()
-        if include_playoffs:
-            playoff_games_objects = LeagueGameLog(season=season, season_type_all_star=SeasonTypeAllStar.playoffs)
-            all_games_df += playoff_games_objects.league_game_log.get_data_frame()
-        if include_preseason:
-            preseason_games_objects = LeagueGameLog(season=season, season_type_all_star=SeasonTypeAllStar.preseason)
-            all_games_df += preseason_games_objects.league_game_log.get_data_frame()
+        self.season = season
+        if games_df is None:
+            season_types = [SeasonTypeAllStar.regular]
+            if include_playoffs:
+                season_types.append(SeasonTypeAllStar.playoffs)
+            if include_preseason:
+                season_types.append(SeasonTypeAllStar.preseason)
+            games_df = schemaScripts.concat_compact_dfs(
+                [self._get_season_type_games_df(season, season_type) for season_type in season_types])
+        # The context columns are added after all the season types are joined, so the rest days before the first
+        # playoff game are counted from the last regular season game. Given game logs may already have them
+        if 'IS_HOME' not in games_df:
+            games_df = schemaScripts.compact_game_logs_df(add_game_context_columns(games_df))
+        self.games_df = self._add_opponent_team_ids(games_df.reset_index(drop=True))
+        self._initialize_indexes()
 
-        self.games_objects: list[NBAGame] = [NBAGame(game_dict) for game_dict in all_games_df]
+    @staticmethod
+    def _get_season_type_games_df(season: str, season_type: str) -> DataFrame:
+        games_df = utilsScripts.get_stat_class(stat_class_class_object=LeagueGameLog, season=season,
+                                               season_type_all_star=season_type).league_game_log.get_data_frame()
+        games_df['SEASON_TYPE'] = season_type
+        return schemaScripts.compact_game_logs_df(games_df)
 
-    def get_specific_team_home_games(self, team_id):
+    @staticmethod
+    def _add_opponent_team_ids(games_df: DataFrame) -> DataFrame:
+        """
+        League game logs have a row for both teams of every game, so the opponent of every row is the other team with
+        the same game id (also for teams that don't exist anymore)
         """
+        games_df = games_df.copy()
+        team_ids = games_df['TEAM_ID'].astype(np.int64)
+        games_df['OPPONENT_TEAM_ID'] = team_ids.groupby(games_df['GAME_ID'], observed=True).transform('sum') - team_ids
+        return games_df
 
-        :param team_id:
-        :type team_id: int
-        :return:
-        :rtype: list[NBAGame]
+    def _initialize_indexes(self) -> None:
+        """ Sorted copies of the key columns, and the positions of their rows in games_df """
+        game_ids = self.games_df['GAME_ID'].astype(str).to_numpy()
+        team_ids = self.games_df['TEAM_ID'].to_numpy(dtype=np.int64)
+        opponent_team_ids = self.games_df['OPPONENT_TEAM_ID'].to_numpy(dtype=np.int64)
+        game_dates = pd.to_datetime(self.games_df['GAME_DATE'].astype(str), format='mixed').to_numpy()
+
+        self._game_id_order = np.argsort(game_ids, kind='stable')
+        self._sorted_game_ids = game_ids[self._game_id_order]
+
+        self._team_order = np.lexsort((game_dates, team_ids))
+        self._team_sorted_team_ids = team_ids[self._team_order]
+        self._team_sorted_game_dates = game_dates[self._team_order]
+
+        self._opponent_order = np.lexsort((game_dates, opponent_team_ids, team_ids))
+        self._opponent_sorted_team_ids = team_ids[self._opponent_order]
+        self._opponent_sorted_opponent_team_ids = opponent_team_ids[self._opponent_order]
+
+    def _get_games_table(self, positions: np.ndarray) -> GameTable:
+        return GameTable(self.games_df.iloc[positions], NBAGameTeam)
+
+    @cached_property
+    def games_objects(self) -> list[NBAGame]:
+        """ A game object for every row. Prefer the lookup functions when possible """
+        return GameTable(self.games_df).get_game_objects()
+
+    def get_game(self, game_id: str) -> GameTable:
         """
-        return [game for game in self.games_objects if game.game_dict['HOME_TEAM_ID'] == team_id]
 
-    def get_specific_team_away_games(self, team_id):
+        :param game_id: The game id
+        :return: The rows of both teams in the game
         """
+        start, end = (np.searchsorted(self._sorted_game_ids, game_id, side=side) for side in ['left', 'right'])
+        return self._get_games_table(self._game_id_order[start:end])
 
-        :param team_id:
-        :type team_id: int
-        :return:
-        :rtype: list[NBAGame]
+    def get_specific_team_games(self, team_id: int, date_from=None, date_to=None) -> GameTable:
         """
-        return [game for game in self.games_objects if game.game_dict['VISITOR_TEAM_ID'] == team_id]
 
-    def get_specific_team_games(self, team_id):
+        :param team_id: The team id
+        :param date_from: If passed, only games from this date (including) are returned
+        :param date_to: If passed, only games until this date (including) are returned
+        :return: The team's games, sorted by date
+        """
+        start, end = (np.searchsorted(self._team_sorted_team_ids, team_id, side=side) for side in ['left', 'right'])
+        team_game_dates = self._team_sorted_game_dates[start:end]
+        if date_from is not None:
+            start += np.searchsorted(team_game_dates, np.datetime64(pd.Timestamp(date_from)), side='left')
+        if date_to is not None:
+            end -= len(team_game_dates) - np.searchsorted(team_game_dates, np.datetime64(pd.Timestamp(date_to)),
+                                                          side='right')
+        return self._get_games_table(self._team_order[start:max(start, end)])
+
+    def get_specific_team_home_games(self, team_id: int) -> GameTable:
+        team_games = self.get_specific_team_games(team_id)
+        return team_games.filter(team_games.games_df['IS_HOME'].to_numpy(dtype=bool))
+
+    def get_specific_team_away_games(self, team_id: int) -> GameTable:
+        team_games = self.get_specific_team_games(team_id)
+        return team_games.filter(~team_games.games_df['IS_HOME'].to_numpy(dtype=bool))
+
+    def get_specific_team_games_against_opponent(self, team_id: int, opponent_team_id: int) -> GameTable:
         """
 
-        :param team_id:
-        :type team_id: int
-        :return:
-        :rtype: list[NBAGame]
+        :param team_id: The team id
+        :param opponent_team_id: The opponent's team id
+        :return: The team's games against the opponent, sorted by date
         """
-        all_team_games = self.get_specific_team_home_games(team_id) + self.get_specific_team_away_games(team_id)
-        all_team_games.sort(key=lambda game: game.game_dict['GAME_ID'])
-        return all_team_games
+        start, end = (np.searchsorted(self._opponent_sorted_team_ids, team_id, side=side) for side in ['left', 'right'])
+        team_opponent_team_ids = self._opponent_sorted_opponent_team_ids[start:end]
+        opponent_start = start + np.searchsorted(team_opponent_team_ids, opponent_team_id, side='left')
+        opponent_end = start + np.searchsorted(team_opponent_team_ids, opponent_team_id, side='right')
+        return self._get_games_table(self._opponent_order[opponent_start:opponent_end])
 
 
 if __name__ == "__main__":
     games_2015 = NBASingleSeasonGames(include_playoffs=True, include_preseason=False)
-    broadcasting_networks = set([game_object.get_broadcasting_network() for game_object in games_2015.games_objects])
+    broadcasting_networks = set(get_broadcasts_df(games_2015.games_df['GAME_ID'])['NATL_TV_BROADCASTER_ABBREVIATION'])
     games_2015.get_specific_team_games(1610612761)
@@ -7,15 +7,30 @@ from contextlib import contextmanager
 from functools import cached_property
 from nba_api.stats.endpoints import PlayerDashPtShots, TeamDashPtShots, PlayerGameLogs, TeamGameLogs, TeamDashPtReb, \
     PlayerDashPtReb, TeamDashPtPass, PlayerDashPtPass, ShotChartDetail
-from nba_api.stats.library.parameters import SeasonTypePlayoffs, ContextMeasureSimple
-from pandas import DataFrame
-from typing import Union
-
+# This import is only for type hinting, so I don't care it's private
+# noinspection PyProtectedMember
+from nba_api.stats.endpoints._base import Endpoint
+from nba_api.stats.library.parameters import SeasonTypePlayoffs, ContextMeasureSimple, Season
+from pandas import DataFrame, Series
+from typing import Optional, Union
+
+import closestDefenderScripts
 import gameScripts
+import rollingStatsScripts
+import schemaScripts
+import shotChartScripts
 import utilsScripts
 from utilsScripts import T
 from my_exceptions import NoStatDashboard
 
+# Game logs of seasons that are over don't change, so they are requested only once.
+# Keys are (object indicator, id, season, season type)
+_completed_seasons_game_logs_cache: dict[tuple[str, int, str, str], DataFrame] = {}
+
+# Stat classes that don't depend on the season (career stats, player info...) are shared by all the season objects of
+# the same player/team. Keys are (stat class, sorted kwargs)
+_career_stat_classes_cache: dict[tuple[type, tuple], Endpoint] = {}
+
 
 class NBAStatObject(abc.ABC, utilsScripts.Loggable):
     """
@@ -119,6 +134,17 @@ class NBAStatObject(abc.ABC, utilsScripts.Loggable):
             stat_class_class_object, custom_filters, **(kwargs | self._additional_parameters)
         )
 
+    def get_career_stat_class(self, stat_class_class_object: type[T], **kwargs) -> T:
+        """
+        For stat classes that don't depend on the season - requested once, and shared by all the objects of the same
+        player/team (regardless of their season)
+        """
+        kwargs = kwargs | self._additional_parameters
+        cache_key = (stat_class_class_object, tuple(sorted(kwargs.items())))
+        if cache_key not in _career_stat_classes_cache:
+            _career_stat_classes_cache[cache_key] = self.get_stat_class(stat_class_class_object, **kwargs)
+        return _career_stat_classes_cache[cache_key]
+
     @cached_property
     def shot_dashboard(self) -> Union[PlayerDashPtShots, TeamDashPtShots]:
         if int(self.season[:4]) < 2013:
@@ -174,6 +200,48 @@ class NBAStatObject(abc.ABC, utilsScripts.Loggable):
         }
         return self.get_stat_class(stat_class_class_object=ShotChartDetail, **kwargs)
 
+    @cached_property
+    def shot_chart_df(self) -> DataFrame:
+        """ The shot chart in a compact schema, with the zone codes of every shot. Built once from the stat class """
+        return schemaScripts.compact_shot_chart_df(
+            shotChartScripts.add_zone_codes(self.shot_chart.shot_chart_detail.get_data_frame())
+        )
+
+    @cached_property
+    def _previous_shots_streaks_df(self) -> DataFrame:
+        """ For every shot in the shot chart, the streaks of makes and misses right before it """
+        return shotChartScripts.get_previous_shots_streaks(self.shot_chart_df)
+
+    def get_efg_percentage_by_previous_shots_results(self, max_number_of_previous_shots: int = 5) -> DataFrame:
+        """
+        :param max_number_of_previous_shots: The biggest number of previous shots to check the condition on
+        :return: A df with the EFG% on shots after every number of consecutive makes and misses (up to
+        max_number_of_previous_shots), for every player in the shot chart
+        """
+        return shotChartScripts.get_efg_percentage_by_previous_shots_results(
+            self.shot_chart_df,
+            max_number_of_previous_shots=max_number_of_previous_shots,
+            streaks_df=self._previous_shots_streaks_df
+        )
+
+    def get_efg_percentage_by_shot_zone(self, zone_columns: Union[str, list[str]], by_player: bool = False,
+                                        compare_to_league: bool = False) -> DataFrame:
+        """
+        :param zone_columns: One or more of SHOT_SIDE_CODE, SHOT_DISTANCE_BAND_CODE and SHOT_HEX_CELL_CODE
+        :param by_player: Whether to aggregate every player separately or all the shots together
+        :param compare_to_league: Whether to add the league's EFG% in every zone
+        :return: A df with FGM, FG3M, FGA and EFG_PCT for every zone with shots
+        """
+        if compare_to_league:
+            return shotChartScripts.get_efg_percentage_by_zone_compared_to_league(
+                self.shot_chart_df,
+                league_shot_chart_df=None,
+                zone_columns=zone_columns,
+                by_player=by_player,
+                league_zone_df=self.current_league_object.get_efg_percentage_by_shot_zone(zone_columns)
+            )
+        return shotChartScripts.get_efg_percentage_by_zone(self.shot_chart_df, zone_columns, by_player=by_player)
+
     @cached_property
     def game_logs(self) -> Union[PlayerGameLogs, TeamGameLogs]:
         kwargs = {
@@ -183,6 +251,33 @@ class NBAStatObject(abc.ABC, utilsScripts.Loggable):
         stat_class_class_object = PlayerGameLogs if self._object_indicator == 'player' else TeamGameLogs
         return self.get_stat_class(stat_class_class_object, **kwargs)
 
+    @cached_property
+    def game_logs_df(self) -> DataFrame:
+        """ The game logs in a compact schema. Built once from the game logs stat class """
+        return schemaScripts.compact_game_logs_df(gameScripts.add_game_context_columns(
+            getattr(self.game_logs, f'{self._object_indicator}_game_logs').get_data_frame()
+        ))
+
+    def get_rolling_stats_df(self, window: int = 10, stats: Optional[list[str]] = None,
+                             all_time: bool = False) -> DataFrame:
+        """
+        :param window: The number of games in every window
+        :param stats: The stats to roll. rollingStatsScripts.rolling_stats by default
+        :param all_time: Whether to roll over the all time game logs (windows go over the seasons) or only this season's
+        :return: The rolling stats after every game, in chronological order (see rollingStatsScripts)
+        """
+        game_logs_df = self.get_all_time_game_logs() if all_time else self.game_logs_df
+        return rollingStatsScripts.get_rolling_stats_df(game_logs_df, window=window, stats=stats,
+                                                        entity_column=f'{self._object_indicator.upper()}_ID')
+
+    def get_recent_form(self, last_n_games: int = 10, stats: Optional[list[str]] = None) -> Series:
+        """
+        :param last_n_games: The number of recent games
+        :param stats: The stats to sum. rollingStatsScripts.rolling_stats by default
+        :return: The sums, means and shooting percentages of the last games of this season
+        """
+        return self.get_rolling_stats_df(window=last_n_games, stats=stats).iloc[-1]
+
     @cached_property
     @abc.abstractmethod
     def year_by_year_stats(self):
@@ -208,19 +303,19 @@ class NBAStatObject(abc.ABC, utilsScripts.Loggable):
         player_stat_page_regex = f"https://www.nba.com/stats/{self._object_indicator}/{self.id}"
         return player_stat_page_regex
 
+    @property
+    def _game_object_class(self) -> type[gameScripts.NBAGame]:
+        return gameScripts.NBAGamePlayer if self._object_indicator == 'player' else gameScripts.NBAGameTeam
+
     @cached_property
-    def regular_season_game_objects(self):
-        """
+    def regular_season_games(self) -> gameScripts.GameTable:
+        """ The season's games, as a single compact table """
+        return gameScripts.GameTable(self.game_logs_df, self._game_object_class)
 
-        :return:
-        :rtype: list[gameScripts.NBAGameTeam]
-        """
-        regular_season_game_objects = []
-        for game_number, game_log in enumerate(reversed(self.game_logs.player_game_logs.get_data_frame())):
-            self.logger.info('Initializing game number %s' % (game_number + 1))
-            # TODO - Make NBAGame specefically NBATeam/NBAPlayer
-            regular_season_game_objects.append(gameScripts.NBAGame(game_log, initialize_stat_classes=True))
-        return regular_season_game_objects
+    @cached_property
+    def regular_season_game_objects(self) -> list[gameScripts.NBAGame]:
+        """ A game object (with initialized stat classes) for every game. Prefer regular_season_games when possible """
+        return self.regular_season_games.get_game_objects(initialize_stat_classes=True)
 
     def __cmp__(self, other):
         """
@@ -242,14 +337,14 @@ class NBAStatObject(abc.ABC, utilsScripts.Loggable):
 
     def initialize_stat_classes(self) -> None:
         """ Initializing all the classes, and setting them under self """
-        self.logger.info('Initializing stat classes for %s object..' % self.name)
+        self.logger.info('Initializing stat classes for %s object..', self.name)
 
         for stat_class_name in self.get_stat_classes_names():
             try:
                 # This is to force the lru property to actually cache the value.
                 getattr(self, stat_class_name)
             except ValueError as e:
-                self.logger.warning(f"Couldn't initialize {stat_class_name} - Maybe it didn't exist in {self.season}")
+                self.logger.warning("Couldn't initialize %s - Maybe it didn't exist in %s", stat_class_name, self.season)
                 self.logger.error(e, exc_info=True)
 
     def open_web_stat_page(self):
@@ -264,21 +359,12 @@ class NBAStatObject(abc.ABC, utilsScripts.Loggable):
     def groupby_defender_distance(df):
         """
         Contested - defender within 4 feet
-        :return: tuple of the FG% on contested shots, and the amount of those shots.
-        :rtype: tuple(float, float)
+        :return: A df with the FGM, FGA and FG3M of the Tight and Open shots. The given df is not changed
+        :rtype: DataFrame
         """
-        # Define a function to categorize close defense distances into two groups
-        def distance_group(distance):
-            if distance in ['0-2 Feet - Very Tight', '2-4 Feet - Tight']:
-                return 'Tight'
-            else:
-                return 'Open'
-
-        # Apply the function to create a new column 'DISTANCE_GROUP'
-        df['DISTANCE_GROUP'] = df['CLOSE_DEF_DIST_RANGE'].apply(distance_group)
-        # Group by 'DISTANCE_GROUP' and sum the desired categories
-        grouped_df = df.groupby('DISTANCE_GROUP')[['FGM', 'FGA', 'FG3M']].sum()
-        return grouped_df
+        distance_groups = closestDefenderScripts.get_distance_groups(df['CLOSE_DEF_DIST_RANGE'])
+        grouped_df = df[['FGM', 'FGA', 'FG3M']].groupby(distance_groups).sum()
+        return grouped_df.reindex([closestDefenderScripts.TIGHT, closestDefenderScripts.OPEN], fill_value=0)
 
     def get_efg_percentage_on_contested_shots_outside_10_feet(self):
         """
@@ -334,72 +420,110 @@ class NBAStatObject(abc.ABC, utilsScripts.Loggable):
             return diff_in_efg, percentage_of_contested_shots
 
     def get_all_time_game_logs(self) -> DataFrame:
-        """ Returns all time game log df objects (Regardless of defined 'season' param) """
-        all_time_game_logs = []
-        for year in range(self.first_year, self.last_year + 1):
-            for season_type in [SeasonTypePlayoffs.regular, SeasonTypePlayoffs.playoffs]:
-                with self.game_logs.object_manager.reinitialize_data_with_new_parameters(
-                        Season=utilsScripts.get_season_from_year(year),
-                        SeasonType=season_type):
-                    logs_by_year_and_season_type = self.game_logs.player_game_logs.get_data_frame()
-                    logs_by_year_and_season_type.reverse()
-                    all_time_game_logs += logs_by_year_and_season_type
-        return all_time_game_logs
-
-    def get_all_time_per_game_stats(self, per_36=False):
+        """
+        Returns all time game logs (Regardless of defined 'season' param), in a compact schema and in chronological
+        order. All the missing seasons are requested concurrently, and completed seasons are cached for the rest of
+        the session.
+        """
+        planned_requests = [(utilsScripts.get_season_from_year(year), season_type)
+                            for year in range(self.first_year, self.last_year + 1)
+                            for season_type in [SeasonTypePlayoffs.regular, SeasonTypePlayoffs.playoffs]]
+        cache_keys = [(self._object_indicator, self.id, season, season_type) for season, season_type in planned_requests]
+        missing_requests = [planned_request for planned_request, cache_key in zip(planned_requests, cache_keys)
+                            if cache_key not in _completed_seasons_game_logs_cache]
+        stat_class_class_object = PlayerGameLogs if self._object_indicator == 'player' else TeamGameLogs
+        game_logs_stat_classes = utilsScripts.get_stat_classes_concurrently(
+            stat_class_class_object,
+            [{
+                f'{self._object_indicator}_id_nullable': self.id,
+                'season_nullable': season,
+                'season_type_nullable': season_type,
+            } for season, season_type in missing_requests])
+
+        season_game_logs_dfs = {}
+        for planned_request, game_logs_stat_class in zip(missing_requests, game_logs_stat_classes):
+            game_logs_df = getattr(game_logs_stat_class, f'{self._object_indicator}_game_logs').get_data_frame()
+            # Game logs are ordered from the latest game
+            season_game_logs_dfs[planned_request] = schemaScripts.compact_game_logs_df(game_logs_df.iloc[::-1])
+            season, season_type = planned_request
+            if season != Season.current_season:
+                _completed_seasons_game_logs_cache[(self._object_indicator, self.id, season, season_type)] = \
+                    season_game_logs_dfs[planned_request]
+        all_time_game_logs_df = schemaScripts.concat_compact_dfs(
+            [season_game_logs_dfs[planned_request] if planned_request in season_game_logs_dfs else
+             _completed_seasons_game_logs_cache[cache_key]
+             for planned_request, cache_key in zip(planned_requests, cache_keys)])
+        return schemaScripts.compact_game_logs_df(gameScripts.add_game_context_columns(all_time_game_logs_df))
+
+    def get_all_time_per_game_stats(self, per_36: bool = False) -> DataFrame:
         """
 
         :param per_36: Get per 36 stats oppose to per game stats
-        :type per_36: bool
-        :return:
-        :rtype: dict
+        :return: A single row df of the joined stats
         """
         return utilsScripts.join_single_game_stats(self.get_all_time_game_logs(), per_36=per_36)
 
-    def get_all_time_game_objects(self, initialize_stat_classes=False):
+    def get_all_time_games(self) -> gameScripts.GameTable:
+        """ All time games (Regardless of defined 'season' param), as a single compact table """
+        return gameScripts.GameTable(self.get_all_time_game_logs(), self._game_object_class)
+
+    def get_all_time_game_objects(self, initialize_stat_classes: bool = False) -> list[gameScripts.NBAGame]:
         """
 
         :param initialize_stat_classes: Whether or not to initialize the stat classes for the game objects
-        :type initialize_stat_classes: bool
-        :return:
-        :rtype: list[NBAGame]
+        :return: A game object for every game. Prefer get_all_time_games when possible
         """
-        pass
+        return self.get_all_time_games().get_game_objects(initialize_stat_classes)
 
-    def get_national_tv_all_time_game_objects_and_remaining_game_objects(self):
+    def get_national_tv_all_time_games_and_remaining_games(self) \
+            -> tuple[gameScripts.GameTable, gameScripts.GameTable]:
         """
 
-        :return:
-        :rtype:tuple(list[dict], list[dict])
-        """
-        all_time_game_objects = self.get_all_time_game_objects()
-        all_time_national_tv_game_objects = []
-        all_time_not_national_tv_game_objects = []
-        for game_object in all_time_game_objects:
-            if game_object.is_game_on_national_tv():
-                all_time_national_tv_game_objects.append(game_object)
-            else:
-                all_time_not_national_tv_game_objects.append(game_object)
-        return all_time_national_tv_game_objects, all_time_not_national_tv_game_objects
+        :return: A table of the all time games that were on national tv, and a table of the other games
+        """
+        all_time_games = self.get_all_time_games()
+        is_national_tv_game = all_time_games.is_national_tv_game()
+        return all_time_games.filter(is_national_tv_game), all_time_games.filter(~is_national_tv_game)
 
     # TODO - Generalize the comparision code to a separate function
-    def get_national_tv_all_time_per_36_stats_compared_to_other_games(self):
+    def get_national_tv_all_time_per_36_stats_compared_to_other_games(self) -> dict[str, DataFrame]:
         """
 
-        :return:
-        :rtype:dict[str, dict]
-        """
-        all_time_national_tv_game_objects, all_time_not_national_tv_game_objects = \
-            self.get_national_tv_all_time_game_objects_and_remaining_game_objects()
-        all_time_national_tv_game_dicts = [game_object.game_dict for game_object in
-                                           all_time_national_tv_game_objects]
-        all_time_not_national_tv_game_dicts = [game_object.game_dict for game_object in
-                                               all_time_not_national_tv_game_objects]
+        :return: The joined per 36 stats of the national tv games, and of the other games
+        """
+        all_time_national_tv_games, all_time_not_national_tv_games = \
+            self.get_national_tv_all_time_games_and_remaining_games()
         return {
-            'National TV': utilsScripts.join_single_game_stats(all_time_national_tv_game_dicts, per_36=True),
-            'Not National TV': utilsScripts.join_single_game_stats(all_time_not_national_tv_game_dicts,
+            'National TV': utilsScripts.join_single_game_stats(all_time_national_tv_games.games_df, per_36=True),
+            'Not National TV': utilsScripts.join_single_game_stats(all_time_not_national_tv_games.games_df,
                                                                    per_36=True)}
 
+    def get_home_games_stats_compared_to_road_games(self, per_36: bool = False) -> dict[str, DataFrame]:
+        """
+        Uses the IS_HOME column of the game logs - no extra requests are made
+
+        :param per_36: Get per 36 stats oppose to per game stats
+        :return: The joined stats of the home games, and of the road games
+        """
+        is_home_game = self.game_logs_df['IS_HOME'].to_numpy(dtype=bool)
+        return {
+            'Home': utilsScripts.join_single_game_stats(self.game_logs_df[is_home_game], per_36=per_36),
+            'Road': utilsScripts.join_single_game_stats(self.game_logs_df[~is_home_game], per_36=per_36)}
+
+    def get_all_time_home_games_stats_compared_to_road_games(self, per_36: bool = False) -> dict[str, DataFrame]:
+        """
+
+        :param per_36: Get per 36 stats oppose to per game stats
+        :return: The joined stats of the all time home games, and of the all time road games
+        """
+        all_time_games = self.get_all_time_games()
+        is_home_game = all_time_games.games_df['IS_HOME'].to_numpy(dtype=bool)
+        return {
+            'Home': utilsScripts.join_single_game_stats(all_time_games.filter(is_home_game).games_df,
+                                                        per_36=per_36),
+            'Road': utilsScripts.join_single_game_stats(all_time_games.filter(~is_home_game).games_df,
+                                                        per_36=per_36)}
+
     def get_num_of_offensive_possessions(self):
         """
 
@@ -13,14 +13,30 @@ import tqdm
 
 from contextlib import contextmanager
 from functools import cached_property
-from nba_api.stats.endpoints import CommonAllPlayers, LeagueDashTeamStats, SynergyPlayTypes
+from nba_api.stats.endpoints import CommonAllPlayers, LeagueDashTeamStats, SynergyPlayTypes, ShotChartDetail, \
+    PlayerGameLogs, TeamPlayerOnOffSummary, PlayerDashPtPass, LeagueDashPlayerPtShot, TeamDashLineups
 from nba_api.stats.library.parameters import PlayType, Season, SeasonYear, TypeGroupingNullable, \
-    MeasureTypeDetailedDefense
-from typing import Literal
-
-from pandas import DataFrame
-
+    MeasureTypeDetailedDefense, ContextMeasureSimple
+from typing import Literal, Optional, Union
+
+import pandas as pd
+from pandas import DataFrame, Series
+
+import closestDefenderScripts
+import gameScripts
+import lineupArchetypeScripts
+import lineupStintsScripts
+import onOffScripts
+import passingNetworkScripts
+import perScripts
+import playerFeaturesScripts
 import playerScripts
+import rapmScripts
+import rollingStatsScripts
+import schemaScripts
+import shotChartScripts
+import similarityScripts
+import synergyScripts
 import teamScripts
 import utilsScripts
 from my_exceptions import NoSuchTeam, TooMuchTeams, NoStatDashboard
@@ -115,6 +131,34 @@ class NBALeagues(object):
             passed_function_results_by_seasons_ordered_dict[league_object.season] = func(self=league_object, **kwargs)
         return passed_function_results_by_seasons_ordered_dict
 
+    def get_rapm_df(self, alpha: float = rapmScripts.default_rapm_alpha) -> DataFrame:
+        """
+        A single RAPM fit over the lineup stints of all the seasons together (see rapmScripts)
+
+        :param alpha: The ridge penalty
+        :return: The RAPM estimates of every player that played in any of the seasons
+        """
+        return rapmScripts.get_rapm_df(
+            schemaScripts.concat_compact_dfs([league_object.lineup_stints_df
+                                              for league_object in self.league_objects_list]),
+            alpha=alpha)
+
+    def get_similarity_index(self, similarity_index: Optional[similarityScripts.SimilarityIndex] = None,
+                             minutes_limit: float = 500) -> similarityScripts.SimilarityIndex:
+        """
+        The player-seasons of all the seasons, from the players features df of every season (see similarityScripts)
+
+        :param similarity_index: An existing index, to add only the seasons that are not in it yet. A new one if None
+        :param minutes_limit: Player-seasons with less minutes are not added (when a new index is built)
+        :return: The similarity index
+        """
+        if similarity_index is None:
+            similarity_index = similarityScripts.SimilarityIndex(minutes_limit=minutes_limit)
+        for league_object in self.league_objects_list:
+            if league_object.season not in similarity_index.seasons:
+                similarity_index.add_season(league_object.season, league_object.players_features_df)
+        return similarity_index
+
 
 class NBALeague(utilsScripts.Loggable, PlayersContainer):
     """
@@ -135,7 +179,7 @@ class NBALeague(utilsScripts.Loggable, PlayersContainer):
             try:
                 self.playtype = PlayTypeLeagueAverage()
             except Exception as e:
-                self.logger.warning("Couldn't initialize playtype data - %s" % e)
+                self.logger.warning("Couldn't initialize playtype data - %s", e)
         # Warning - Takes a LONG time - A few hours
         if initialize_team_objects:
             for team_id in tqdm.tqdm(teamScripts.teams_id_dict.values(), desc="Teams Completed"):
@@ -152,7 +196,7 @@ class NBALeague(utilsScripts.Loggable, PlayersContainer):
                         # noinspection PyUnusedLocal
                         a = player_object.stats_df
                         if initialize_game_objects:
-                            self.logger.info('Initializing players game objects for %s object..' % player_object.name)
+                            self.logger.debug('Initializing players game objects for %s object..', player_object.name)
                             # Cache game objects. a is unused
                             # noinspection PyUnusedLocal
                             a = player_object.regular_season_game_objects
@@ -221,16 +265,233 @@ class NBALeague(utilsScripts.Loggable, PlayersContainer):
         }
         return self.get_stat_class(stat_class_class_object=LeagueDashTeamStats, **kwargs)
 
+    @cached_property
+    def shot_chart(self) -> ShotChartDetail:
+        """ Every shot in the league this season. Not initialized with the other stat classes, since it's huge """
+        if int(self.season[:4]) < 1996:
+            raise NoStatDashboard(f'No shot chart in {self.season[:4]} - Only since 1996')
+        kwargs = {
+            'team_id': 0,
+            'player_id': 0,
+            'season_nullable': self.season,
+            # Default value makes it only return FGM, so changed to FGA. Based on - https://stackoverflow.com/a/65628817
+            'context_measure_simple': ContextMeasureSimple.fga,
+        }
+        return self.get_stat_class(stat_class_class_object=ShotChartDetail, **kwargs)
+
+    @cached_property
+    def shot_chart_df(self) -> DataFrame:
+        """ The league's shot chart in a compact schema, with the zone codes of every shot. Built once """
+        return schemaScripts.compact_shot_chart_df(
+            shotChartScripts.add_zone_codes(self.shot_chart.shot_chart_detail.get_data_frame())
+        )
+
+    @property
+    def league_shot_chart_df(self) -> DataFrame:
+        return self.shot_chart_df
+
+    @cached_property
+    def players_game_logs(self) -> PlayerGameLogs:
+        """ The game logs of all the players in the league this season """
+        kwargs = {
+            'season_nullable': self.season,
+        }
+        return self.get_stat_class(stat_class_class_object=PlayerGameLogs, **kwargs)
+
+    @cached_property
+    def teams_on_off_court(self) -> list[TeamPlayerOnOffSummary]:
+        """ The on/off data of all the teams in the league. Requested concurrently """
+        if int(self.season[:4]) < 2007:
+            raise NoStatDashboard(f'No on-off data in {self.season[:4]} - Only since 2007')
+        return utilsScripts.get_stat_classes_concurrently(
+            TeamPlayerOnOffSummary,
+            [{'team_id': team_id, 'season': self.season} | self._additional_parameters
+             for team_id in teamScripts.teams_id_dict.values()])
+
+    @cached_property
+    def on_off_df(self) -> DataFrame:
+        """ The on/off stats of every player in the league, with every team he played for. Built once """
+        return onOffScripts.get_on_off_df(
+            pd.concat([team_on_off_court.players_on_court_team_player_on_off_summary.get_data_frame()
+                       for team_on_off_court in self.teams_on_off_court], ignore_index=True),
+            pd.concat([team_on_off_court.players_off_court_team_player_on_off_summary.get_data_frame()
+                       for team_on_off_court in self.teams_on_off_court], ignore_index=True))
+
+    @property
+    def league_on_off_df(self) -> DataFrame:
+        return self.on_off_df
+
+    @cached_property
+    def teams_lineups(self) -> list[TeamDashLineups]:
+        """ The advanced lineups stats of all the teams in the league. Requested concurrently """
+        return utilsScripts.get_stat_classes_concurrently(
+            TeamDashLineups,
+            [{'team_id': team_id, 'season': self.season,
+              'measure_type_detailed_defense': MeasureTypeDetailedDefense.advanced} | self._additional_parameters
+             for team_id in teamScripts.teams_id_dict.values()])
+
+    @cached_property
+    def lineups_df(self) -> DataFrame:
+        """ The lineups (of TeamDashLineups) of all the teams in the league, with a TEAM_ID column. Built once """
+        return pd.concat([team_lineups.lineups.get_data_frame().assign(TEAM_ID=team_id)
+                          for team_id, team_lineups in zip(teamScripts.teams_id_dict.values(), self.teams_lineups)],
+                         ignore_index=True)
+
+    @cached_property
+    def game_logs_df(self) -> DataFrame:
+        """ The game logs of all the players in the league, in a compact schema. Built once """
+        return schemaScripts.compact_game_logs_df(self.players_game_logs.player_game_logs.get_data_frame())
+
+    @cached_property
+    def players_features_df(self) -> DataFrame:
+        """ A row of features for every player in the league (totals, most recent team...). Built once """
+        return playerFeaturesScripts.get_players_features_df(self.game_logs_df)
+
+    def get_league_rolling_stats_df(self, window: int = 10, stats: Optional[list[str]] = None) -> DataFrame:
+        """
+        :param window: The number of games in every window
+        :param stats: The stats to roll. rollingStatsScripts.rolling_stats by default
+        :return: The rolling stats of every player after every game, from the league's game logs at once (see
+        rollingStatsScripts)
+        """
+        return rollingStatsScripts.get_rolling_stats_df(self.game_logs_df, window=window, stats=stats)
+
+    def get_league_recent_form_df(self, last_n_games: int = 10, stats: Optional[list[str]] = None) -> DataFrame:
+        """
+        :param last_n_games: The number of recent games
+        :param stats: The stats to sum. rollingStatsScripts.rolling_stats by default
+        :return: The sums, means and shooting percentages of the last games of every player, indexed by PLAYER_ID
+        """
+        return rollingStatsScripts.get_recent_form_df(self.game_logs_df, last_n_games=last_n_games, stats=stats)
+
+    @cached_property
+    def teams_per_factors_df(self) -> DataFrame:
+        """ The factors of every team in the aPER calculation (see perScripts). Built once """
+        return perScripts.get_teams_per_factors_df(self.team_stats_classic.league_dash_team_stats.get_data_frame(),
+                                                   self.get_league_pace_info())
+
+    def get_league_per_factors(self) -> dict[str, float]:
+        """ The league factors in the aPER calculation (see perScripts) """
+        return {
+            'ASSIST_FACTOR': self.get_league_assist_factor(),
+            'PPP': self.get_league_ppp(),
+            'DREB_PCT': self.get_league_defensive_reb_percentage(),
+            'FOUL_FACTOR': self.get_league_foul_factor(),
+        }
+
+    def get_league_minutes_split_per_df(self, minutes_limit: float = 30, games_limit: int = 20) -> DataFrame:
+        """
+        :param minutes_limit: The number of minutes that splits the games
+        :param games_limit: The number of games a player has to play on both sides of the minutes limit
+        :return: The aPER of every player in the games over the minutes limit and in the other games, and the diff,
+        from the league's game logs at once (see perScripts). Every player's factors are of his most recent team
+        """
+        return perScripts.get_minutes_split_per_df(self.game_logs_df, self.players_features_df['TEAM_ID'],
+                                                   self.teams_per_factors_df, self.get_league_per_factors(),
+                                                   minutes_limit=minutes_limit, games_limit=games_limit)
+
+    @cached_property
+    def players_closest_defender_shooting(self) -> list[LeagueDashPlayerPtShot]:
+        """
+        The shooting of all the players in the league outside 10 feet, with a request for every closest defender
+        distance range. Requested concurrently
+        """
+        if int(self.season[:4]) < 2013:
+            raise NoStatDashboard(f'No shot dashboard in {self.season[:4]} - Only since 2013')
+        return utilsScripts.get_stat_classes_concurrently(
+            LeagueDashPlayerPtShot,
+            [{'season': self.season, 'close_def_dist_range_nullable': close_def_dist_range,
+              'shot_dist_range_nullable': '>=10.0'} | self._additional_parameters
+             for close_def_dist_range in closestDefenderScripts.close_def_dist_ranges])
+
+    @cached_property
+    def contested_shooting_df(self) -> DataFrame:
+        """ The contested and uncontested shooting outside 10 feet of every player in the league. Built once """
+        closest_defender_df = pd.concat(
+            [closest_defender_shooting.league_dash_ptshots.get_data_frame().assign(
+                CLOSE_DEF_DIST_RANGE=close_def_dist_range)
+             for closest_defender_shooting, close_def_dist_range in
+             zip(self.players_closest_defender_shooting, closestDefenderScripts.close_def_dist_ranges)],
+            ignore_index=True)
+        return closestDefenderScripts.get_contested_shooting_df(closest_defender_df)
+
+    @property
+    def league_contested_shooting_df(self) -> DataFrame:
+        return self.contested_shooting_df
+
+    @cached_property
+    def lineup_stints_df(self) -> DataFrame:
+        """
+        The lineup stints of every regular season game (see lineupStintsScripts), reconstructed from the play by play.
+        Warning - Takes a LONG time, since it requests every game. Built once
+        """
+        if int(self.season[:4]) < 1996:
+            raise NoStatDashboard(f'No play by play in {self.season[:4]} - Only since 1996')
+        game_ids = list(gameScripts.NBASingleSeasonGames(self.season).games_df['GAME_ID'].astype(str).unique())
+        return lineupStintsScripts.get_stints_df(game_ids)
+
+    @property
+    def league_lineup_stints_df(self) -> DataFrame:
+        return self.lineup_stints_df
+
+    @cached_property
+    def rapm_df(self) -> DataFrame:
+        """ The RAPM estimates of every player in the league, fitted over the season's lineup stints. Built once """
+        return rapmScripts.get_rapm_df(self.lineup_stints_df)
+
+    @property
+    def league_rapm_df(self) -> DataFrame:
+        return self.rapm_df
+
+    @cached_property
+    def players_passing_dashboards(self) -> list[PlayerDashPtPass]:
+        """ The passing dashboards of all the players in the league. Requested concurrently """
+        if int(self.season[:4]) < 2013:
+            raise NoStatDashboard(f'No passing dashboard in {self.season[:4]} - Only since 2013')
+        return utilsScripts.get_stat_classes_concurrently(
+            PlayerDashPtPass,
+            [{'team_id': 0, 'player_id': player_id, 'season': self.season} | self._additional_parameters
+             for player_id in self.players_features_df.index])
+
+    @cached_property
+    def passing_network(self) -> passingNetworkScripts.PassingNetwork:
+        """ The passing network of all the players in the league. Built once """
+        return passingNetworkScripts.get_passing_network_from_dashboards(self.players_passing_dashboards)
+
+    @property
+    def league_passing_network(self) -> passingNetworkScripts.PassingNetwork:
+        return self.passing_network
+
+    def get_efg_percentage_by_previous_shots_results(self, max_number_of_previous_shots: int = 5) -> DataFrame:
+        """
+        :param max_number_of_previous_shots: The biggest number of previous shots to check the condition on
+        :return: A df with the EFG% on shots after every number of consecutive makes and misses (up to
+        max_number_of_previous_shots), for every player in the league
+        """
+        return shotChartScripts.get_efg_percentage_by_previous_shots_results(
+            self.shot_chart_df,
+            max_number_of_previous_shots=max_number_of_previous_shots
+        )
+
+    def get_efg_percentage_by_shot_zone(self, zone_columns: Union[str, list[str]],
+                                        by_player: bool = False) -> DataFrame:
+        """
+        :param zone_columns: One or more of SHOT_SIDE_CODE, SHOT_DISTANCE_BAND_CODE and SHOT_HEX_CELL_CODE
+        :param by_player: Whether to aggregate every player separately or all the league's shots together
+        :return: A df with FGM, FG3M, FGA and EFG_PCT for every zone with shots
+        """
+        return shotChartScripts.get_efg_percentage_by_zone(self.shot_chart_df, zone_columns, by_player=by_player)
+
     def initialize_stat_classes(self) -> None:
         """ Initializing all the classes, and setting them under self """
-        self.logger.info(f'Initializing stat classes for league {self.season} object..')
+        self.logger.info('Initializing stat classes for league %s object..', self.season)
 
         for stat_class_name in self.get_stat_classes_names():
             try:
                 # This is to force the lru property to actually cache the value.
                 getattr(self, stat_class_name)
             except ValueError as e:
-                self.logger.warning(f"Couldn't initialize {stat_class_name} - Maybe it didn't exist in {self.season}")
+                self.logger.warning("Couldn't initialize %s - Maybe it didn't exist in %s", stat_class_name, self.season)
                 self.logger.error(e, exc_info=True)
 
     def _initialize_players_not_on_team_objects(self, initialize_game_objects: bool = False) -> None:
@@ -266,39 +527,97 @@ class NBALeague(utilsScripts.Loggable, PlayersContainer):
         else:
             return filtered_team_objects_list[0]
 
-    def get_league_all_shooters_lineups_dicts(self, attempts_limit=50):
+    def get_league_lineups_df(self, full_coverage: bool = False) -> DataFrame:
+        """
+        :param full_coverage: Whether to use all the lineups (from the league's lineup stints, for all the teams at
+        once) or only the ones of every team's TeamDashLineups
+        :return: The lineups of all the teams, with a TEAM_ID column
+        """
+        if full_coverage:
+            return lineupStintsScripts.get_lineups_df(self.lineup_stints_df)
+        return self.lineups_df
+
+    def classify_league_lineups(self, player_masks: Optional[dict[str, Series]] = None,
+                                full_coverage: bool = False) -> DataFrame:
+        """
+        :param player_masks: Boolean masks (indexed by PLAYER_ID) of every kind of player, by its name. The default
+        masks (shooters, bigs and playmakers) by default
+        :param full_coverage: Whether to use all the lineups (from the lineup stints) or only the ones of
+        TeamDashLineups
+        :return: All the lineups in the league, tagged by their composition (see lineupArchetypeScripts)
+        """
+        if player_masks is None:
+            player_masks = lineupArchetypeScripts.get_default_player_masks(self.players_features_df)
+        return lineupArchetypeScripts.classify_lineups(self.get_league_lineups_df(full_coverage=full_coverage),
+                                                       player_masks)
+
+    def get_league_lineup_archetypes_stats_df(self, player_masks: Optional[dict[str, Series]] = None,
+                                              by_team: bool = True, full_coverage: bool = False) -> DataFrame:
+        """
+        :param player_masks: Boolean masks of every kind of player (see classify_league_lineups)
+        :param by_team: Whether to aggregate every team's lineups separately or not
+        :param full_coverage: Whether to use all the lineups (from the lineup stints) or only the ones of
+        TeamDashLineups
+        :return: The aggregated stats of every lineup archetype (of every team)
+        """
+        return lineupArchetypeScripts.get_archetypes_stats_df(
+            self.classify_league_lineups(player_masks=player_masks, full_coverage=full_coverage), by_team=by_team)
+
+    def get_league_all_shooters_lineups_df(self, attempts_limit=50, full_coverage: bool = False) -> DataFrame:
+        """
+        :param attempts_limit: The number of attempted three's a player has to shot to count as a shooter
+        :type attempts_limit: int
+        :param full_coverage: Whether to use all the lineups (from the lineup stints) or only the ones of
+        TeamDashLineups
+        :return: The lineups of all the teams where all of it's participants shot more three's this season then the
+        attempts_limit
+        :rtype: DataFrame
+        """
+        shooters_mask = playerFeaturesScripts.get_three_point_shooters_mask(self.players_features_df,
+                                                                           attempts_limit=attempts_limit)
+        return lineupArchetypeScripts.get_all_shooters_lineups_df(
+            self.get_league_lineups_df(full_coverage=full_coverage), shooters_mask)
+
+    def get_league_all_shooters_lineups_dicts(self, attempts_limit=50, full_coverage: bool = False) -> list[dict]:
         """
         :param attempts_limit: The number of attempted three's a player has to shot to count as a shooter
         :type attempts_limit: int
+        :param full_coverage: Whether to use all the lineups (from the lineup stints) or only the ones of
+        TeamDashLineups
         :return: a list of dicts, where every dict represent a lineup where all of it's participants shot more three's
-        this season then the attempts_limit
+        this season then the attempts_limit (see get_league_all_shooters_lineups_df)
         :rtype: list[dict]
         """
-        league_all_shooters_lineups_dicts = []
-        for all_shooters_lineups_dict_for_a_team in \
-                [team_object.get_all_shooters_lineups_df(attempts_limit=attempts_limit) for team_object in
-                 self.team_objects_list]:
-            league_all_shooters_lineups_dicts += all_shooters_lineups_dict_for_a_team
-        return league_all_shooters_lineups_dicts
+        return self.get_league_all_shooters_lineups_df(attempts_limit=attempts_limit,
+                                                       full_coverage=full_coverage).to_dict('records')
 
-    def get_league_all_shooters_lineups_stats_per_team(self, attempts_limit=50):
+    def get_league_all_shooters_lineups_stats_per_team(self, attempts_limit=50, full_coverage: bool = False):
         """
 
         :param attempts_limit: The number of attempted three's a player has to shot to count as a shooter
         :type attempts_limit: int
-        :return:
-        :rtype:dict[dict]
+        :param full_coverage: Whether to use all the lineups (from the lineup stints) or only the ones of
+        TeamDashLineups
+        :return: The joined stats of the all shooters lineups of every team, by the team's name
+        :rtype:dict[DataFrame]
         """
+        all_shooters_lineups_df = self.get_league_all_shooters_lineups_df(attempts_limit=attempts_limit,
+                                                                         full_coverage=full_coverage)
         league_all_shooters_lineups_dicts = {}
-        teams_all_shooters_lineup_dicts = [
-            (team_object.id, team_object.get_all_shooters_lineups_df(attempts_limit=attempts_limit)) for
-            team_object in self.team_objects_list]
-        for team_id, team_all_shooters_lineups_dicts in teams_all_shooters_lineup_dicts:
+        for team_id, team_all_shooters_lineups_df in all_shooters_lineups_df.groupby('TEAM_ID', sort=False):
             team_name = teamScripts.teams_name_dict[team_id]
             league_all_shooters_lineups_dicts[team_name] = utilsScripts.join_advanced_lineup_df(
-                team_all_shooters_lineups_dicts)
+                team_all_shooters_lineups_df.drop(columns=['TEAM_ID']))
         return league_all_shooters_lineups_dicts
 
+    def get_league_pairwise_synergy_df(self, full_coverage: bool = False) -> DataFrame:
+        """
+        :param full_coverage: Whether to use all the lineups (from the league's lineup stints, for all the teams at
+        once) or only the ones of every team's TeamDashLineups
+        :return: A row for every pair of teammates that played together in the league (see synergyScripts)
+        """
+        return synergyScripts.get_league_pairwise_synergy_df(self.get_league_lineups_df(full_coverage=full_coverage))
+
     # noinspection PyPep8Naming
     def get_players_sorted_by_per(self):
         """
@@ -314,8 +633,7 @@ class NBALeague(utilsScripts.Loggable, PlayersContainer):
                               p.is_player_over_projected_minutes_limit(minutes_limit=500)]
         num_of_players_on_teams = len(qualifying_players)
 
-        for i, my_player_object in enumerate(qualifying_players, start=1):
-            self.logger.info('Player %s/%s' % (i, num_of_players_on_teams))
+        for my_player_object in utilsScripts.iterate_with_progress_log(qualifying_players, 'Player'):
             aPER = my_player_object.get_aPER()
             aPer_sum += aPER
             players_name_and_result.append((my_player_object.name, aPER))
@@ -0,0 +1,86 @@
+"""
+Lineup archetypes - every lineup in the league is tagged by its composition (how many shooters, bigs, playmakers...),
+where every kind of player is a boolean mask over the league's players features df. The number of players of every
+kind in every lineup is a single product of the lineups membership matrix with the masks.
+"""
+from typing import Optional
+
+import numpy as np
+from pandas import DataFrame, Series
+
+import playerFeaturesScripts
+import synergyScripts
+
+
+def get_default_player_masks(features_df: DataFrame, shooters_attempts_limit: float = 50,
+                             bigs_rebounds_per_36_limit: float = 9,
+                             playmakers_assists_per_36_limit: float = 6) -> dict[str, Series]:
+    """
+    :param features_df: The league's players features df
+    :param shooters_attempts_limit: The number of attempted three's a player has to shot to count as a shooter
+    :param bigs_rebounds_per_36_limit: The rebounds per 36 minutes a player has to grab to count as a big
+    :param playmakers_assists_per_36_limit: The assists per 36 minutes a player has to give to count as a playmaker
+    :return: The masks (indexed by PLAYER_ID) of every kind of player, by its name
+    """
+    return {
+        'SHOOTERS': playerFeaturesScripts.get_three_point_shooters_mask(features_df,
+                                                                        attempts_limit=shooters_attempts_limit),
+        'BIGS': playerFeaturesScripts.get_per_36_stat_limit_mask(features_df, 'REB', bigs_rebounds_per_36_limit),
+        'PLAYMAKERS': playerFeaturesScripts.get_per_36_stat_limit_mask(features_df, 'AST',
+                                                                       playmakers_assists_per_36_limit),
+    }
+
+
+def classify_lineups(lineups_df: DataFrame, player_masks: dict[str, Series]) -> DataFrame:
+    """
+    :param lineups_df: Lineups with a GROUP_ID column ('-id-id-id-id-id-', like TeamDashLineups)
+    :param player_masks: Boolean masks (indexed by PLAYER_ID) of every kind of player, by its name
+    :return: The lineups, with a NUM_<name> column for every kind of player, and an ARCHETYPE column of all the
+    counts ('5 SHOOTERS, 0 BIGS')
+    """
+    membership, player_ids = synergyScripts.get_lineups_membership(lineups_df)
+    classified_lineups_df = lineups_df.copy()
+    archetype = None
+    for name, player_mask in player_masks.items():
+        is_player_of_kind = player_mask.reindex(player_ids, fill_value=False).to_numpy(dtype=np.float64)
+        counts = (membership @ is_player_of_kind).astype(np.int64)
+        classified_lineups_df[f'NUM_{name}'] = counts
+        counts_string = Series(counts, index=lineups_df.index).astype(str) + f' {name}'
+        archetype = counts_string if archetype is None else archetype + ', ' + counts_string
+    classified_lineups_df['ARCHETYPE'] = archetype
+    return classified_lineups_df
+
+
+def get_all_shooters_lineups_df(lineups_df: DataFrame, shooters_mask: Series) -> DataFrame:
+    """
+    :param lineups_df: Lineups with a GROUP_ID column ('-id-id-id-id-id-', like TeamDashLineups)
+    :param shooters_mask: A boolean mask (indexed by PLAYER_ID) of the shooters
+    :return: The lineups where all five players are shooters
+    """
+    classified_lineups_df = classify_lineups(lineups_df, {'SHOOTERS': shooters_mask})
+    return classified_lineups_df[classified_lineups_df['NUM_SHOOTERS'] == 5].drop(
+        columns=['NUM_SHOOTERS', 'ARCHETYPE']).reset_index(drop=True)
+
+
+def get_archetypes_stats_df(classified_lineups_df: DataFrame, by_team: bool = True,
+                            archetype_columns: Optional[list[str]] = None) -> DataFrame:
+    """
+    :param classified_lineups_df: Classified lineups (see classify_lineups), with MIN, POSS and the rating columns
+    :param by_team: Whether to aggregate every team's lineups separately (by TEAM_ID) or not
+    :param archetype_columns: The columns that define an archetype. ARCHETYPE (all the counts) by default - pass
+    NUM_<name> columns to aggregate by some of the kinds of players only
+    :return: A row for every archetype (of every team) with the number of LINEUPS, the sum of MIN and POSS, and the
+    ratings weighted by the possessions
+    """
+    archetype_columns = ['ARCHETYPE'] if archetype_columns is None else archetype_columns
+    group_columns = ['TEAM_ID'] + archetype_columns if by_team else archetype_columns
+    possessions = classified_lineups_df['POSS'].astype(np.float64)
+    aggregated_df = DataFrame({'MIN': classified_lineups_df['MIN'].astype(np.float64), 'POSS': possessions})
+    for rating_column in synergyScripts.rating_columns:
+        aggregated_df[rating_column] = possessions * classified_lineups_df[rating_column].astype(np.float64)
+    groups = aggregated_df.groupby([classified_lineups_df[column] for column in group_columns])
+    archetypes_stats_df = groups.sum()
+    archetypes_stats_df.insert(0, 'LINEUPS', groups.size())
+    for rating_column in synergyScripts.rating_columns:
+        archetypes_stats_df[rating_column] /= archetypes_stats_df['POSS'].where(archetypes_stats_df['POSS'] > 0)
+    return archetypes_stats_df.reset_index()
@@ -0,0 +1,226 @@
+"""
+Lineup stints reconstructed from the play by play - every stretch of a game where both teams had the same five
+players on the court, with its minutes, points and possessions. Unlike TeamDashLineups (which returns only 250
+lineups), the stints cover every minute of every game, so lineup aggregates built from them have full coverage.
+
+The on-court players come from GameRotation (the in and out times of every player), and the points and possessions
+from PlayByPlayV3. Games are processed in chunks, with the requests of every chunk sent concurrently, and only the
+compact stints of every game are kept.
+"""
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from nba_api.stats.endpoints import GameRotation, PlayByPlayV3
+from pandas import DataFrame, Series
+
+import normalizationScripts
+import schemaScripts
+import utilsScripts
+
+# Times are in tenths of a second since the start of the game, like GameRotation's IN_TIME_REAL and OUT_TIME_REAL
+REGULATION_PERIOD_TIME = 7200
+OVERTIME_PERIOD_TIME = 3000
+lineup_player_columns = ['P1', 'P2', 'P3', 'P4', 'P5']
+opponent_lineup_player_columns = [f'OPPONENT_{column}' for column in lineup_player_columns]
+stint_stats = ['MIN', 'PTS_FOR', 'PTS_AGAINST', 'POSS_FOR', 'POSS_AGAINST']
+
+
+def get_period_start_time(period: np.ndarray) -> np.ndarray:
+    """ The time (since the start of the game) of the start of every period """
+    return np.where(period <= 4,
+                    (period - 1) * REGULATION_PERIOD_TIME,
+                    4 * REGULATION_PERIOD_TIME + (period - 5) * OVERTIME_PERIOD_TIME)
+
+
+def get_elapsed_time(period: np.ndarray, clock: Series) -> np.ndarray:
+    """
+    :param period: The period of every event
+    :param clock: The game clock of every event, in PlayByPlayV3's format ('PT11M34.00S')
+    :return: The time of every event since the start of the game
+    """
+    clock_parts = clock.str.extract(r'PT(\d+)M([\d.]+)S').astype(np.float64)
+    remaining_time = np.rint((clock_parts[0] * 60 + clock_parts[1]).to_numpy() * 10)
+    period_time = np.where(period <= 4, REGULATION_PERIOD_TIME, OVERTIME_PERIOD_TIME)
+    return (get_period_start_time(period) + period_time - remaining_time).astype(np.int64)
+
+
+def get_rotation_df(game_rotation: GameRotation) -> DataFrame:
+    """ The rotation rows of both teams, with an IS_HOME column """
+    return pd.concat([game_rotation.home_team.get_data_frame().assign(IS_HOME=True),
+                      game_rotation.away_team.get_data_frame().assign(IS_HOME=False)], ignore_index=True)
+
+
+def _get_on_court_lineups(team_rotation_df: DataFrame, times: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :param team_rotation_df: The rotation rows of a single team
+    :param times: The times to check
+    :return: tuple of:
+        The sorted ids of the players on the court at every time (a row for every time)
+        Whether there were exactly five players on the court at every time
+    """
+    player_ids = team_rotation_df['PERSON_ID'].to_numpy(dtype=np.int64)
+    in_times = np.rint(team_rotation_df['IN_TIME_REAL'].to_numpy(dtype=np.float64))
+    out_times = np.rint(team_rotation_df['OUT_TIME_REAL'].to_numpy(dtype=np.float64))
+    is_on_court = (in_times <= times[:, None]) & (times[:, None] < out_times)
+    has_five_players = is_on_court.sum(axis=1) == 5
+    on_court_player_ids = np.sort(np.where(is_on_court, player_ids, np.iinfo(np.int64).max), axis=1)
+    lineups = np.full((len(times), 5), -1, dtype=np.int64)
+    number_of_columns = min(5, on_court_player_ids.shape[1])
+    lineups[:, :number_of_columns] = on_court_player_ids[:, :number_of_columns]
+    lineups[~has_five_players] = -1
+    return lineups, has_five_players
+
+
+def _get_events_cumulative_stats(play_by_play_df: DataFrame, team_ids: list[int]) -> tuple[np.ndarray, dict]:
+    """
+    :param play_by_play_df: The game's PlayByPlayV3 rows
+    :param team_ids: The ids of the home team and of the away team
+    :return: tuple of:
+        The time of every event
+        The points and the possessions of every team (by its id) up to (and including) every event.
+        Possessions are estimated - FGA + 0.44 * FTA + TOV - OREB
+    """
+    play_by_play_df = play_by_play_df.sort_values('actionNumber', kind='stable')
+    event_times = np.maximum.accumulate(
+        get_elapsed_time(play_by_play_df['period'].to_numpy(dtype=np.int64), play_by_play_df['clock']))
+    action_type = play_by_play_df['actionType']
+    # Events that are not of a team (start of period...) have no team id
+    event_team_ids = pd.to_numeric(play_by_play_df['teamId'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+    is_field_goal_attempt = play_by_play_df['isFieldGoal'].to_numpy() == 1
+    is_free_throw_attempt = (action_type == 'Free Throw').to_numpy()
+    is_miss = ((play_by_play_df['shotResult'] == 'Missed') |
+               play_by_play_df['description'].str.startswith('MISS', na=False)).to_numpy()
+    is_miss = is_miss & (is_field_goal_attempt | is_free_throw_attempt)
+    # A rebound is offensive if it's of the team that missed the last shot
+    missing_team_ids = Series(np.where(is_miss, event_team_ids, np.nan)).ffill().to_numpy()
+    is_offensive_rebound = (action_type == 'Rebound').to_numpy() & (event_team_ids == missing_team_ids)
+    possessions_value = (is_field_goal_attempt +
+                         normalizationScripts.free_throw_possession_factor * is_free_throw_attempt +
+                         (action_type == 'Turnover').to_numpy() - is_offensive_rebound)
+
+    cumulative_stats = {}
+    for team_id, score_column in zip(team_ids, ['scoreHome', 'scoreAway']):
+        points = pd.to_numeric(play_by_play_df[score_column], errors='coerce').ffill().fillna(0).to_numpy()
+        possessions = np.cumsum(np.where(event_team_ids == team_id, possessions_value, 0))
+        cumulative_stats[team_id] = {'PTS': points, 'POSS': possessions}
+    return event_times, cumulative_stats
+
+
+def _get_value_at_times(event_times: np.ndarray, cumulative_values: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """ The cumulative value of the events up to every time. Events at the time itself are included """
+    event_positions = np.searchsorted(event_times, times, side='right') - 1
+    return np.where(event_positions >= 0, cumulative_values[np.maximum(event_positions, 0)], 0)
+
+
+def get_game_stints_df(rotation_df: DataFrame, play_by_play_df: DataFrame) -> DataFrame:
+    """
+    Events at a substitution time are counted for the lineups that were on the court until it (so free throws after
+    a substitution are counted for the lineups of the foul). Stretches where a team doesn't have exactly five players
+    on the court (missing rotation data) are dropped.
+
+    :param rotation_df: The rotation rows of both teams of the game (see get_rotation_df)
+    :param play_by_play_df: The game's PlayByPlayV3 rows
+    :return: A df with two rows for every stint (one for every team) - GAME_ID, TEAM_ID, OPPONENT_TEAM_ID, START_TIME,
+    END_TIME, the ids of the team's players (sorted, P1-P5) and of the opponent's players (OPPONENT_P1-OPPONENT_P5),
+    MIN, and the team's PTS_FOR, PTS_AGAINST, POSS_FOR and POSS_AGAINST
+    """
+    game_id = rotation_df['GAME_ID'].iloc[0]
+    times = np.unique(np.rint(np.concatenate([rotation_df['IN_TIME_REAL'].to_numpy(dtype=np.float64),
+                                              rotation_df['OUT_TIME_REAL'].to_numpy(dtype=np.float64)])))
+    start_times, end_times = times[:-1], times[1:]
+    is_home = rotation_df['IS_HOME'].to_numpy(dtype=bool)
+    home_team_id = int(rotation_df.loc[is_home, 'TEAM_ID'].iloc[0])
+    away_team_id = int(rotation_df.loc[~is_home, 'TEAM_ID'].iloc[0])
+    home_lineups, home_has_five_players = _get_on_court_lineups(rotation_df[is_home], start_times)
+    away_lineups, away_has_five_players = _get_on_court_lineups(rotation_df[~is_home], start_times)
+    is_valid = home_has_five_players & away_has_five_players
+    start_times, end_times = start_times[is_valid], end_times[is_valid]
+    lineups_by_team_id = {home_team_id: home_lineups[is_valid], away_team_id: away_lineups[is_valid]}
+
+    event_times, cumulative_stats = _get_events_cumulative_stats(play_by_play_df, [home_team_id, away_team_id])
+    stint_stats_by_team_id = {
+        team_id: {stat: (_get_value_at_times(event_times, cumulative_values, end_times) -
+                         _get_value_at_times(event_times, cumulative_values, start_times))
+                  for stat, cumulative_values in team_cumulative_stats.items()}
+        for team_id, team_cumulative_stats in cumulative_stats.items()}
+
+    team_stints_dfs = []
+    for team_id, opponent_team_id in [(home_team_id, away_team_id), (away_team_id, home_team_id)]:
+        team_stints_df = DataFrame({
+            'GAME_ID': game_id,
+            'TEAM_ID': team_id,
+            'OPPONENT_TEAM_ID': opponent_team_id,
+            'START_TIME': start_times.astype(np.int64),
+            'END_TIME': end_times.astype(np.int64),
+        })
+        team_stints_df[lineup_player_columns] = lineups_by_team_id[team_id]
+        team_stints_df[opponent_lineup_player_columns] = lineups_by_team_id[opponent_team_id]
+        team_stints_df['MIN'] = (end_times - start_times) / 600
+        team_stints_df['PTS_FOR'] = stint_stats_by_team_id[team_id]['PTS']
+        team_stints_df['PTS_AGAINST'] = stint_stats_by_team_id[opponent_team_id]['PTS']
+        team_stints_df['POSS_FOR'] = stint_stats_by_team_id[team_id]['POSS']
+        team_stints_df['POSS_AGAINST'] = stint_stats_by_team_id[opponent_team_id]['POSS']
+        team_stints_dfs.append(team_stints_df)
+    return pd.concat(team_stints_dfs, ignore_index=True)
+
+
+def iterate_games_stints_dfs(game_ids: list[str], chunk_size: int = 50, max_workers: int = 4) -> Iterator[DataFrame]:
+    """
+    :param game_ids: The ids of the games
+    :param chunk_size: The number of games that are requested together
+    :param max_workers: The maximum number of requests that are sent at the same time
+    :return: The compact stints df of every game, in the order of the game ids. Games without the rotation of both
+    teams are skipped (with a warning), so they don't fail the whole season
+    """
+    for chunk_start in range(0, len(game_ids), chunk_size):
+        chunk_game_ids = game_ids[chunk_start:chunk_start + chunk_size]
+        chunk_kwargs_list = [{'game_id': game_id} for game_id in chunk_game_ids]
+        games_rotations = utilsScripts.get_stat_classes_concurrently(GameRotation, chunk_kwargs_list,
+                                                                     max_workers=max_workers)
+        games_play_by_play = utilsScripts.get_stat_classes_concurrently(PlayByPlayV3, chunk_kwargs_list,
+                                                                        max_workers=max_workers)
+        for game_id, game_rotation, game_play_by_play in zip(chunk_game_ids, games_rotations, games_play_by_play):
+            rotation_df = get_rotation_df(game_rotation)
+            if rotation_df['IS_HOME'].nunique() < 2:
+                utilsScripts.logger.warning('No rotation data for both teams in game %s - skipping it', game_id)
+                continue
+            yield schemaScripts.compact_stints_df(get_game_stints_df(
+                rotation_df, game_play_by_play.play_by_play.get_data_frame()))
+
+
+def get_stints_df(game_ids: list[str], chunk_size: int = 50, max_workers: int = 4) -> DataFrame:
+    """ The compact stints of all the games (see get_game_stints_df) """
+    return schemaScripts.concat_compact_dfs(list(utilsScripts.iterate_with_progress_log(
+        iterate_games_stints_dfs(game_ids, chunk_size=chunk_size, max_workers=max_workers),
+        'Game', total=len(game_ids))))
+
+
+def get_lineups_df(stints_df: DataFrame) -> DataFrame:
+    """
+    :param stints_df: Stints of any number of games and teams
+    :return: A row for every lineup of every team - TEAM_ID, P1-P5, GROUP_ID (like TeamDashLineups, so the lineup
+    utils work on it), GP, the sums of the stint stats, POSS, OFF_RATING, DEF_RATING, NET_RATING and PLUS_MINUS.
+    Sorted by the minutes played
+    """
+    lineup_columns = ['TEAM_ID'] + lineup_player_columns
+    # Stats are downcast in the compact schema, so they are summed as float64
+    stats_df = stints_df[stint_stats].astype(np.float64)
+    lineup_keys = [stints_df[column].astype(np.int64) for column in lineup_columns]
+    lineups_df = stats_df.groupby(lineup_keys).sum()
+    lineups_df.insert(0, 'GP', stints_df['GAME_ID'].astype(str).groupby(lineup_keys).nunique())
+    lineups_df = lineups_df.reset_index()
+
+    group_id = Series('-', index=lineups_df.index)
+    for column in lineup_player_columns:
+        group_id += lineups_df[column].astype(str) + '-'
+    lineups_df.insert(len(lineup_columns), 'GROUP_ID', group_id)
+    lineups_df['POSS'] = lineups_df['POSS_FOR']
+    for rating_column, points_column, possessions_column in [('OFF_RATING', 'PTS_FOR', 'POSS_FOR'),
+                                                            ('DEF_RATING', 'PTS_AGAINST', 'POSS_AGAINST')]:
+        possessions = lineups_df[possessions_column].to_numpy()
+        lineups_df[rating_column] = np.divide(100 * lineups_df[points_column].to_numpy(), possessions,
+                                              out=np.zeros(len(lineups_df)), where=possessions > 0)
+    lineups_df['NET_RATING'] = lineups_df['OFF_RATING'] - lineups_df['DEF_RATING']
+    lineups_df['PLUS_MINUS'] = lineups_df['PTS_FOR'] - lineups_df['PTS_AGAINST']
+    return lineups_df.sort_values('MIN', ascending=False, kind='stable', ignore_index=True)
@@ -0,0 +1,133 @@
+"""
+Fast resolution of names to ids. The index is built once, and every lookup is a dict lookup (exact name), a trie walk
+(start of a name or of one of its words) or an n-gram comparison (misspelled names) - and not a scan over all the names.
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from nba_api.stats.static.players import get_players
+
+# Names with less than this portion of common n-grams with the searched name are not considered a fuzzy match
+min_fuzzy_match_score = 0.5
+n_gram_size = 3
+
+
+def normalize_name(name: str) -> str:
+    """
+    :param name: A name, in any format ('Nikola Jokić', 'stephen_curry', "D'Angelo Russell")
+    :return: The name without accents and punctuation, in lower case and with single spaces ('nikola jokic')
+    """
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    name = re.sub(r"['.]", '', name)
+    return ' '.join(re.split(r'[\s_\-]+', name.strip()))
+
+
+def _get_n_grams(normalized_name: str) -> set[str]:
+    padded_name = f' {normalized_name} '
+    return {padded_name[i:i + n_gram_size] for i in range(len(padded_name) - n_gram_size + 1)}
+
+
+class NameIndex:
+    """
+    An index from names to ids. A name can belong to several ids (two players with the same name)
+    """
+
+    def __init__(self, names_and_ids: Iterable[tuple[str, int]]):
+        """
+
+        :param names_and_ids: (name, id) pairs
+        """
+        self._names_by_id: dict[int, str] = {}
+        self._exact_map: dict[str, set[int]] = defaultdict(set)
+        # Every node is a dict of the next characters, and the ids of the names under it are kept in the '' key
+        self._prefix_trie: dict = {'': set()}
+        self._n_grams_map: dict[str, set[int]] = defaultdict(set)
+        self._n_grams_count_by_id: dict[int, int] = {}
+        for name, id_ in names_and_ids:
+            self._add_name(name, id_)
+
+    def _add_name(self, name: str, id_: int) -> None:
+        normalized_name = normalize_name(name)
+        self._names_by_id[id_] = name
+        self._exact_map[normalized_name].add(id_)
+        words = normalized_name.split(' ')
+        # The name is inserted from the start of every word, so 'cur' finds 'stephen curry'
+        for word_index in range(len(words)):
+            node = self._prefix_trie
+            for char in ' '.join(words[word_index:]):
+                node = node.setdefault(char, {'': set()})
+                node[''].add(id_)
+        n_grams = _get_n_grams(normalized_name)
+        for n_gram in n_grams:
+            self._n_grams_map[n_gram].add(id_)
+        self._n_grams_count_by_id[id_] = len(n_grams)
+
+    def __len__(self) -> int:
+        return len(self._names_by_id)
+
+    def __contains__(self, id_: int) -> bool:
+        return id_ in self._names_by_id
+
+    def get_name(self, id_: int) -> str:
+        """ The original name of the id """
+        return self._names_by_id[id_]
+
+    def find_exact_ids(self, name: str) -> set[int]:
+        """ The ids with exactly this name (after normalization) """
+        return set(self._exact_map.get(normalize_name(name), set()))
+
+    def find_prefix_ids(self, prefix: str) -> set[int]:
+        """ The ids of the names that one of their words starts with the prefix (after normalization) """
+        node = self._prefix_trie
+        for char in normalize_name(prefix):
+            if char not in node:
+                return set()
+            node = node[char]
+        return set(node[''])
+
+    def find_fuzzy_ids(self, name: str, min_score: float = min_fuzzy_match_score) -> set[int]:
+        """
+        Compares the n-grams of the names (Dice coefficient), using only the names that share an n-gram with it
+
+        :param name: A name, that can be misspelled
+        :param min_score: The minimal portion of common n-grams for a match
+        :return: The ids with the best matching score (above the minimal score)
+        """
+        n_grams = _get_n_grams(normalize_name(name))
+        common_n_grams_count_by_id = defaultdict(int)
+        for n_gram in n_grams:
+            for id_ in self._n_grams_map.get(n_gram, ()):
+                common_n_grams_count_by_id[id_] += 1
+        scores_by_id = {id_: 2 * common_n_grams_count / (len(n_grams) + self._n_grams_count_by_id[id_])
+                        for id_, common_n_grams_count in common_n_grams_count_by_id.items()}
+        best_score = max(scores_by_id.values(), default=0)
+        if best_score < min_score:
+            return set()
+        return {id_ for id_, score in scores_by_id.items() if score == best_score}
+
+    def find_ids(self, name: str, ids_subset: Optional[set[int]] = None, fuzzy: bool = True) -> set[int]:
+        """
+        Tries an exact match, then a match by the start of the name's words, and only then a fuzzy match
+
+        :param name: The searched name (or the start of it)
+        :param ids_subset: If passed, only these ids can be returned
+        :param fuzzy: Whether to try a fuzzy match or not. A fuzzy match can be a different person with a similar name
+        :return: The matching ids of the first method that found any
+        """
+        find_functions = [self.find_exact_ids, self.find_prefix_ids] + ([self.find_fuzzy_ids] if fuzzy else [])
+        for find_function in find_functions:
+            ids = find_function(name)
+            if ids_subset is not None:
+                ids &= ids_subset
+            if ids:
+                return ids
+        return set()
+
+
+@lru_cache(maxsize=None)
+def get_players_name_index() -> NameIndex:
+    """ An index of all the players in history (from the static players data). Built once for the whole process """
+    return NameIndex((player_dict['full_name'], player_dict['id']) for player_dict in get_players())
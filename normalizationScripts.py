@@ -0,0 +1,130 @@
+"""
+Column-wise normalization of stat DataFrames - per game, per 36 minutes and per 100 possessions.
+Every function receives any stats df (game logs, season totals, lineups...) and returns a new normalized df, without
+iterating over the rows.
+"""
+from typing import Literal, Optional
+
+from pandas import DataFrame, Series
+
+NORMALIZATION_MODE = Literal['per_game', 'per_36', 'per_100_possessions']
+
+# Counting stats - The categories that are accumulated along games, and therefore have to be normalized
+counting_stats = ['AST',
+                  'BLK',
+                  'BLKA',
+                  'DREB',
+                  'FG2A',
+                  'FG2M',
+                  'FG3A',
+                  'FG3M',
+                  'FGA',
+                  'FGM',
+                  'FTA',
+                  'FTM',
+                  'MIN',
+                  'OREB',
+                  'PF',
+                  'PFD',
+                  'PTS',
+                  'REB',
+                  'STL',
+                  'TOV',
+                  'D_FGA',
+                  'D_FGM',
+                  'PASS',
+                  'C_DREB',
+                  'C_OREB',
+                  'C_REB',
+                  'UC_DREB',
+                  'UC_OREB',
+                  'UC_REB',
+                  ]
+# The portion of free throw attempts that end a possession (the common possessions estimation)
+free_throw_possession_factor = 0.44
+
+
+def get_counting_stats_columns(stats_df: DataFrame, exclude: Optional[list[str]] = None) -> list[str]:
+    """
+    :param stats_df: Any stats df
+    :param exclude: Counting stats that should not be returned
+    :return: The columns of the df that are counting stats
+    """
+    exclude = [] if exclude is None else exclude
+    return [column for column in stats_df.columns if column in counting_stats and column not in exclude]
+
+
+def get_possessions(stats_df: DataFrame) -> Series:
+    """
+    :param stats_df: A stat df. Can be for players, teams, leagues or games
+    :return: The number of possessions in every row of the df
+    """
+    return stats_df['FGA'] - stats_df['OREB'] + stats_df['TOV'] + (free_throw_possession_factor * stats_df['FTA'])
+
+
+def _divide_counting_stats(stats_df: DataFrame, denominator: Series, factor: float = 1,
+                           exclude: Optional[list[str]] = None) -> DataFrame:
+    """
+    Divides all the counting stats columns of the df by the denominator (row by row), and multiplies them by the factor
+    """
+    columns = get_counting_stats_columns(stats_df, exclude=exclude)
+    normalized_df = stats_df.copy()
+    normalized_df[columns] = stats_df[columns].div(denominator, axis=0) * factor
+    return normalized_df
+
+
+def get_per_game_stats(stats_df: DataFrame) -> DataFrame:
+    """
+    :param stats_df: A df of total stats. Has to have a "games" column (GP or G)
+    :return: The same df, where every counting stat is divided by the number of games
+    """
+    if 'GP' in stats_df:
+        games_denominator = stats_df['GP']
+    elif 'G' in stats_df:
+        games_denominator = stats_df['G']
+    else:
+        raise Exception('No "games" value in df')
+    return _divide_counting_stats(stats_df, games_denominator)
+
+
+def get_per_36_stats(stats_df: DataFrame, drop_zero_minutes: bool = True) -> DataFrame:
+    """
+    :param stats_df: A df of stats with a MIN column
+    :param drop_zero_minutes: Whether to remove rows with no minutes (which can not be normalized) or not
+    :return: The same df, where every counting stat (other than MIN) is measured per 36 minutes
+    """
+    if drop_zero_minutes:
+        stats_df = stats_df[stats_df['MIN'] > 0]
+    return _divide_counting_stats(stats_df, stats_df['MIN'], factor=36, exclude=['MIN'])
+
+
+def get_per_100_possessions_stats(stats_df: DataFrame, drop_zero_possessions: bool = True) -> DataFrame:
+    """
+    :param stats_df: A df of stats with the columns needed for calculating possessions (FGA, OREB, TOV, FTA)
+    :param drop_zero_possessions: Whether to remove rows with no possessions (which can not be normalized) or not
+    :return: The same df, where every counting stat (other than MIN) is measured per 100 possessions, with an added
+    POSS column
+    """
+    possessions = get_possessions(stats_df)
+    if drop_zero_possessions:
+        stats_df = stats_df[possessions > 0]
+        possessions = possessions[possessions > 0]
+    normalized_df = _divide_counting_stats(stats_df, possessions, factor=100, exclude=['MIN'])
+    normalized_df['POSS'] = possessions
+    return normalized_df
+
+
+def normalize_stats(stats_df: DataFrame, mode: NORMALIZATION_MODE) -> DataFrame:
+    """
+    :param stats_df: Any stats df
+    :param mode: per_game, per_36 or per_100_possessions
+    :return: The normalized df
+    """
+    if mode == 'per_game':
+        return get_per_game_stats(stats_df)
+    elif mode == 'per_36':
+        return get_per_36_stats(stats_df)
+    elif mode == 'per_100_possessions':
+        return get_per_100_possessions_stats(stats_df)
+    else:
+        raise ValueError(f'"{mode}" is not a valid normalization mode')
@@ -0,0 +1,69 @@
+"""
+League wide on/off tables - how every team played with every one of its players on the court, and off of it - built
+from the TeamPlayerOnOffSummary data of all the teams at once.
+"""
+from typing import Optional
+
+from pandas import DataFrame, Series
+from pandas.api.types import is_numeric_dtype
+
+# Columns that identify the rows, and are not on/off stats
+on_off_key_columns = ['GROUP_SET', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'VS_PLAYER_ID', 'VS_PLAYER_NAME',
+                      'COURT_STATUS']
+ON_PREFIX = 'ON_'
+OFF_PREFIX = 'OFF_'
+DIFF_SUFFIX = '_DIFF'
+
+
+def get_on_off_df(on_court_df: DataFrame, off_court_df: DataFrame) -> DataFrame:
+    """
+    :param on_court_df: The "players on court" rows of any number of teams
+    :param off_court_df: The "players off court" rows of the same teams
+    :return: A df with a row for every player on every team he played for, with PLAYER_ID, PLAYER_NAME and TEAM_ID
+    columns, and ON_<stat>, OFF_<stat> and <stat>_DIFF (on minus off) columns for every stat
+    """
+    stats = [column for column in on_court_df.columns
+             if column not in on_off_key_columns and is_numeric_dtype(on_court_df[column])]
+    keys = ['TEAM_ID', 'VS_PLAYER_ID']
+    on_off_df = on_court_df[keys + ['VS_PLAYER_NAME'] + stats].merge(
+        off_court_df[keys + stats], on=keys, how='outer', suffixes=('_on', '_off'))
+    on_off_df = on_off_df.rename(columns={'VS_PLAYER_ID': 'PLAYER_ID', 'VS_PLAYER_NAME': 'PLAYER_NAME'})
+    on_columns = on_off_df[[f'{stat}_on' for stat in stats]].set_axis(stats, axis=1)
+    off_columns = on_off_df[[f'{stat}_off' for stat in stats]].set_axis(stats, axis=1)
+    return on_off_df[['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID']].join([
+        on_columns.add_prefix(ON_PREFIX),
+        off_columns.add_prefix(OFF_PREFIX),
+        (on_columns - off_columns).add_suffix(DIFF_SUFFIX),
+    ])
+
+
+def get_on_off_leaderboard(on_off_df: DataFrame, stat_key: str, player_ids: Optional[set[int]] = None,
+                           team_id_by_player_id: Optional[Series] = None, eligibility_mask: Optional[Series] = None,
+                           ascending: bool = False, top_k: Optional[int] = None) -> DataFrame:
+    """
+    :param on_off_df: A league on/off df
+    :param stat_key: The stat to rank by (by its on minus off difference)
+    :param player_ids: If passed, only these players are ranked
+    :param team_id_by_player_id: If passed (a series indexed by PLAYER_ID), only the rows of these teams are used -
+    for players that played for more than one team
+    :param eligibility_mask: If passed (a boolean series indexed by PLAYER_ID), only the players where it's True are
+    ranked
+    :param ascending: Whether lower differences rank higher or not
+    :param top_k: If passed, only the top k players are returned
+    :return: The rows of the ranked players, sorted, with a RANK column
+    """
+    player_ids_column = on_off_df['PLAYER_ID']
+    is_ranked = player_ids_column.notna()
+    if player_ids is not None:
+        is_ranked &= player_ids_column.isin(player_ids)
+    if team_id_by_player_id is not None:
+        is_ranked &= on_off_df['TEAM_ID'] == player_ids_column.map(team_id_by_player_id)
+    if eligibility_mask is not None:
+        is_ranked &= player_ids_column.map(eligibility_mask).fillna(False).astype(bool)
+    diff_column = stat_key + DIFF_SUFFIX
+    leaderboard_df = on_off_df[is_ranked].sort_values(diff_column, ascending=ascending, kind='stable')
+    if top_k is not None:
+        leaderboard_df = leaderboard_df.head(top_k)
+    leaderboard_df = leaderboard_df.reset_index(drop=True)
+    leaderboard_df['RANK'] = leaderboard_df[diff_column].rank(method='min', ascending=ascending)
+    return leaderboard_df
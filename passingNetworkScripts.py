@@ -0,0 +1,150 @@
+"""
+A passing network - who passed to who, and what came out of it - built once from the passing dashboards of any number
+of players. Every stat is a sparse passer x receiver matrix, and the top partners of every player are computed once
+for all the players, so lookups are a dict lookup and not an idxmax over a dashboard.
+"""
+from typing import Literal, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from scipy import sparse
+
+# The stats of a connection. The shots are the receiver's shots after the passes
+network_stats = ['PASS', 'AST', 'FGM', 'FGA', 'FG3M']
+DIRECTION = Literal['TO', 'FROM']
+
+
+def get_passes_edges_df(passes_made_df: Optional[DataFrame] = None,
+                        passes_received_df: Optional[DataFrame] = None) -> DataFrame:
+    """
+    :param passes_made_df: PassesMade rows (of any number of players)
+    :param passes_received_df: PassesReceived rows (of any number of players)
+    :return: A df with a row for every (passer, receiver) connection - PASSER_ID, RECEIVER_ID and the network stats.
+    Connections that appear in both dfs are kept once
+    """
+    edges_dfs = []
+    if passes_made_df is not None:
+        edges_dfs.append(passes_made_df.rename(
+            columns={'PLAYER_ID': 'PASSER_ID', 'PASS_TEAMMATE_PLAYER_ID': 'RECEIVER_ID'}))
+    if passes_received_df is not None:
+        edges_dfs.append(passes_received_df.rename(
+            columns={'PLAYER_ID': 'RECEIVER_ID', 'PASS_TEAMMATE_PLAYER_ID': 'PASSER_ID'}))
+    if not edges_dfs:
+        raise ValueError('At least one of passes_made_df and passes_received_df is needed')
+    edges_df = pd.concat([edges_df[['PASSER_ID', 'RECEIVER_ID', 'TEAM_ID'] + network_stats] for edges_df in edges_dfs],
+                         ignore_index=True)
+    return edges_df.drop_duplicates(['PASSER_ID', 'RECEIVER_ID', 'TEAM_ID'])
+
+
+class PassingNetwork:
+    """
+    Passer x receiver sparse matrices of the network stats. A pair of players that played together on more than one
+    team has a single connection, with the stats of all the teams summed
+    """
+
+    def __init__(self, edges_df: DataFrame):
+        """
+
+        :param edges_df: A df with a row for every connection (see get_passes_edges_df)
+        """
+        passer_ids = edges_df['PASSER_ID'].to_numpy(dtype=np.int64)
+        receiver_ids = edges_df['RECEIVER_ID'].to_numpy(dtype=np.int64)
+        self.player_ids = np.unique(np.concatenate([passer_ids, receiver_ids]))
+        self._position_by_player_id = {player_id: position for position, player_id in
+                                       enumerate(self.player_ids.tolist())}
+        passer_positions = np.searchsorted(self.player_ids, passer_ids)
+        receiver_positions = np.searchsorted(self.player_ids, receiver_ids)
+        shape = (len(self.player_ids), len(self.player_ids))
+        # Duplicated connections are summed when converted to csr
+        self.matrices: dict[str, sparse.csr_matrix] = {
+            stat: sparse.coo_matrix((edges_df[stat].to_numpy(dtype=np.float64), (passer_positions, receiver_positions)),
+                                    shape=shape).tocsr()
+            for stat in network_stats}
+        self._top_partners = {(stat, direction): self._get_top_partner_ids(self.matrices[stat], direction)
+                              for stat in ['PASS', 'AST'] for direction in ['TO', 'FROM']}
+
+    def _get_top_partner_ids(self, matrix: sparse.csr_matrix, direction: DIRECTION) -> np.ndarray:
+        """ The top partner of every player (-1 for players without any), in the order of player_ids """
+        axis = 1 if direction == 'TO' else 0
+        max_values = matrix.max(axis=axis).toarray().ravel()
+        top_partner_positions = np.asarray(matrix.argmax(axis=axis)).ravel()
+        return np.where(max_values > 0, self.player_ids[top_partner_positions], -1)
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self._position_by_player_id
+
+    def get_top_partner(self, player_id: int, stat: Literal['PASS', 'AST'] = 'PASS',
+                        direction: DIRECTION = 'TO') -> Optional[int]:
+        """
+        :param player_id: The player's id
+        :param stat: PASS or AST
+        :param direction: TO - the teammate the player passed to the most. FROM - the teammate that passed to him
+        the most
+        :return: The teammate's id, or None if the player has no such connections
+        """
+        if player_id not in self._position_by_player_id:
+            return None
+        top_partner_id = self._top_partners[(stat, direction)][self._position_by_player_id[player_id]]
+        return None if top_partner_id == -1 else int(top_partner_id)
+
+    def get_connection_stats(self, passer_id: int, receiver_id: int) -> Series:
+        """
+        :return: The network stats of the passes from the passer to the receiver (zeros if there were none)
+        """
+        passer_position = self._position_by_player_id[passer_id]
+        receiver_position = self._position_by_player_id[receiver_id]
+        return Series({stat: self.matrices[stat][passer_position, receiver_position] for stat in network_stats})
+
+    def get_player_connections_df(self, player_id: int, direction: DIRECTION = 'TO') -> DataFrame:
+        """
+        :param player_id: The player's id
+        :param direction: TO - the passes the player made. FROM - the passes he received
+        :return: A df with a row for every teammate the player has a connection with - PASS_TEAMMATE_PLAYER_ID and the
+        network stats, sorted by the number of passes
+        """
+        position = self._position_by_player_id[player_id]
+        pass_vector = self._get_player_vector('PASS', position, direction)
+        teammate_positions = pass_vector.indices
+        connections_df = DataFrame({'PASS_TEAMMATE_PLAYER_ID': self.player_ids[teammate_positions]})
+        for stat in network_stats:
+            player_vector = self._get_player_vector(stat, position, direction)
+            connections_df[stat] = player_vector[0, teammate_positions].toarray()[0]
+        return connections_df.sort_values('PASS', ascending=False, kind='stable', ignore_index=True)
+
+    def _get_player_vector(self, stat: str, position: int, direction: DIRECTION) -> sparse.csr_matrix:
+        matrix = self.matrices[stat]
+        return matrix[position] if direction == 'TO' else matrix[:, position].T.tocsr()
+
+    def get_totals_df(self, direction: DIRECTION = 'TO') -> DataFrame:
+        """
+        :param direction: TO - the totals of the passes every player made. FROM - of the passes he received
+        :return: A df indexed by PLAYER_ID with the total of every network stat
+        """
+        axis = 1 if direction == 'TO' else 0
+        return DataFrame({stat: np.asarray(self.matrices[stat].sum(axis=axis)).ravel() for stat in network_stats},
+                         index=pd.Index(self.player_ids, name='PLAYER_ID'))
+
+    def get_teammates_efg_percentage_from_passes_df(self) -> DataFrame:
+        """
+        :return: A df indexed by PLAYER_ID with the EFG% of the teammates on shots after a pass from every player
+        (EFG_PCT), and the number of those shots (FGA)
+        """
+        totals_df = self.get_totals_df(direction='TO')
+        fga = totals_df['FGA'].to_numpy()
+        efg_percentage = np.divide(totals_df['FGM'].to_numpy() + 0.5 * totals_df['FG3M'].to_numpy(), fga,
+                                   out=np.zeros(len(fga)), where=fga > 0)
+        return DataFrame({'EFG_PCT': efg_percentage, 'FGA': fga}, index=totals_df.index)
+
+
+def get_passing_network_from_dashboards(passing_dashboards: list) -> PassingNetwork:
+    """
+    :param passing_dashboards: PlayerDashPtPass objects of any number of players
+    :return: The passing network of these players (from their passes made)
+    """
+    passes_made_df = pd.concat([passing_dashboard.passes_made.get_data_frame()
+                                for passing_dashboard in passing_dashboards], ignore_index=True)
+    return PassingNetwork(get_passes_edges_df(passes_made_df=passes_made_df))
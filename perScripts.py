@@ -0,0 +1,111 @@
+"""
+aPER (the PER measurement before normalization) of all the players at once. The formula is applied to columns of a
+df (a row for every player, or for every player and bucket of games), with the team factors of every row joined by its
+TEAM_ID.
+"""
+import numpy as np
+from pandas import DataFrame, Series
+
+import playerFeaturesScripts
+
+OVER_MINUTES_LIMIT = 'OVER_MINUTES_LIMIT'
+
+
+def get_teams_per_factors_df(team_stats_df: DataFrame, pace_df: DataFrame) -> DataFrame:
+    """
+    :param team_stats_df: The league's classic team stats (LeagueDashTeamStats)
+    :param pace_df: The league's pace info (TEAM_ID, POSS, MIN and PACE)
+    :return: A df indexed by TEAM_ID with AST_PCT (the portion of the team's field goals which was assisted) and
+    PACE_ADJUSTMENT (league's pace divided by team's pace)
+    """
+    league_pace = (pace_df['POSS'].sum() / pace_df['MIN'].sum()) * 48
+    teams_per_factors_df = DataFrame({
+        'AST_PCT': team_stats_df['AST'].to_numpy(dtype=np.float64) / team_stats_df['FGM'].to_numpy(dtype=np.float64)
+    }, index=team_stats_df['TEAM_ID'].to_numpy())
+    teams_per_factors_df['PACE_ADJUSTMENT'] = league_pace / pace_df.set_index('TEAM_ID')['PACE']
+    teams_per_factors_df.index.name = 'TEAM_ID'
+    return teams_per_factors_df
+
+
+def get_aper(stats_df: DataFrame, teams_per_factors_df: DataFrame, league_per_factors: dict[str, float]) -> Series:
+    """
+    :param stats_df: A df with a TEAM_ID column and the stats of every row (totals or per 36 - aPER is per minute)
+    :param teams_per_factors_df: The teams factors (see get_teams_per_factors_df)
+    :param league_per_factors: The league's ASSIST_FACTOR, PPP, DREB_PCT and FOUL_FACTOR
+    :return: The aPER of every row. NaN for rows with no minutes
+    """
+    stats = {stat: stats_df[stat].to_numpy(dtype=np.float64) for stat in
+             ['MIN', 'FG3M', 'AST', 'FGM', 'FTM', 'TOV', 'FGA', 'FTA', 'REB', 'OREB', 'STL', 'BLK', 'PF']}
+    team_factors_df = teams_per_factors_df.reindex(stats_df['TEAM_ID'].to_numpy())
+    team_ast_percentage = team_factors_df['AST_PCT'].to_numpy()
+    pace_adjustment = team_factors_df['PACE_ADJUSTMENT'].to_numpy()
+    league_ast_factor = league_per_factors['ASSIST_FACTOR']
+    league_ppp = league_per_factors['PPP']
+    league_dreb_percentage = league_per_factors['DREB_PCT']
+    league_foul_factor = league_per_factors['FOUL_FACTOR']
+
+    unadjusted_per_minutes = (
+            stats['FG3M']
+            + (2 / 3) * stats['AST']
+            + (2 - league_ast_factor * team_ast_percentage) * stats['FGM']
+            + (stats['FTM'] * 0.5 * (1 + (1 - team_ast_percentage) + (2 / 3) * team_ast_percentage))
+            - league_ppp * stats['TOV']
+            - league_ppp * league_dreb_percentage * (stats['FGA'] - stats['FGM'])
+            - league_ppp * 0.44 * (0.44 + (0.56 * league_dreb_percentage)) * (stats['FTA'] - stats['FTM'])
+            + league_ppp * (1 - league_dreb_percentage) * (stats['REB'] - stats['OREB'])
+            + league_ppp * league_dreb_percentage * stats['OREB']
+            + league_ppp * stats['STL']
+            + league_ppp * league_dreb_percentage * stats['BLK']
+            - stats['PF'] * league_foul_factor)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        unadjusted_per = np.where(stats['MIN'] > 0, unadjusted_per_minutes / stats['MIN'], np.nan)
+    return Series(unadjusted_per * pace_adjustment, index=stats_df.index)
+
+
+def get_minutes_split_per_36_stats_df(game_logs_df: DataFrame, minutes_limit: float = 30) -> DataFrame:
+    """
+    :param game_logs_df: The game logs of all the players in the league (from PlayerGameLogs)
+    :param minutes_limit: The number of minutes that splits the games
+    :return: A df indexed by PLAYER_ID and OVER_MINUTES_LIMIT (whether the player played at least minutes_limit in the
+    games), with GP, the total MIN and the per 36 minutes stats of the games - from the totals of the games, and not
+    the mean of every game's per 36 stats. Games with no minutes are ignored
+    """
+    stats = [stat for stat in playerFeaturesScripts.feature_stats if stat != 'MIN']
+    # Stats are usually downcast to small integers, so they are summed as float64
+    minutes = game_logs_df['MIN'].to_numpy(dtype=np.float64)
+    played_games_df = DataFrame(game_logs_df[stats].to_numpy(dtype=np.float64)[minutes > 0], columns=stats)
+    played_games_df.insert(0, 'MIN', minutes[minutes > 0])
+    player_ids = game_logs_df['PLAYER_ID'].to_numpy()[minutes > 0]
+    is_over_minutes_limit = minutes[minutes > 0] >= minutes_limit
+
+    groups = played_games_df.groupby([Series(player_ids, name='PLAYER_ID'),
+                                      Series(is_over_minutes_limit, name=OVER_MINUTES_LIMIT)])
+    split_stats_df = groups.sum()
+    split_stats_df[stats] = split_stats_df[stats].mul(36 / split_stats_df['MIN'], axis=0)
+    split_stats_df.insert(0, 'GP', groups.size())
+    return split_stats_df
+
+
+def get_minutes_split_per_df(game_logs_df: DataFrame, player_team_ids: Series, teams_per_factors_df: DataFrame,
+                             league_per_factors: dict[str, float], minutes_limit: float = 30,
+                             games_limit: int = 20) -> DataFrame:
+    """
+    :param game_logs_df: The game logs of all the players in the league (from PlayerGameLogs)
+    :param player_team_ids: The team of every player (indexed by PLAYER_ID), whose factors are used for his aPER
+    :param teams_per_factors_df: The teams factors (see get_teams_per_factors_df)
+    :param league_per_factors: The league's ASSIST_FACTOR, PPP, DREB_PCT and FOUL_FACTOR
+    :param minutes_limit: The number of minutes that splits the games
+    :param games_limit: The number of games a player has to play on both sides of the minutes limit
+    :return: A df indexed by PLAYER_ID with OVER_GP, UNDER_GP, OVER_APER, UNDER_APER and APER_DIFF (over minus under),
+    sorted by APER_DIFF
+    """
+    split_stats_df = get_minutes_split_per_36_stats_df(game_logs_df, minutes_limit=minutes_limit)
+    split_stats_df['TEAM_ID'] = player_team_ids.reindex(split_stats_df.index.get_level_values('PLAYER_ID')).to_numpy()
+    split_stats_df['APER'] = get_aper(split_stats_df, teams_per_factors_df, league_per_factors)
+    split_df = split_stats_df[['GP', 'APER']].unstack(OVER_MINUTES_LIMIT)
+    split_df = split_df.reindex(columns=[(column, is_over) for column in ['GP', 'APER'] for is_over in [True, False]])
+    split_df.columns = ['OVER_GP', 'UNDER_GP', 'OVER_APER', 'UNDER_APER']
+    split_df[['OVER_GP', 'UNDER_GP']] = split_df[['OVER_GP', 'UNDER_GP']].fillna(0).astype(np.int64)
+    split_df = split_df[(split_df['OVER_GP'] > games_limit) & (split_df['UNDER_GP'] > games_limit)].copy()
+    split_df['APER_DIFF'] = split_df['OVER_APER'] - split_df['UNDER_APER']
+    return split_df.sort_values('APER_DIFF', ascending=False, kind='stable')
@@ -0,0 +1,111 @@
+"""
+A league level table of player features (one row per player), built at once from the league's game logs, and boolean
+masks over it. Player filters (minutes, assists, three point attempts...) become column expressions over all the
+players, instead of reading the stat dfs of every player object.
+"""
+from typing import Optional
+
+import numpy as np
+from pandas import DataFrame, Series
+
+# The stats that are summed for every player - for the whole season, and for his most recent team
+feature_stats = ['MIN',
+                 'FGM',
+                 'FGA',
+                 'FG3M',
+                 'FG3A',
+                 'FTM',
+                 'FTA',
+                 'OREB',
+                 'DREB',
+                 'REB',
+                 'AST',
+                 'TOV',
+                 'STL',
+                 'BLK',
+                 'PF',
+                 'PTS',
+                 ]
+RECENT_TEAM_PREFIX = 'RECENT_TEAM_'
+
+
+def get_players_features_df(game_logs_df: DataFrame) -> DataFrame:
+    """
+    :param game_logs_df: The game logs of all the players in the league (from PlayerGameLogs)
+    :return: A df indexed by PLAYER_ID with the columns TEAM_ID (the most recent team), NUM_OF_TEAMS, GP, the total of
+    every feature stat, and the total of every feature stat on the most recent team (with a RECENT_TEAM_ prefix)
+    """
+    stats = [stat for stat in feature_stats if stat in game_logs_df]
+    game_logs_df = game_logs_df[['PLAYER_ID', 'TEAM_ID', 'GAME_DATE'] + stats].copy()
+    # Stats are usually downcast to small integers, so they are summed as float64
+    game_logs_df[stats] = game_logs_df[stats].astype(np.float64)
+    game_logs_df['GAME_DATE'] = game_logs_df['GAME_DATE'].astype(str)
+
+    player_groups = game_logs_df.groupby('PLAYER_ID', observed=True)
+    features_df = player_groups[stats].sum()
+    features_df.insert(0, 'GP', player_groups.size())
+    features_df.insert(0, 'NUM_OF_TEAMS', player_groups['TEAM_ID'].nunique())
+    most_recent_games_df = game_logs_df.sort_values('GAME_DATE').drop_duplicates('PLAYER_ID', keep='last')
+    features_df.insert(0, 'TEAM_ID', most_recent_games_df.set_index('PLAYER_ID')['TEAM_ID'])
+
+    player_team_totals_df = game_logs_df.groupby(['PLAYER_ID', 'TEAM_ID'], observed=True)[stats].sum()
+    recent_team_index = list(zip(features_df.index, features_df['TEAM_ID']))
+    recent_team_totals_df = player_team_totals_df.loc[recent_team_index].set_axis(features_df.index)
+    return features_df.join(recent_team_totals_df.add_prefix(RECENT_TEAM_PREFIX))
+
+
+def get_stat_limit_mask(features_df: DataFrame, stat: str, limit: float, only_recent_team: bool = False) -> Series:
+    """
+    :param features_df: The league's players features df
+    :param stat: Stat category to check the value in
+    :param limit: Limit to compare the stat to
+    :param only_recent_team: Whether to check only the players' stats on their recent team or not
+    :return: A boolean series (indexed by PLAYER_ID) of whether every player is over the limit
+    """
+    column = RECENT_TEAM_PREFIX + stat if only_recent_team else stat
+    return features_df[column] > limit
+
+
+def get_per_36_stat_limit_mask(features_df: DataFrame, stat: str, limit: float, minutes_limit: float = 0) -> Series:
+    """
+    :param features_df: The league's players features df
+    :param stat: Stat category to check the value in
+    :param limit: Limit to compare the stat per 36 minutes to
+    :param minutes_limit: Players with less minutes than this are never over the limit
+    :return: A boolean series (indexed by PLAYER_ID) of whether every player is over the limit
+    """
+    minutes = features_df['MIN'].to_numpy(dtype=np.float64)
+    stat_per_36 = np.divide(36 * features_df[stat].to_numpy(dtype=np.float64), minutes,
+                            out=np.zeros(len(features_df)), where=minutes > 0)
+    return Series((stat_per_36 > limit) & (minutes > minutes_limit), index=features_df.index)
+
+
+def get_minutes_limit_mask(features_df: DataFrame, limit: float, only_recent_team: bool = False) -> Series:
+    return get_stat_limit_mask(features_df, 'MIN', limit, only_recent_team=only_recent_team)
+
+
+def get_assists_limit_mask(features_df: DataFrame, limit: float = 100, only_recent_team: bool = False) -> Series:
+    return get_stat_limit_mask(features_df, 'AST', limit, only_recent_team=only_recent_team)
+
+
+def get_fga_limit_mask(features_df: DataFrame, limit: float = 300, only_recent_team: bool = False) -> Series:
+    return get_stat_limit_mask(features_df, 'FGA', limit, only_recent_team=only_recent_team)
+
+
+def get_three_point_shooters_mask(features_df: DataFrame, attempts_limit: float = 50,
+                                  only_recent_team: bool = False) -> Series:
+    return get_stat_limit_mask(features_df, 'FG3A', attempts_limit, only_recent_team=only_recent_team)
+
+
+def get_single_team_mask(features_df: DataFrame) -> Series:
+    return features_df['NUM_OF_TEAMS'] == 1
+
+
+def get_masked_player_ids(mask: Series, player_ids: Optional[set[int]] = None) -> set[int]:
+    """
+    :param mask: A boolean series indexed by PLAYER_ID
+    :param player_ids: If passed, only these ids can be returned
+    :return: The ids of the players where the mask is True
+    """
+    masked_player_ids = set(mask.index[mask.to_numpy(dtype=bool)])
+    return masked_player_ids if player_ids is None else masked_player_ids & player_ids
@@ -5,17 +5,19 @@ import itertools
 import typing
 from functools import cached_property
 
+import numpy as np
 import pandas as pd
 from nba_api.stats.endpoints import PlayerDashPtShotDefend, PlayerProfileV2, CommonPlayerInfo, ShotChartDetail, \
     PlayerGameLogs, PlayerDashPtReb, PlayerDashPtPass, PlayerDashPtShots
 from nba_api.stats.library.parameters import ContextMeasureSimple, Season, MeasureTypeDetailedDefense
-from nba_api.stats.static.players import find_players_by_full_name, find_player_by_id
 from pandas import DataFrame, Series
-from pandas.core.groupby import DataFrameGroupBy
 from typing import Union, Optional, List, Literal
 
-import gameScripts
 import generalStatsScripts
+import nameIndexScripts
+import passingNetworkScripts
+import shotChartScripts
+import similarityScripts
 import teamScripts
 import utilsScripts
 from my_exceptions import NoSuchPlayer, TooMuchPlayers, PlayerHasNoTeam, PlayerHasMoreThenOneTeam, NoStatDf, \
@@ -76,14 +78,19 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
 
     @staticmethod
     def _get_player_id_from_name(player_name: str) -> int:
-        matching_players_info = find_players_by_full_name(player_name)
-        number_of_matching_player_dicts = len(matching_players_info) if matching_players_info else 0
-        if number_of_matching_player_dicts == 0:
-            raise NoSuchPlayer('There was no player matching the given parameters')
-        elif number_of_matching_player_dicts > 1:
-            raise TooMuchPlayers('There were %s dicts for %s...' % (number_of_matching_player_dicts, player_name))
+        players_name_index = nameIndexScripts.get_players_name_index()
+        # A misspelled name is only suggested, since a fuzzy match can be a different player ('Chris Paulson')
+        matching_player_ids = players_name_index.find_ids(player_name, fuzzy=False)
+        number_of_matching_player_ids = len(matching_player_ids)
+        if number_of_matching_player_ids == 0:
+            suggested_names = sorted(players_name_index.get_name(player_id) for player_id in
+                                     players_name_index.find_fuzzy_ids(player_name))
+            suggestion = ' - did you mean %s?' % ' or '.join(suggested_names) if suggested_names else ''
+            raise NoSuchPlayer('There was no player matching the given parameters%s' % suggestion)
+        elif number_of_matching_player_ids > 1:
+            raise TooMuchPlayers('There were %s players for %s...' % (number_of_matching_player_ids, player_name))
         else:
-            return matching_players_info[0]['id']
+            return matching_player_ids.pop()
 
     @property
     def player_info(self) -> DataFrame:
@@ -107,6 +114,13 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
         else:
             return None
 
+    @property
+    def current_league_object(self):
+        """ The league object of the team that the player is currently playing for """
+        if self.current_team_object is None:
+            raise PlayerHasNoTeam(f'{self.name} has no team (and therefore no league object) at the moment')
+        return self.current_team_object.current_league_object
+
     @property
     def team_id(self) -> Optional[int]:
         """ Last team player played for in the given season """
@@ -138,7 +152,7 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
         A list of dicts that represents the player's basic total stats for the given season.
         Every df row represents a team (or TOTAL, if the player had more than one)
         """
-        self.logger.info("Initializes all of %s stats dfs" % self.name)
+        self.logger.debug("Initializes all of %s stats dfs", self.name)
         df = self.year_by_year_stats.season_totals_regular_season.get_data_frame()
         filtered_list_of_player_stats_dicts = df[df['SEASON_ID'] == self.season]
         return filtered_list_of_player_stats_dicts
@@ -189,14 +203,14 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
         kwargs = {
             'player_id': self.id
         }
-        return self.get_stat_class(stat_class_class_object=CommonPlayerInfo, **kwargs)
+        return self.get_career_stat_class(stat_class_class_object=CommonPlayerInfo, **kwargs)
 
     @cached_property
     def year_by_year_stats(self) -> PlayerProfileV2:
         kwargs = {
             'player_id': self.id
         }
-        return self.get_stat_class(stat_class_class_object=PlayerProfileV2, **kwargs)
+        return self.get_career_stat_class(stat_class_class_object=PlayerProfileV2, **kwargs)
 
     @cached_property
     def defense_dashboard(self) -> PlayerDashPtShotDefend:
@@ -227,13 +241,11 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
         return super().passing_dashboard
 
     @cached_property
-    def regular_season_game_objects(self) -> List[gameScripts.NBAGamePlayer]:
-        # TODO - No reason for this to work with a df - used to work with dict
-        regular_season_game_objects = []
-        for game_number, game_df in self.game_logs.player_game_logs.get_data_frame().iterrows():
-            self.logger.info(f"Initializing game number {game_number + 1}")
-            regular_season_game_objects.append(gameScripts.NBAGamePlayer(game_df, initialize_stat_classes=True))
-        return regular_season_game_objects
+    def passing_network(self) -> passingNetworkScripts.PassingNetwork:
+        """ The network of the passes the player made and received. Built once from his passing dashboard """
+        return passingNetworkScripts.PassingNetwork(passingNetworkScripts.get_passes_edges_df(
+            passes_made_df=self.passing_dashboard.passes_made.get_data_frame(),
+            passes_received_df=self.passing_dashboard.passes_received.get_data_frame()))
 
     def is_single_team_player(self) -> bool:
         """ Whether the player played on more than one team this season """
@@ -365,30 +377,13 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
         :param number_of_previous_shots_to_check: number of previous shots to check the condition on
         :return: tuple of the EFG% on shots after specific shot_result and the amount of those shots
         """
-        df = self.shot_chart.shot_chart_detail.get_data_frame()
-        # We don't want shots from different games counting as a shot sequence
-        grouped = df.groupby('GAME_ID')
-
-        # Custom rolling function to calculate sum of previous x shots made
-        def sum_previous_x_makes(s):
-            return s.rolling(window=number_of_previous_shots_to_check).sum().shift()
-
-        # Calculate the number of makes out of previous x shots for each group
-        df['PREV_X_MAKES'] = grouped['SHOT_MADE_FLAG'].transform(sum_previous_x_makes)
-
-        # Filter the dataframe to include only the rows where the previous x shots were all makes
-        filtered_df = df[df['PREV_X_MAKES'] == (number_of_previous_shots_to_check if shot_result == 1 else 0)]
-
-        made_shots_num = filtered_df["SHOT_MADE_FLAG"].sum()
-        three_pt_made_shots_num = filtered_df[
-            (filtered_df['SHOT_MADE_FLAG'] == 1) & (filtered_df['SHOT_TYPE'] == '3PT Field Goal')
-            ].shape[0]
-        attempted_shots_num = len(filtered_df)
-
-        return (
-            utilsScripts.calculate_efg_percent(made_shots_num, three_pt_made_shots_num, attempted_shots_num),
-            attempted_shots_num
-        )
+        df = self.get_efg_percentage_by_previous_shots_results(
+            max_number_of_previous_shots=number_of_previous_shots_to_check)
+        filtered_df = df[(df['PREVIOUS_SHOTS_RESULT'] == shot_result) &
+                         (df['NUMBER_OF_PREVIOUS_SHOTS'] == number_of_previous_shots_to_check)]
+        if filtered_df.empty:
+            return 0, 0
+        return filtered_df['EFG_PCT'].item(), filtered_df['FGA'].item()
 
     def get_efg_percentage_after_makes(self, number_of_previous_shots_to_check: int = 1) -> tuple[float, int]:
         """
@@ -404,29 +399,6 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
         return self._get_efg_percentage_depending_on_previous_shots_results(
             shot_result=0, number_of_previous_shots_to_check=number_of_previous_shots_to_check)
 
-    @staticmethod
-    def _groupby_side_of_floor(df: DataFrame) -> DataFrameGroupBy:
-        """
-        Contested - defender within 4 feet
-        :return: tuple of the FG% on contested shots, and the amount of those shots.
-        :rtype: tuple(float, float)
-        """
-
-        # Define a function to categorize shot zone descriptions into three groups
-        def side_group(shot_zone_area: str):
-            if 'left' in shot_zone_area.lower():
-                return 'Left'
-            elif 'right' in shot_zone_area.lower():
-                return 'Right'
-            else:
-                return 'Center'
-
-        # Apply the function to create a new column 'DISTANCE_GROUP'
-        df['SHOT_SIDE'] = df['SHOT_ZONE_AREA'].apply(side_group)
-        # Group by 'DISTANCE_GROUP' and sum the desired categories
-        grouped_df = df.groupby('SHOT_SIDE')[['SHOT_MADE_FLAG', 'SHOT_TYPE']]
-        return grouped_df
-
     def _get_shooting_data_from_floor_side(self, side: SIDE_OF_FLOOR) -> tuple[int, int, int]:
         """
         Finds the logs for all the shots from a side of the floor, and returns all the necessary data
@@ -437,15 +409,12 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
         """
         if side not in typing.get_args(SIDE_OF_FLOOR):
             raise ValueError(f'Wrong param. "{side}" not in ["Right", "Left", "Center"]')
-        df = self.shot_chart.shot_chart_detail.get_data_frame()
-        grouped_df = self._groupby_side_of_floor(df)
-        side_value_count = grouped_df.value_counts()[side]
-
-        made_shots_num = side_value_count[1].sum()
-        three_pt_made_shots_num = side_value_count[1]['3PT Field Goal']
-        attempted_shots_num = side_value_count.sum()
+        df = self.get_efg_percentage_by_shot_zone('SHOT_SIDE_CODE')
+        side_df = df[df['SHOT_SIDE_CODE'] == shotChartScripts.SHOT_SIDES.index(side)]
+        if side_df.empty:
+            return 0, 0, 0
 
-        return made_shots_num, three_pt_made_shots_num, attempted_shots_num
+        return side_df['FGM'].item(), side_df['FG3M'].item(), side_df['FGA'].item()
 
     def _get_efg_percentage_from_side(self, side: SIDE_OF_FLOOR) -> tuple[float, int]:
         """
@@ -595,43 +564,43 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
                                                               "- change in teammates %EFG "
                                                               "after a pass from a player")
 
-    def _get_most_cooperative_teammate(self, pass_or_assist: PASS_OR_ASSIST, to_or_from: TO_OR_FROM):
+    def _get_most_cooperative_teammate(self, pass_or_assist: PASS_OR_ASSIST,
+                                       to_or_from: TO_OR_FROM) -> Optional[Series]:
         """
-        A df that represent the passing/assisting connection between the player and the player that
-        passes him/received passes from him the most
+        A series that represent the passing/assisting connection between the player and the player that
+        passes him/received passes from him the most. Uses the top partners of the player's passing network
         """
-        if to_or_from == 'TO':
-            df = self.passing_dashboard.passes_made.get_data_frame()
-        elif to_or_from == 'FROM':
-            df = self.passing_dashboard.passes_received.get_data_frame()
-        else:
+        if to_or_from not in typing.get_args(TO_OR_FROM):
             raise Exception(f'{to_or_from} is not a valid option. Only {typing.get_args(TO_OR_FROM)}')
-
-        if df.empty:
-            self.logger.warning(f'{self.name} does not have any FG from {pass_or_assist}. returning None...')
-            return None
-
         if pass_or_assist == 'PASS':
-            most_frequent_teammate_df = df.loc[df['PASS'].idxmax()]
+            stat = 'PASS'
         elif pass_or_assist == 'ASSIST':
-            most_frequent_teammate_df = df.loc[df['AST'].idxmax()]
+            stat = 'AST'
         else:
             raise Exception(f'{pass_or_assist} is not a valid option. Only {typing.get_args(PASS_OR_ASSIST)}')
 
-        if len(most_frequent_teammate_df) > 1:
-            self.logger.warning(f'{self.name} has multiple teammates tied in passes to him')
-        return most_frequent_teammate_df
+        teammate_id = self.passing_network.get_top_partner(self.id, stat=stat, direction=to_or_from)
+        if teammate_id is None:
+            self.logger.warning('%s does not have any FG from %s. returning None...', self.name, pass_or_assist)
+            return None
+        if to_or_from == 'TO':
+            connection_stats = self.passing_network.get_connection_stats(self.id, teammate_id)
+        else:
+            connection_stats = self.passing_network.get_connection_stats(teammate_id, self.id)
+        # Like a row of the passing dashboard - numpy scalars, with ids that stay integers
+        return Series({'PLAYER_ID': np.int64(self.id), 'PASS_TEAMMATE_PLAYER_ID': np.int64(teammate_id)} |
+                      {stat: connection_stats[stat] for stat in connection_stats.index}, dtype=object)
 
-    def get_most_frequent_passer_to_player(self) -> Optional[DataFrame]:
+    def get_most_frequent_passer_to_player(self) -> Optional[Series]:
         return self._get_most_cooperative_teammate('PASS', 'FROM')
 
-    def get_most_frequent_receiver_of_player_passes(self) -> Optional[dict]:
+    def get_most_frequent_receiver_of_player_passes(self) -> Optional[Series]:
         return self._get_most_cooperative_teammate('PASS', 'TO')
 
-    def get_most_frequent_assister_to_player(self) -> Optional[dict]:
+    def get_most_frequent_assister_to_player(self) -> Optional[Series]:
         return self._get_most_cooperative_teammate('ASSIST', 'FROM')
 
-    def get_most_frequent_receiver_of_player_assists(self) -> Optional[dict]:
+    def get_most_frequent_receiver_of_player_assists(self) -> Optional[Series]:
         return self._get_most_cooperative_teammate('ASSIST', 'TO')
 
     def _get_team_on_and_off_stats_for_player(self) -> DataFrame:
@@ -676,28 +645,19 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
         on_court_def_rtg, off_court_def_rtg = self.get_team_def_rtg_on_off_court()
         return on_court_def_rtg - off_court_def_rtg
 
-    def get_all_time_game_objects(self, initialize_stat_classes: bool = False) -> list[gameScripts.NBAGamePlayer]:
+    def get_over_minutes_limit_games_per_36_stats_compared_to_other_games(self, minutes_limit: int = 30) \
+            -> dict[str, DataFrame]:
         """
-
-        :param initialize_stat_classes: Whether to initialize the stat classes for the game objects
-        :return:
+        :param minutes_limit: The number of minutes that splits the games
+        :return: The joined per 36 stats of the games over the minutes limit, and of the games under it
         """
-        # TODO - Check
-        player_all_time_game_logs = [game_log for game_log in self.get_all_time_game_logs()]
-        player_all_time_game_objects = [gameScripts.NBAGamePlayer(game_log, initialize_stat_classes) for game_log in
-                                        player_all_time_game_logs]
-        return player_all_time_game_objects
-
-    def get_over_minutes_limit_games_per_36_stats_compared_to_other_games(self, minutes_limit=30) \
-            -> dict[str, dict[str, float]]:
-        # TODO - Check
-        over_limit_game_dicts = [game_log for game_log in self.game_logs.player_game_logs() if game_log['MIN'] >= 30]
-        under_limit_game_dicts = [game_log for game_log in self.game_logs.player_game_logs() if game_log['MIN'] < 30]
+        game_logs_df = self.game_logs_df
+        over_limit_games_idx = game_logs_df['MIN'] >= minutes_limit
         return {
-            ('Over %s minutes' % minutes_limit): utilsScripts.join_single_game_stats(over_limit_game_dicts,
-                                                                                     per_36=True),
-            ('Under %s minutes' % minutes_limit): utilsScripts.join_single_game_stats(under_limit_game_dicts,
-                                                                                      per_36=True)}
+            f'Over {minutes_limit} minutes': utilsScripts.join_single_game_stats(game_logs_df[over_limit_games_idx],
+                                                                               per_36=True),
+            f'Under {minutes_limit} minutes': utilsScripts.join_single_game_stats(game_logs_df[~over_limit_games_idx],
+                                                                                per_36=True)}
 
     def get_teammates_cooperation_stats(self, teammate_ids: set[int]) -> DataFrame:
         """
@@ -712,6 +672,7 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
             lineups_df = self.current_team_object.lineups.lineups.get_data_frame()
 
         teammates_to_stats = {}
+        players_name_index = nameIndexScripts.get_players_name_index()
         for num_with_player in range(len(teammate_ids) + 1):
             for teammates_ids_subset in itertools.combinations(teammate_ids, num_with_player):
                 on_teammates_ids = set(teammates_ids_subset)
@@ -722,10 +683,10 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
 
                 stats_with_teammates = utilsScripts.join_advanced_lineup_df(lineups_with_teammate)
                 teammates_in_lineups = [
-                    find_player_by_id(teammate_id)['full_name'] for teammate_id in teammates_ids_subset
+                    players_name_index.get_name(teammate_id) for teammate_id in teammates_ids_subset
                 ]
                 teammates_not_in_lineups = [
-                    find_player_by_id(teammate_id)['full_name']
+                    players_name_index.get_name(teammate_id)
                     for teammate_id in teammate_ids - set(teammates_ids_subset)
                 ]
                 with_teammates_string = f"With {', '.join(teammates_in_lineups)}. " if teammates_in_lineups else ""
@@ -738,11 +699,76 @@ class NBAPlayer(generalStatsScripts.NBAStatObject):
             names=['Source']
         )
 
+    def get_rapm(self) -> Series:
+        """
+        Unlike the on/off and with/without teammates stats, RAPM is adjusted for the teammates and the opponents that
+        were on the court with the player
+
+        :return: The player's ORAPM, DRAPM, RAPM and possessions, from the league's RAPM estimates
+        """
+        league_rapm_df = self.current_league_object.league_rapm_df
+        if self.id not in league_rapm_df.index:
+            raise NoStatDf(f'{self.name} has no lineup stints in {self.season}')
+        return league_rapm_df.loc[self.id]
+
+    def get_most_similar_player_seasons(self, similarity_index: similarityScripts.SimilarityIndex,
+                                        top_k: int = 10) -> DataFrame:
+        """
+        :param similarity_index: An index that contains the player's season (see NBALeagues.get_similarity_index)
+        :param top_k: The number of player-seasons to return
+        :return: The player-seasons (of any season in the index) that are the most similar to the player's season
+        """
+        return similarity_index.get_most_similar(self.id, self.season, top_k=top_k)
+
     def get_net_rtg_with_and_without_teammate(self, teammate_id: int) -> tuple[float, float]:
         a = self.get_teammates_cooperation_stats({teammate_id})
         return a.iloc[1]['NET_RATING'], a.iloc[0]['NET_RATING']
 
 
+class NBAPlayerCareer:
+    """
+    A factory for the season objects of a single player. All the season objects share the player's career stat classes
+    (info, year by year stats), so every season costs only its own season requests.
+    """
+
+    def __init__(self, name_or_id: Union[int, str], initialize_stat_classes: bool = False):
+        """
+
+        :param name_or_id: can be a player id or full name with an underline ('steph_curry').
+        :param initialize_stat_classes: Whether to initialize the season objects' stat classes or not
+        """
+        self.id = name_or_id if isinstance(name_or_id, int) else NBAPlayer._get_player_id_from_name(name_or_id)
+        self._initialize_stat_classes = initialize_stat_classes
+        self._season_objects: dict[str, NBAPlayer] = {}
+
+    @cached_property
+    def seasons(self) -> list[str]:
+        """ The seasons the player played in (regular season), from the first one """
+        # The year by year stats are a career stat class, so any season object can request them. This one is not kept,
+        # since the player might have not played in it
+        any_season_object = NBAPlayer(self.id, season=Season.current_season, initialize_stat_classes=False)
+        seasons_df = any_season_object.year_by_year_stats.season_totals_regular_season.get_data_frame()
+        return list(dict.fromkeys(seasons_df['SEASON_ID']))
+
+    def get_season_object(self, season: str, initialize_stat_classes: Optional[bool] = None) -> NBAPlayer:
+        """
+
+        :param season: The season of the object
+        :param initialize_stat_classes: Whether to initialize the object's stat classes. Defaults to the career's one
+        :return: The player's object for the season. Created once for every season
+        """
+        if season not in self._season_objects:
+            if initialize_stat_classes is None:
+                initialize_stat_classes = self._initialize_stat_classes
+            self._season_objects[season] = NBAPlayer(self.id, season=season,
+                                                     initialize_stat_classes=initialize_stat_classes)
+        return self._season_objects[season]
+
+    def __iter__(self) -> typing.Iterator[NBAPlayer]:
+        """ The player's season objects, from the first season """
+        return (self.get_season_object(season) for season in self.seasons)
+
+
 if __name__ == "__main__":
     players_names_list = [
         # 'rajon rondo',
@@ -757,9 +783,9 @@ if __name__ == "__main__":
     selected_season = Season.current_season
     for player_name_ in players_names_list:
         nba_player = NBAPlayer(name_or_id=player_name_, season=selected_season)
-        nba_player.logger.info(f"Print {nba_player.name} shooting info")
+        nba_player.logger.info("Print %s shooting info", nba_player.name)
         nba_player.print_shooting_info()
-        nba_player.logger.info(f"Print {nba_player.name} passing info")
+        nba_player.logger.info("Print %s passing info", nba_player.name)
         nba_player.print_passing_info()
 
         # national_tv_stats = nba_player.get_national_tv_all_time_per_game_stats()
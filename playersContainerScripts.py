@@ -1,5 +1,17 @@
 import abc
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Any, Callable, Literal, Optional
 
+import numpy as np
+from pandas import DataFrame, Series
+
+import bootstrapScripts
+import nameIndexScripts
+import onOffScripts
+import passingNetworkScripts
+import playerFeaturesScripts
 import utilsScripts
 from my_exceptions import NoSuchPlayer, TooMuchPlayers, PlayerHasMoreThenOneTeam, PlayerHasNoTeam
 
@@ -30,18 +42,79 @@ class PlayersContainer:
         """
         pass
 
+    @property
+    def _players_name_index(self) -> nameIndexScripts.NameIndex:
+        """
+        An index of the names of the current players. Names are taken from the static players data when possible.
+        Rebuilt only when the current players change
+        """
+        current_players_objects = self.current_players_objects
+        current_player_ids = tuple(player_object.id for player_object in current_players_objects)
+        cached_player_ids, cached_players_name_index = getattr(self, '_players_name_index_cache', ((), None))
+        if cached_players_name_index is None or cached_player_ids != current_player_ids:
+            players_name_index = nameIndexScripts.get_players_name_index()
+            cached_players_name_index = nameIndexScripts.NameIndex(
+                (players_name_index.get_name(player_object.id) if player_object.id in players_name_index else
+                 player_object.name, player_object.id) for player_object in current_players_objects)
+            self._players_name_index_cache = (current_player_ids, cached_players_name_index)
+        return cached_players_name_index
+
+    @property
+    @abc.abstractmethod
+    def players_features_df(self) -> DataFrame:
+        """
+        The league's players features df (a row for every player in the league), for building eligibility masks
+        """
+        pass
+
+    @property
+    @abc.abstractmethod
+    def league_shot_chart_df(self) -> DataFrame:
+        """ The league's shot chart df, for building shots eligibility masks """
+        pass
+
+    @property
+    @abc.abstractmethod
+    def league_on_off_df(self) -> DataFrame:
+        """ The league's on/off df (see onOffScripts) """
+        pass
+
+    @property
+    @abc.abstractmethod
+    def league_contested_shooting_df(self) -> DataFrame:
+        """ The league's contested and uncontested shooting df (see closestDefenderScripts) """
+        pass
+
+    @property
+    @abc.abstractmethod
+    def league_rapm_df(self) -> DataFrame:
+        """ The league's RAPM estimates df (see rapmScripts) """
+        pass
+
+    @property
+    @abc.abstractmethod
+    def league_passing_network(self) -> passingNetworkScripts.PassingNetwork:
+        """ The league's passing network (see passingNetworkScripts) """
+        pass
+
+    @abc.abstractmethod
+    def get_league_minutes_split_per_df(self, minutes_limit: float = 30, games_limit: int = 20) -> DataFrame:
+        """ The league's aPER split by the minutes played in every game (see perScripts) """
+        pass
+
     def get_player_object_by_name(self, player_name):
         """
         Doesn't create a new object - Just finds and takes it from self.current_players_objects
-        Can accept part of the name - uses __contains__ to find the right player
+        Can accept the start of the name (or of one of its words), or a slightly misspelled name
         Has to be singular - will not return 2 players
         :param player_name: The desired player's name or part of it
         :type player_name: str
         :return: The desired player's object
         :rtype: playerScripts.NBAPlayer
         """
+        matching_player_ids = self._players_name_index.find_ids(player_name)
         filtered_player_objects_list = [player_object for player_object in self.current_players_objects if
-                                        player_name in player_object.name]
+                                        player_object.id in matching_player_ids]
         filtered_player_objects_list_length = len(filtered_player_objects_list)
         if filtered_player_objects_list_length == 0:
             raise NoSuchPlayer('There was no player matching the given name')
@@ -53,37 +126,106 @@ class PlayersContainer:
         else:
             return filtered_player_objects_list[0]
 
-    def get_players_sorted_by_diff_in_per_between_minutes_played(self, minutes_limit=800):
+    def rank_players(self,
+                     metric: Callable[['playerScripts.NBAPlayer'], Any],
+                     players_filter: Optional[Callable[['playerScripts.NBAPlayer'], bool]] = None,
+                     eligibility_mask: Optional[Series] = None,
+                     sort_key: Optional[Callable[[Any], float]] = None,
+                     sample_size: Optional[Callable[['playerScripts.NBAPlayer'], float]] = None,
+                     ascending: bool = False,
+                     top_k: Optional[int] = None,
+                     stat_classes_to_prefetch: Optional[list[str]] = None,
+                     ignored_exceptions: tuple[type[Exception], ...] = (PlayerHasMoreThenOneTeam, PlayerHasNoTeam),
+                     max_workers: int = 4) -> DataFrame:
         """
+        Evaluates a metric for all the players that pass the filter, and ranks them by it. The stat classes to prefetch
+        are requested for all the players concurrently, before the filter (the requests still keep the gap between them,
+        but don't wait for each other's responses) - stat classes that the metric requests by itself are requested one
+        at a time, so pass them here.
 
-        :return:
-        :rtype: list[(string, float)]
+        :param metric: Receives a player object and returns its result. Players with a None result are not ranked
+        :param players_filter: Receives a player object and returns whether to rank it or not
+        :param eligibility_mask: A boolean series indexed by PLAYER_ID (see playerFeaturesScripts). Only the players
+        where it's True are evaluated. Prefer it over players_filter, since it's checked without the player objects
+        :param sort_key: Receives a metric result and returns the value to rank by. Defaults to the result itself
+        :param sample_size: Receives a player object and returns the size of the sample of its result (minutes, FGA..)
+        :param ascending: Whether lower values rank higher or not
+        :param top_k: If passed, only the top k players are returned
+        :param stat_classes_to_prefetch: Names of stat classes to request for every player before the filter
+        :param ignored_exceptions: Players that raise one of these exceptions are not ranked
+        :param max_workers: The maximum number of players that are evaluated at the same time
+        :return: A df with the columns PLAYER_ID, PLAYER_NAME (the full name from the static players data), RESULT
+        (the metric result), METRIC (the value to rank by), SAMPLE_SIZE and RANK - sorted by the rank
         """
-        self.logger.info('Filtering out players with not enough minutes...')
-        filtered_player_objects_list = [my_player_object for my_player_object in self.current_players_objects if
-                                        my_player_object.is_player_over_minutes_limit(minutes_limit) and
-                                        my_player_object.is_single_team_player()]
+        stat_classes_to_prefetch = [] if stat_classes_to_prefetch is None else stat_classes_to_prefetch
+        sort_key = (lambda result: result) if sort_key is None else sort_key
+        players_name_index = self._players_name_index
 
-        self.logger.info('Getting relevant data...')
-        players_name_and_result = []
-        for i, my_player_object in enumerate(filtered_player_objects_list, start=1):
-            self.logger.info('Player %s/%s' % (i, len(filtered_player_objects_list)))
+        def evaluate_player(player_object: 'playerScripts.NBAPlayer') -> Optional[tuple]:
             try:
-                my_team_object = my_player_object.current_team_object
-                games_split = my_player_object.get_over_minutes_limit_games_per_36_stats_compared_to_other_games()
-                over_limit_stats = games_split['Over 30 minutes']
-                under_limit_stats = games_split['Under 30 minutes']
-                if (over_limit_stats and under_limit_stats) and \
-                        (over_limit_stats['NUM_OF_ITEMS'] > 20 and under_limit_stats['NUM_OF_ITEMS'] > 20):
-                    diff = utilsScripts.get_aPER_from_stat_dict(over_limit_stats, my_team_object) - \
-                           utilsScripts.get_aPER_from_stat_dict(under_limit_stats, my_team_object)
-                    players_name_and_result.append((my_player_object.name,
-                                                    diff))
-            except PlayerHasMoreThenOneTeam:
-                pass
-        self.logger.info('Sorting...')
-        players_name_and_result.sort(key=lambda x: x[-1], reverse=True)
-        return players_name_and_result
+                if players_filter is not None and not players_filter(player_object):
+                    return None
+                result = metric(player_object)
+                if result is None:
+                    return None
+                return (player_object.id, players_name_index.get_name(player_object.id), result,
+                        sort_key(result), None if sample_size is None else sample_size(player_object))
+            except ignored_exceptions:
+                return None
+
+        self.logger.info('Evaluating players...')
+        players_objects = self.current_players_objects
+        if eligibility_mask is not None:
+            eligible_player_ids = playerFeaturesScripts.get_masked_player_ids(eligibility_mask)
+            players_objects = [player_object for player_object in players_objects
+                               if player_object.id in eligible_player_ids]
+        if stat_classes_to_prefetch:
+            self.logger.info('Requesting stat classes...')
+            utilsScripts.cache_properties_concurrently(players_objects, stat_classes_to_prefetch,
+                                                       ignored_exceptions=ignored_exceptions, max_workers=max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            evaluated_players = [evaluated_player for evaluated_player in utilsScripts.iterate_with_progress_log(
+                executor.map(evaluate_player, players_objects), 'Player', total=len(players_objects))
+                if evaluated_player is not None]
+
+        self.logger.info('Ranking...')
+        metric_index = 3
+        if top_k is None:
+            ranked_players = sorted(evaluated_players, key=itemgetter(metric_index), reverse=not ascending)
+        else:
+            select_top_k = heapq.nsmallest if ascending else heapq.nlargest
+            ranked_players = select_top_k(top_k, evaluated_players, key=itemgetter(metric_index))
+        ranked_players_df = DataFrame(ranked_players,
+                                      columns=['PLAYER_ID', 'PLAYER_NAME', 'RESULT', 'METRIC', 'SAMPLE_SIZE'])
+        ranked_players_df['RANK'] = ranked_players_df['METRIC'].rank(method='min', ascending=ascending)
+        return ranked_players_df
+
+    @staticmethod
+    def _get_names_and_results(ranked_players_df: DataFrame) -> list[tuple]:
+        return list(zip(ranked_players_df['PLAYER_NAME'], ranked_players_df['RESULT']))
+
+    def get_players_sorted_by_diff_in_per_between_minutes_played(self, minutes_limit=800, game_minutes_limit=30,
+                                                                 games_limit=20):
+        """
+        Sort all the players WITH MORE THEN 800 MINUTES (on a single team) this season, by how much better their aPER
+        was in games they played at least 30 minutes in (rather then in the other games). Both kinds of games are split
+        from the league's game logs at once - with no requests per player
+        :param minutes_limit: The number of minutes a player has to play this season
+        :param game_minutes_limit: The number of minutes that splits the games
+        :param games_limit: The number of games a player has to play on both sides of the game minutes limit
+        :return:
+        :rtype: list[(string, float)]
+        """
+        eligible_player_ids = playerFeaturesScripts.get_masked_player_ids(
+            playerFeaturesScripts.get_minutes_limit_mask(self.players_features_df, minutes_limit) &
+            playerFeaturesScripts.get_single_team_mask(self.players_features_df),
+            player_ids={player_object.id for player_object in self.current_players_objects})
+        minutes_split_per_df = self.get_league_minutes_split_per_df(minutes_limit=game_minutes_limit,
+                                                                    games_limit=games_limit)
+        minutes_split_per_df = minutes_split_per_df[minutes_split_per_df.index.isin(list(eligible_player_ids))]
+        players_name_index = self._players_name_index
+        return [(players_name_index.get_name(player_id), aper_diff) for
+                player_id, aper_diff in zip(minutes_split_per_df.index, minutes_split_per_df['APER_DIFF'])]
 
     def get_players_sorted_by_diff_in_teammates_efg_percentage_between_shots_from_passes_by_player_to_other_shots(self):
         """
@@ -92,70 +234,158 @@ class PlayersContainer:
         :return:
         :rtype: list[(string, (float, int))]
         """
-        self.logger.info('Filtering out players with not enough assists...')
-        filtered_player_objects_list = [my_player_object for my_player_object in self.current_players_objects if
-                                        my_player_object.is_player_over_assists_limit()]
+        return self._get_names_and_results(self.rank_players(
+            metric=lambda my_player_object:
+            my_player_object.get_diff_in_teammates_efg_percentage_on_shots_from_player_passes(),
+            eligibility_mask=playerFeaturesScripts.get_assists_limit_mask(self.players_features_df),
+            sort_key=itemgetter(0),
+            ignored_exceptions=(PlayerHasMoreThenOneTeam,)))
 
-        self.logger.info('Getting relevant data...')
-        players_name_and_result = []
-        for i, my_player_object in enumerate(filtered_player_objects_list, start=1):
-            self.logger.info('Player %s/%s' % (i, len(filtered_player_objects_list)))
-            try:
-                diff_in_teammates_efg_percentage = \
-                    my_player_object.get_diff_in_teammates_efg_percentage_on_shots_from_player_passes()
-                players_name_and_result.append((my_player_object.name,
-                                                diff_in_teammates_efg_percentage))
-            except PlayerHasMoreThenOneTeam:
-                pass
-        self.logger.info('Sorting...')
-        players_name_and_result.sort(key=lambda x: x[1][0], reverse=True)
-        return players_name_and_result
-
-    def get_players_sorted_by_diff_in_efg_percentage_between_uncontested_and_contested_shots_outside_10_feet(self):
+    def get_players_sorted_by_teammates_efg_percentage_on_shots_from_passes(self, fga_limit=100):
+        """
+        Sort all the players WITH MORE THEN 100 TEAMMATES FGA AFTER THEIR PASSES this season, by their teammates EFG%
+        on those shots. Uses the league's passing network - with no requests per player
+        :return:
+        :rtype: list[(string, (float, int))]
+        """
+        efg_df = self.league_passing_network.get_teammates_efg_percentage_from_passes_df()
+        current_player_ids = [player_object.id for player_object in self.current_players_objects]
+        efg_df = efg_df[efg_df.index.isin(current_player_ids) & (efg_df['FGA'] > fga_limit)]
+        efg_df = efg_df.sort_values('EFG_PCT', ascending=False, kind='stable')
+        players_name_index = self._players_name_index
+        return [(players_name_index.get_name(player_id), (efg_percentage, int(fga))) for
+                player_id, efg_percentage, fga in zip(efg_df.index, efg_df['EFG_PCT'], efg_df['FGA'])]
+
+    def _get_players_sorted_by_contested_shooting(self, sort_column: str, fga_limit: float) -> list[tuple]:
+        """
+        Sorts the players by a column of the league's contested shooting df - a single vectorized sort, with no
+        requests per player
+        :return: The names of the players, with their EFG% diff and the portion of their shots that were uncontested
+        """
+        contested_shooting_df = self.league_contested_shooting_df
+        current_player_ids = [player_object.id for player_object in self.current_players_objects]
+        contested_shooting_df = contested_shooting_df[contested_shooting_df.index.isin(current_player_ids) &
+                                                      (contested_shooting_df['FGA'] > fga_limit)]
+        contested_shooting_df = contested_shooting_df.sort_values(sort_column, ascending=False, kind='stable')
+        players_name_index = self._players_name_index
+        return [(players_name_index.get_name(player_id), (efg_percentage_diff, open_fga_percentage)) for
+                player_id, efg_percentage_diff, open_fga_percentage in
+                zip(contested_shooting_df.index, contested_shooting_df['EFG_PCT_DIFF'],
+                    contested_shooting_df['OPEN_FGA_PCT'])]
+
+    def get_players_sorted_by_diff_in_efg_percentage_between_uncontested_and_contested_shots_outside_10_feet(
+            self, fga_limit=200):
         """
         Sort all the players WITH MORE THEN 200 OUTSIDE FGA this season, by how much better their EFG% was on
         uncontested shots than on contested shots.
         :return:
         :rtype: list[(string, (float, float))]
         """
-        self.logger.info('Filtering out players with not enough shot attempts...')
-        filtered_player_objects_list = [my_player_object for my_player_object in self.current_players_objects if
-                                        my_player_object.is_player_over_fga_outside_10_feet_limit()]
-
-        self.logger.info('Getting relevant data...')
-        players_name_and_result_list = []
+        return self._get_players_sorted_by_contested_shooting('EFG_PCT_DIFF', fga_limit)
 
-        for i, my_player_object in enumerate(filtered_player_objects_list, start=1):
-            self.logger.info('Player %s/%s' % (i, len(filtered_player_objects_list)))
-            diff_in_teammates_efg_percentage = \
-                my_player_object.get_diff_in_efg_percentage_between_uncontested_and_contested_shots_outside_10_feet()
-            players_name_and_result_list.append((my_player_object.name, diff_in_teammates_efg_percentage))
-        self.logger.info('Sorting...')
-        players_name_and_result_list.sort(key=lambda x: x[1][0], reverse=True)
-        return players_name_and_result_list
-
-    def get_players_sorted_by_percentage_of_shots_outside_10_feet_that_were_uncontested(self):
+    def get_players_sorted_by_percentage_of_shots_outside_10_feet_that_were_uncontested(self, fga_limit=100):
         """
         Sort all the players WITH MORE THEN 100 OUTSIDE FGA this season, by the percentage of their outside shots which
         were uncontested.
         :return:
         :rtype: list[(string, (float, float))]
         """
-        self.logger.info('Filtering out players with not enough shot attempts...')
-        filtered_player_objects_list = [my_player_object for my_player_object in self.current_players_objects if
-                                        my_player_object.is_player_over_fga_outside_10_feet_limit(limit=100)]
+        return self._get_players_sorted_by_contested_shooting('OPEN_FGA_PCT', fga_limit)
+
+    def _get_players_confidence_intervals_df(self, confidence_intervals_df: DataFrame, sort_column: str) -> DataFrame:
+        """ The rows of the current players, with their names, sorted by the point estimate """
+        current_player_ids = [player_object.id for player_object in self.current_players_objects]
+        confidence_intervals_df = confidence_intervals_df[confidence_intervals_df.index.isin(current_player_ids)]
+        confidence_intervals_df = confidence_intervals_df.sort_values(sort_column, ascending=False, kind='stable')
+        players_name_index = self._players_name_index
+        confidence_intervals_df.insert(0, 'PLAYER_NAME', [players_name_index.get_name(player_id)
+                                                          for player_id in confidence_intervals_df.index])
+        return confidence_intervals_df
+
+    def get_players_contested_shooting_confidence_intervals_df(
+            self, fga_limit: float = 200, number_of_resamples: int = bootstrapScripts.default_number_of_resamples,
+            confidence_level: float = bootstrapScripts.default_confidence_level,
+            random_state: Optional[int] = None) -> DataFrame:
+        """
+        All the players WITH MORE THEN 200 OUTSIDE FGA this season, by how much better their EFG% was on uncontested
+        shots than on contested shots - with a bootstrap confidence interval (see bootstrapScripts)
+        :return: A df indexed by PLAYER_ID with PLAYER_NAME, OPEN_FGA, TIGHT_FGA, EFG_PCT_DIFF, EFG_PCT_DIFF_LOW and
+        EFG_PCT_DIFF_HIGH, sorted
+        """
+        contested_shooting_df = self.league_contested_shooting_df
+        contested_shooting_df = contested_shooting_df[contested_shooting_df['FGA'] > fga_limit]
+        return self._get_players_confidence_intervals_df(
+            bootstrapScripts.get_efg_percentage_diff_confidence_intervals_df(
+                contested_shooting_df, 'OPEN_', 'TIGHT_', number_of_resamples=number_of_resamples,
+                confidence_level=confidence_level, random_generator=np.random.default_rng(random_state)),
+            'EFG_PCT_DIFF')
+
+    def get_players_efg_percentage_after_makes_confidence_intervals_df(
+            self, number_of_previous_shots: int = 1, fga_limit: float = 100,
+            number_of_resamples: int = bootstrapScripts.default_number_of_resamples,
+            confidence_level: float = bootstrapScripts.default_confidence_level,
+            random_state: Optional[int] = None) -> DataFrame:
+        """
+        All the players WITH MORE THEN 100 FGA AFTER MAKES this season, by their EFG% on shots after makes - with a
+        bootstrap confidence interval (see bootstrapScripts)
+        :param number_of_previous_shots: The number of consecutive makes before the shots
+        :return: A df indexed by PLAYER_ID with PLAYER_NAME, FGA, EFG_PCT, EFG_PCT_LOW and EFG_PCT_HIGH, sorted
+        """
+        after_makes_df = bootstrapScripts.get_shooting_after_makes_df(
+            self.league_shot_chart_df, number_of_previous_shots=number_of_previous_shots)
+        return self._get_players_confidence_intervals_df(
+            bootstrapScripts.get_efg_percentage_confidence_intervals_df(
+                after_makes_df[after_makes_df['FGA'] > fga_limit], number_of_resamples=number_of_resamples,
+                confidence_level=confidence_level, random_generator=np.random.default_rng(random_state)),
+            'EFG_PCT')
 
-        self.logger.info('Getting relevant data...')
-        players_name_and_result = []
+    def get_players_efg_percentage_from_side_confidence_intervals_df(
+            self, side: Literal['Right', 'Left'], fga_limit: float = 100,
+            number_of_resamples: int = bootstrapScripts.default_number_of_resamples,
+            confidence_level: float = bootstrapScripts.default_confidence_level,
+            random_state: Optional[int] = None) -> DataFrame:
+        """
+        All the players WITH MORE THEN 100 FGA FROM THE SIDE this season, by their EFG% on shots from the side of the
+        floor - with a bootstrap confidence interval (see bootstrapScripts)
+        :param side: Right or Left
+        :return: A df indexed by PLAYER_ID with PLAYER_NAME, FGA, EFG_PCT, EFG_PCT_LOW and EFG_PCT_HIGH, sorted
+        """
+        prefix = f'{side.upper()}_'
+        sides_df = bootstrapScripts.get_shooting_by_side_df(self.league_shot_chart_df)
+        return self._get_players_confidence_intervals_df(
+            bootstrapScripts.get_efg_percentage_confidence_intervals_df(
+                sides_df[sides_df[prefix + 'FGA'] > fga_limit], prefix=prefix, number_of_resamples=number_of_resamples,
+                confidence_level=confidence_level, random_generator=np.random.default_rng(random_state)),
+            'EFG_PCT')
 
-        for i, my_player_object in enumerate(filtered_player_objects_list, start=1):
-            self.logger.info('Player %s/%s' % (i, len(filtered_player_objects_list)))
-            diff_in_teammates_efg_percentage = \
-                my_player_object.get_diff_in_efg_percentage_between_uncontested_and_contested_shots_outside_10_feet()
-            players_name_and_result.append((my_player_object.name, diff_in_teammates_efg_percentage))
-        self.logger.info('Sorting...')
-        players_name_and_result.sort(key=lambda x: x[1][1], reverse=True)
-        return players_name_and_result
+    def get_players_on_off_leaderboard(self, stat_key: str, eligibility_mask: Optional[Series] = None,
+                                       ascending: bool = False, top_k: Optional[int] = None) -> DataFrame:
+        """
+        Ranks the players by how much better their team's stat was with them on the court (rather than off of it).
+        Uses the league's on/off df - a single vectorized sort, with no requests per player
+
+        :param stat_key: The stat to rank by (NET_RATING, OFF_RATING, DEF_RATING, PLUS_MINUS...)
+        :param eligibility_mask: If passed (a boolean series indexed by PLAYER_ID), only the players where it's True
+        are ranked
+        :param ascending: Whether lower differences rank higher or not
+        :param top_k: If passed, only the top k players are returned
+        :return: The on/off rows of the players (on their most recent team), sorted, with a RANK column
+        """
+        return onOffScripts.get_on_off_leaderboard(
+            self.league_on_off_df,
+            stat_key,
+            player_ids={player_object.id for player_object in self.current_players_objects},
+            team_id_by_player_id=self.players_features_df['TEAM_ID'],
+            eligibility_mask=eligibility_mask,
+            ascending=ascending,
+            top_k=top_k)
+
+    def _get_names_and_on_off_stats(self, leaderboard_df: DataFrame, stat_key: str) -> list[tuple]:
+        players_name_index = self._players_name_index
+        return [(players_name_index.get_name(player_id), (on_court_stat, off_court_stat)) for
+                player_id, on_court_stat, off_court_stat in
+                zip(leaderboard_df['PLAYER_ID'], leaderboard_df[onOffScripts.ON_PREFIX + stat_key],
+                    leaderboard_df[onOffScripts.OFF_PREFIX + stat_key])]
 
     def get_players_sorted_by_team_net_rtg_on_off_court_diff(self, minutes_limit=800):
         """
@@ -164,23 +394,27 @@ class PlayersContainer:
         :return:
         :rtype: list[(string, (float, float))]
         """
-        self.logger.info('Filtering out players with not enough minutes...')
-        filtered_player_objects_list = [my_player_object for my_player_object in self.current_players_objects if
-                                        my_player_object.is_player_over_minutes_limit(minutes_limit,
-                                                                                      only_recent_team=True)]
+        leaderboard_df = self.get_players_on_off_leaderboard(
+            'NET_RATING',
+            eligibility_mask=playerFeaturesScripts.get_minutes_limit_mask(self.players_features_df, minutes_limit,
+                                                                          only_recent_team=True))
+        return self._get_names_and_on_off_stats(leaderboard_df, 'NET_RATING')
 
-        self.logger.info('Getting relevant data...')
-        players_name_and_result = []
-        for i, my_player_object in enumerate(filtered_player_objects_list, start=1):
-            self.logger.info('Player %s/%s' % (i, len(filtered_player_objects_list)))
-            try:
-                players_name_and_result.append((my_player_object.name,
-                                                my_player_object.get_team_net_rtg_on_off_court()))
-            except (PlayerHasMoreThenOneTeam, PlayerHasNoTeam):
-                pass
-        self.logger.info('Sorting...')
-        players_name_and_result.sort(key=lambda x: x[1][0] - x[1][1], reverse=True)
-        return players_name_and_result
+    def get_players_sorted_by_rapm(self, rapm_column: str = 'RAPM', possessions_limit: float = 2000) -> list[tuple]:
+        """
+        Sort all the players WITH MORE THEN 2000 OFFENSIVE POSSESSIONS this season, by their RAPM estimate
+        :param rapm_column: RAPM, ORAPM or DRAPM
+        :param possessions_limit: The number of offensive possessions a player has to play
+        :return:
+        :rtype: list[(string, float)]
+        """
+        rapm_df = self.league_rapm_df
+        current_player_ids = [player_object.id for player_object in self.current_players_objects]
+        rapm_df = rapm_df[rapm_df.index.isin(current_player_ids) & (rapm_df['OFF_POSS'] > possessions_limit)]
+        rapm_df = rapm_df.sort_values(rapm_column, ascending=False, kind='stable')
+        players_name_index = self._players_name_index
+        return [(players_name_index.get_name(player_id), rapm) for
+                player_id, rapm in zip(rapm_df.index, rapm_df[rapm_column])]
 
     def get_players_sorted_by_team_def_rtg_on_off_court_diff(self, minutes_limit=800):
         """
@@ -189,20 +423,9 @@ class PlayersContainer:
         :return:
         :rtype: list[(string, (float, float))]
         """
-        self.logger.info('Filtering out players with not enough minutes...')
-        filtered_player_objects_list = [my_player_object for my_player_object in self.current_players_objects if
-                                        my_player_object.is_player_over_minutes_limit(minutes_limit,
-                                                                                      only_recent_team=True)]
-
-        self.logger.info('Getting relevant data...')
-        players_name_and_result = []
-        for i, my_player_object in enumerate(filtered_player_objects_list, start=1):
-            self.logger.info('Player %s/%s' % (i, len(filtered_player_objects_list)))
-            try:
-                players_name_and_result.append((my_player_object.name,
-                                                my_player_object.get_team_def_rtg_on_off_court()))
-            except (PlayerHasMoreThenOneTeam, PlayerHasNoTeam):
-                pass
-        self.logger.info('Sorting...')
-        players_name_and_result.sort(key=lambda x: x[1][0] - x[1][1])
-        return players_name_and_result
+        leaderboard_df = self.get_players_on_off_leaderboard(
+            'DEF_RATING',
+            eligibility_mask=playerFeaturesScripts.get_minutes_limit_mask(self.players_features_df, minutes_limit,
+                                                                          only_recent_team=True),
+            ascending=True)
+        return self._get_names_and_on_off_stats(leaderboard_df, 'DEF_RATING')
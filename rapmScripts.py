@@ -0,0 +1,69 @@
+"""
+Regularized adjusted plus-minus (RAPM) over lineup stints. Every stint of every team is a row in a sparse design
+matrix, with the five players on offense in their offensive columns and the five players on defense in their defensive
+columns, and the points per 100 possessions of the offense as the target. A possessions-weighted ridge regression
+separates every player's impact from the impact of his teammates and opponents.
+"""
+import numpy as np
+from pandas import DataFrame
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+import lineupStintsScripts
+
+# The ridge penalty. Higher values shrink the estimates of players with fewer possessions more towards 0
+default_rapm_alpha = 2000
+
+
+def get_rapm_design_matrix(stints_df: DataFrame) -> tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    :param stints_df: Lineup stints (see lineupStintsScripts) of any number of games and seasons
+    :return: tuple of:
+        A (stints x 2 * players) matrix - the offensive columns of all the players, and then their defensive columns
+        The ids of the players, in the order of the columns
+    """
+    offense_ids = stints_df[lineupStintsScripts.lineup_player_columns].to_numpy(dtype=np.int64)
+    defense_ids = stints_df[lineupStintsScripts.opponent_lineup_player_columns].to_numpy(dtype=np.int64)
+    player_ids, positions = np.unique(np.concatenate([offense_ids, defense_ids], axis=1), return_inverse=True)
+    positions = positions.reshape(len(stints_df), 10)
+    # The defensive columns come after all the offensive columns
+    positions[:, 5:] += len(player_ids)
+    rows = np.repeat(np.arange(len(stints_df)), 10)
+    design_matrix = sparse.csr_matrix((np.ones(rows.size), (rows, positions.ravel())),
+                                      shape=(len(stints_df), 2 * len(player_ids)))
+    return design_matrix, player_ids
+
+
+def get_rapm_df(stints_df: DataFrame, alpha: float = default_rapm_alpha) -> DataFrame:
+    """
+    Solves (X^T W X + alpha * I) b = X^T W (y - league average), with W the possessions of every stint, using a sparse
+    solver. Defensive estimates are negated, so for both of them higher is better.
+
+    :param stints_df: Lineup stints (see lineupStintsScripts) of any number of games and seasons
+    :param alpha: The ridge penalty
+    :return: A df indexed by PLAYER_ID with ORAPM, DRAPM and RAPM (points per 100 possessions over an average player),
+    OFF_POSS and DEF_POSS, sorted by RAPM
+    """
+    possessions = stints_df['POSS_FOR'].to_numpy(dtype=np.float64)
+    stints_df = stints_df[possessions > 0]
+    possessions = possessions[possessions > 0]
+    points_per_100_possessions = 100 * stints_df['PTS_FOR'].to_numpy(dtype=np.float64) / possessions
+    league_average = np.average(points_per_100_possessions, weights=possessions)
+
+    design_matrix, player_ids = get_rapm_design_matrix(stints_df)
+    weighted_design_matrix_transpose = (sparse.diags(possessions) @ design_matrix).T.tocsr()
+    normal_matrix = (weighted_design_matrix_transpose @ design_matrix +
+                     alpha * sparse.identity(design_matrix.shape[1], format='csr')).tocsc()
+    estimates = spsolve(normal_matrix, weighted_design_matrix_transpose @ (points_per_100_possessions - league_average))
+    column_possessions = weighted_design_matrix_transpose.sum(axis=1).A1
+
+    number_of_players = len(player_ids)
+    rapm_df = DataFrame({
+        'ORAPM': estimates[:number_of_players],
+        'DRAPM': -estimates[number_of_players:],
+        'OFF_POSS': column_possessions[:number_of_players],
+        'DEF_POSS': column_possessions[number_of_players:],
+    }, index=player_ids)
+    rapm_df.index.name = 'PLAYER_ID'
+    rapm_df.insert(2, 'RAPM', rapm_df['ORAPM'] + rapm_df['DRAPM'])
+    return rapm_df.sort_values('RAPM', ascending=False, kind='stable')
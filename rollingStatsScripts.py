@@ -0,0 +1,129 @@
+"""
+Rolling (last N games) stats of all the players/teams in a game logs df at once. The game logs are sorted by player
+and date, and the sum of every window is the difference of two rows of the cumulative sums - with no loop over the
+players or the games.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+
+rolling_stats = ['MIN',
+                 'PTS',
+                 'FGM',
+                 'FGA',
+                 'FG3M',
+                 'FG3A',
+                 'FTM',
+                 'FTA',
+                 'REB',
+                 'AST',
+                 'TOV',
+                 'STL',
+                 'BLK',
+                 ]
+# The stats that are needed for the shooting percentages (EFG_PCT and TS_PCT)
+_shooting_stats = ['PTS', 'FGM', 'FGA', 'FG3M', 'FTA']
+
+
+def get_rolling_stats_df(game_logs_df: DataFrame, window: int = 10, stats: Optional[list[str]] = None,
+                         entity_column: str = 'PLAYER_ID') -> DataFrame:
+    """
+    :param game_logs_df: A game logs df of any number of players (or teams), with a GAME_DATE column
+    :param window: The number of games in every window (the game itself and the ones before it)
+    :param stats: The stats to roll. rolling_stats by default
+    :param entity_column: The column of the player (or team) id
+    :return: A row for every game (with the index of the game logs df, sorted by the player and the date) with the
+    entity column, GAME_ID, GAME_DATE, GP (the number of games in the window - less than the window in the first games
+    of every player), the sum of every stat in the window, its mean (with a _MEAN suffix), EFG_PCT and TS_PCT
+    """
+    stats = rolling_stats if stats is None else stats
+    game_dates = pd.to_datetime(game_logs_df['GAME_DATE'].astype(str), format='mixed').to_numpy()
+    entity_codes = pd.factorize(game_logs_df[entity_column])[0]
+    order = np.lexsort((game_dates, entity_codes))
+    sorted_entity_codes = entity_codes[order]
+
+    positions = np.arange(len(order))
+    is_first_game = np.ones(len(order), dtype=bool)
+    is_first_game[1:] = sorted_entity_codes[1:] != sorted_entity_codes[:-1]
+    first_game_positions = np.maximum.accumulate(np.where(is_first_game, positions, 0))
+    window_start_positions = np.maximum(positions - window + 1, first_game_positions)
+
+    rolled_stats = list(dict.fromkeys(stats + [stat for stat in _shooting_stats if stat in game_logs_df]))
+    # Stats are usually downcast to small integers, so they are accumulated as float64
+    stats_values = game_logs_df[rolled_stats].to_numpy(dtype=np.float64)[order]
+    cumulative_sums = np.zeros((len(order) + 1, len(rolled_stats)))
+    np.cumsum(stats_values, axis=0, out=cumulative_sums[1:])
+    window_sums = cumulative_sums[positions + 1] - cumulative_sums[window_start_positions]
+    games_played = positions + 1 - window_start_positions
+
+    context_columns = [column for column in [entity_column, 'GAME_ID', 'GAME_DATE'] if column in game_logs_df]
+    rolling_stats_df = game_logs_df[context_columns].iloc[order].copy()
+    rolling_stats_df['GP'] = games_played
+    sums_df = DataFrame(window_sums, index=rolling_stats_df.index, columns=rolled_stats)
+    rolling_stats_df[stats] = sums_df[stats]
+    rolling_stats_df[[f'{stat}_MEAN' for stat in stats]] = sums_df[stats].to_numpy() / games_played[:, None]
+    if set(_shooting_stats).issubset(rolled_stats):
+        rolling_stats_df['EFG_PCT'] = _get_percentage(sums_df['FGM'] + 0.5 * sums_df['FG3M'], sums_df['FGA'])
+        rolling_stats_df['TS_PCT'] = _get_percentage(sums_df['PTS'], 2 * (sums_df['FGA'] + 0.44 * sums_df['FTA']))
+    return rolling_stats_df
+
+
+def _get_percentage(numerator: Series, denominator: Series) -> Series:
+    """ NaN where the denominator is 0 """
+    return numerator / denominator.where(denominator > 0)
+
+
+def get_recent_form_df(game_logs_df: DataFrame, last_n_games: int = 10, stats: Optional[list[str]] = None,
+                       entity_column: str = 'PLAYER_ID') -> DataFrame:
+    """
+    :param game_logs_df: A game logs df of any number of players (or teams), with a GAME_DATE column
+    :param last_n_games: The number of recent games
+    :param stats: The stats to sum. rolling_stats by default
+    :param entity_column: The column of the player (or team) id
+    :return: The rolling stats (see get_rolling_stats_df) of the last game of every player, indexed by the entity column
+    """
+    rolling_stats_df = get_rolling_stats_df(game_logs_df, window=last_n_games, stats=stats,
+                                            entity_column=entity_column)
+    return rolling_stats_df.drop_duplicates(entity_column, keep='last').set_index(entity_column)
+
+
+class RollingStats:
+    """
+    Rolling stats that are updated as new games arrive. Only the last games of every player are kept between the
+    updates, so every update costs as much as the new games (and not as much as the whole season)
+    """
+
+    def __init__(self, window: int = 10, stats: Optional[list[str]] = None, entity_column: str = 'PLAYER_ID'):
+        """
+
+        :param window: The number of games in every window
+        :param stats: The stats to roll. rolling_stats by default
+        :param entity_column: The column of the player (or team) id
+        """
+        self.window = window
+        self.stats = rolling_stats if stats is None else stats
+        self.entity_column = entity_column
+        self._recent_games_df: Optional[DataFrame] = None
+
+    def update(self, new_game_logs_df: DataFrame) -> DataFrame:
+        """
+        :param new_game_logs_df: Game logs of games that were played after all the games of the previous updates
+        :return: The rolling stats (see get_rolling_stats_df) of the new games, with the index of the new game logs df
+        """
+        kept_columns = [column for column in [self.entity_column, 'GAME_ID', 'GAME_DATE'] if column in new_game_logs_df]
+        kept_columns += list(dict.fromkeys(self.stats + [stat for stat in _shooting_stats if stat in new_game_logs_df]))
+        new_game_logs_df = new_game_logs_df[kept_columns]
+        game_logs_df = new_game_logs_df.set_axis(pd.MultiIndex.from_product([['NEW'], new_game_logs_df.index]))
+        if self._recent_games_df is not None:
+            game_logs_df = pd.concat([self._recent_games_df.set_axis(pd.MultiIndex.from_product(
+                [['RECENT'], range(len(self._recent_games_df))])), game_logs_df])
+        rolling_stats_df = get_rolling_stats_df(game_logs_df, window=self.window, stats=self.stats,
+                                                entity_column=self.entity_column)
+
+        # The games of every player are kept in chronological order, so the window of his next game is at the tail
+        sorted_game_logs_df = game_logs_df.loc[rolling_stats_df.index]
+        self._recent_games_df = sorted_game_logs_df.groupby(
+            self.entity_column, sort=False, observed=True).tail(self.window - 1).reset_index(drop=True)
+        return rolling_stats_df.loc['NEW'].loc[new_game_logs_df.index]
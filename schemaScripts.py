@@ -0,0 +1,134 @@
+"""
+Compact schemas for the big dfs (shot charts and game logs) - numeric columns are downcast to the smallest dtype that
+holds their values, and repeated strings are converted to categoricals.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.api.types import is_float_dtype, is_integer_dtype, union_categoricals
+
+shot_chart_categorical_columns = ['GRID_TYPE',
+                                  'GAME_ID',
+                                  'PLAYER_NAME',
+                                  'TEAM_NAME',
+                                  'EVENT_TYPE',
+                                  'ACTION_TYPE',
+                                  'SHOT_TYPE',
+                                  'SHOT_ZONE_BASIC',
+                                  'SHOT_ZONE_AREA',
+                                  'SHOT_ZONE_RANGE',
+                                  'GAME_DATE',
+                                  'HTM',
+                                  'VTM',
+                                  ]
+
+game_logs_categorical_columns = ['SEASON_ID',
+                                 'SEASON_YEAR',
+                                 'PLAYER_NAME',
+                                 'TEAM_ABBREVIATION',
+                                 'TEAM_NAME',
+                                 'GAME_ID',
+                                 'GAME_DATE',
+                                 'MATCHUP',
+                                 'OPPONENT_TEAM_ABBREVIATION',
+                                 'WL',
+                                 'VIDEO_AVAILABLE',
+                                 ]
+
+stints_categorical_columns = ['GAME_ID',
+                              ]
+
+# A column is converted to a categorical only if it has less unique values than this portion of the rows. Otherwise,
+# the categories cost more memory than the strings themselves.
+max_unique_values_ratio_for_categorical = 0.5
+
+
+def compact_df(df: DataFrame, categorical_columns: Optional[list[str]] = None,
+               downcast_floats: bool = True) -> DataFrame:
+    """
+    NOTE: Integer columns are downcast as much as possible (int8 for most single game stats), so accumulations over
+    them (like cumsum) should be done after casting them to a bigger dtype.
+
+    :param df: The df to compact
+    :param categorical_columns: String columns to convert to categoricals. If None, all the string columns are checked.
+    :param downcast_floats: Whether to downcast float columns to float32 or not
+    :return: A compact copy of the df
+    """
+    df = df.copy()
+    if categorical_columns is None:
+        categorical_columns = [column for column, dtype in df.dtypes.items()
+                               if not (is_integer_dtype(dtype) or is_float_dtype(dtype))]
+    for column in df.columns:
+        if is_integer_dtype(df[column].dtype):
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+        elif is_float_dtype(df[column].dtype) and downcast_floats:
+            df[column] = pd.to_numeric(df[column], downcast='float')
+        elif column in categorical_columns and not isinstance(df[column].dtype, pd.CategoricalDtype) and \
+                df[column].nunique() <= max_unique_values_ratio_for_categorical * len(df):
+            df[column] = df[column].astype('category')
+    return df
+
+
+def compact_shot_chart_df(shot_chart_df: DataFrame) -> DataFrame:
+    """ A shot chart df (from ShotChartDetail) in a compact schema """
+    return compact_df(shot_chart_df, categorical_columns=shot_chart_categorical_columns)
+
+
+def compact_game_logs_df(game_logs_df: DataFrame) -> DataFrame:
+    """ A game logs df (player, team or league game logs) in a compact schema """
+    return compact_df(game_logs_df, categorical_columns=game_logs_categorical_columns)
+
+
+def compact_stints_df(stints_df: DataFrame) -> DataFrame:
+    """ A lineup stints df (see lineupStintsScripts) in a compact schema """
+    return compact_df(stints_df, categorical_columns=stints_categorical_columns)
+
+
+def concat_compact_dfs(dfs: list[DataFrame]) -> DataFrame:
+    """
+    pd.concat turns categorical columns with different categories into object columns. This keeps them categorical,
+    with the union of the categories, so multiple seasons/players can be stacked without losing the compact schema.
+    A column that is categorical in one of the dfs, will be categorical in the result.
+
+    :param dfs: Compact dfs with the same columns
+    :return: A single compact df
+    """
+    dfs = [df for df in dfs if not df.empty]
+    if not dfs:
+        return DataFrame()
+    dfs = [df.copy() for df in dfs]
+    categorical_columns = {column for df in dfs for column, dtype in df.dtypes.items()
+                           if isinstance(dtype, pd.CategoricalDtype)}
+    for column in categorical_columns:
+        for df in dfs:
+            df[column] = df[column].astype('category')
+        categories = union_categoricals([df[column].array for df in dfs], ignore_order=True).categories
+        for df in dfs:
+            df[column] = df[column].cat.set_categories(categories)
+    concatenated_df = pd.concat(dfs, ignore_index=True)
+    # Integer columns can get different dtypes in different dfs, so they are downcast again
+    for column in concatenated_df.columns:
+        if is_integer_dtype(concatenated_df[column].dtype):
+            concatenated_df[column] = pd.to_numeric(concatenated_df[column], downcast='integer')
+    return concatenated_df
+
+
+def get_memory_usage_report(original_df: DataFrame, compacted_df: DataFrame) -> DataFrame:
+    """
+    :param original_df: The df before compacting
+    :param compacted_df: The df after compacting
+    :return: A df with the dtype and memory usage (in bytes) of every column before and after compacting, and a TOTAL
+    row
+    """
+    report_df = DataFrame({
+        'ORIGINAL_DTYPE': original_df.dtypes.astype(str),
+        'COMPACT_DTYPE': compacted_df.dtypes.astype(str),
+        'ORIGINAL_BYTES': original_df.memory_usage(deep=True, index=False),
+        'COMPACT_BYTES': compacted_df.memory_usage(deep=True, index=False),
+    })
+    report_df.loc['TOTAL'] = ['', '', report_df['ORIGINAL_BYTES'].sum(), report_df['COMPACT_BYTES'].sum()]
+    report_df['SAVED_PCT'] = np.where(report_df['ORIGINAL_BYTES'] == 0, 0,
+                                      1 - report_df['COMPACT_BYTES'] / report_df['ORIGINAL_BYTES'].replace(0, 1))
+    return report_df
@@ -0,0 +1,290 @@
+"""
+Vectorized calculations over shot chart dfs (from ShotChartDetail). Works for a single player's shot chart, as well as
+for a whole team or league shot chart, since every calculation is done per player.
+"""
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+SHOT_RESULT_MADE = 1
+SHOT_RESULT_MISSED = 0
+THREE_POINTER_SHOT_TYPE = '3PT Field Goal'
+
+# The zone codes are indexes in these tuples
+SHOT_SIDES = ('Left', 'Center', 'Right')
+SHOT_DISTANCE_BANDS = ('Less than 4 ft', '4-10 ft', '10-16 ft', '16-24 ft', '24+ ft')
+_shot_distance_bands_edges = [4, 10, 16, 24]
+
+# LOC_X and LOC_Y are in tenths of feet, where the basket is (0, 0). These are the borders of half court.
+_court_loc_x_range = (-250, 250)
+_court_loc_y_range = (-52, 900)
+# Distance (in LOC units) between the center of a hexagon to its corners
+HEX_CELL_SIZE = 15
+
+
+def _get_shots_order(shot_chart_df: DataFrame) -> np.ndarray:
+    """ The positions of the shots, sorted by player, game and the event inside the game """
+    # Sorting by the (sorted) factorized codes, since the columns might be categoricals
+    sort_keys = [pd.factorize(shot_chart_df[column], sort=True)[0]
+                 for column in ['GAME_EVENT_ID', 'GAME_ID', 'PLAYER_ID'] if column in shot_chart_df]
+    if not sort_keys:
+        return np.arange(len(shot_chart_df))
+    return np.lexsort(sort_keys)
+
+
+def get_previous_shots_streaks(shot_chart_df: DataFrame) -> DataFrame:
+    """
+    For every shot, the number of consecutive makes and consecutive misses by the same player right before it, in the
+    same game. Calculated in one pass over the whole df.
+
+    :param shot_chart_df: A shot chart df
+    :return: A df with the same index as the shot chart, and the columns PREV_MAKES_STREAK and PREV_MISSES_STREAK
+    """
+    order = _get_shots_order(shot_chart_df)
+    made = shot_chart_df['SHOT_MADE_FLAG'].to_numpy()[order]
+    games = pd.factorize(shot_chart_df['GAME_ID'])[0][order]
+    players = pd.factorize(shot_chart_df['PLAYER_ID'])[0][order] if 'PLAYER_ID' in shot_chart_df \
+        else np.zeros(len(order), dtype=np.int64)
+    positions = np.arange(len(order))
+
+    # A shot starts a new sequence if it's the first shot of the player in the game
+    is_sequence_start = np.ones(len(order), dtype=bool)
+    is_sequence_start[1:] = (games[1:] != games[:-1]) | (players[1:] != players[:-1])
+    # A shot starts a new streak if it starts a sequence, or if its result is different from the previous shot
+    is_streak_start = is_sequence_start.copy()
+    is_streak_start[1:] |= made[1:] != made[:-1]
+    streak_start_positions = np.maximum.accumulate(np.where(is_streak_start, positions, 0))
+    # The length of the streak that ends with every shot (including it)
+    streak_lengths = positions - streak_start_positions + 1
+
+    previous_streak_lengths = np.zeros(len(order), dtype=np.int64)
+    previous_streak_lengths[1:] = streak_lengths[:-1]
+    previous_streak_lengths[is_sequence_start] = 0
+    previous_made = np.zeros(len(order), dtype=made.dtype)
+    previous_made[1:] = made[:-1]
+
+    prev_makes_streak = np.empty(len(order), dtype=np.int64)
+    prev_misses_streak = np.empty(len(order), dtype=np.int64)
+    prev_makes_streak[order] = np.where(previous_made == SHOT_RESULT_MADE, previous_streak_lengths, 0)
+    prev_misses_streak[order] = np.where(previous_made == SHOT_RESULT_MISSED, previous_streak_lengths, 0)
+    return DataFrame({'PREV_MAKES_STREAK': prev_makes_streak, 'PREV_MISSES_STREAK': prev_misses_streak},
+                     index=shot_chart_df.index)
+
+
+def get_efg_percentage_of_arrays(field_goal_makes, three_pointer_makes, field_goal_attempts):
+    """ utilsScripts.calculate_efg_percent, for arrays """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        efg_percentage = (field_goal_makes + 0.5 * three_pointer_makes) / field_goal_attempts
+    return np.where(field_goal_attempts == 0, 0, efg_percentage)
+
+
+def get_efg_percentage_by_previous_shots_results(shot_chart_df: DataFrame, max_number_of_previous_shots: int = 5,
+                                                 streaks_df: DataFrame = None) -> DataFrame:
+    """
+    EFG% on shots that came after X consecutive makes/misses, for every X from 1 to max_number_of_previous_shots and for
+    every player in the shot chart.
+
+    :param shot_chart_df: A shot chart df
+    :param max_number_of_previous_shots: The biggest number of previous shots to check the condition on
+    :param streaks_df: The result of get_previous_shots_streaks for the shot chart, if it was already calculated
+    :return: A df with the columns PLAYER_ID, PREVIOUS_SHOTS_RESULT (1 for makes, 0 for misses),
+    NUMBER_OF_PREVIOUS_SHOTS, FGM, FG3M, FGA and EFG_PCT
+    """
+    if streaks_df is None:
+        streaks_df = get_previous_shots_streaks(shot_chart_df)
+    made = shot_chart_df['SHOT_MADE_FLAG'].to_numpy()
+    three_pointers_made = made * (shot_chart_df['SHOT_TYPE'] == THREE_POINTER_SHOT_TYPE).to_numpy()
+    player_codes, player_ids = pd.factorize(shot_chart_df['PLAYER_ID']) if 'PLAYER_ID' in shot_chart_df \
+        else (np.zeros(len(shot_chart_df), dtype=np.int64), pd.Index([None]))
+    number_of_players = len(player_ids)
+    number_of_bins = max_number_of_previous_shots + 1
+
+    result_dfs = []
+    for shot_result, streak_column in [(SHOT_RESULT_MADE, 'PREV_MAKES_STREAK'),
+                                       (SHOT_RESULT_MISSED, 'PREV_MISSES_STREAK')]:
+        streaks = np.minimum(streaks_df[streak_column].to_numpy(), max_number_of_previous_shots)
+        bins = player_codes * number_of_bins + streaks
+
+        def count(weights=None):
+            counts = np.bincount(bins, weights=weights, minlength=number_of_players * number_of_bins)
+            # Reverse cumulative sum - The count of shots with a streak of AT LEAST every length
+            counts = counts.reshape(number_of_players, number_of_bins)[:, ::-1].cumsum(axis=1)[:, ::-1]
+            return counts[:, 1:].astype(np.int64).ravel()
+
+        field_goal_attempts, field_goal_makes, three_pointer_makes = count(), count(made), count(three_pointers_made)
+        result_dfs.append(DataFrame({
+            'PLAYER_ID': np.repeat(np.asarray(player_ids), max_number_of_previous_shots),
+            'PREVIOUS_SHOTS_RESULT': shot_result,
+            'NUMBER_OF_PREVIOUS_SHOTS': np.tile(np.arange(1, number_of_bins), number_of_players),
+            'FGM': field_goal_makes,
+            'FG3M': three_pointer_makes,
+            'FGA': field_goal_attempts,
+            'EFG_PCT': get_efg_percentage_of_arrays(field_goal_makes, three_pointer_makes, field_goal_attempts),
+        }))
+    return pd.concat(result_dfs, ignore_index=True)
+
+
+def _get_hex_axial_coordinates(loc_x: np.ndarray, loc_y: np.ndarray, hex_cell_size: float) -> tuple[np.ndarray, ...]:
+    """ The (q, r) axial coordinates of the pointy-top hexagon that every location falls in """
+    q = (np.sqrt(3) / 3 * loc_x - loc_y / 3) / hex_cell_size
+    r = (2 / 3 * loc_y) / hex_cell_size
+    # Cube rounding - Round all 3 cube coordinates, and fix the one that was rounded the most
+    s = -q - r
+    rounded_q, rounded_r, rounded_s = np.round(q), np.round(r), np.round(s)
+    q_diff, r_diff, s_diff = np.abs(rounded_q - q), np.abs(rounded_r - r), np.abs(rounded_s - s)
+    fix_q = (q_diff > r_diff) & (q_diff > s_diff)
+    fix_r = ~fix_q & (r_diff > s_diff)
+    rounded_q = np.where(fix_q, -rounded_r - rounded_s, rounded_q)
+    rounded_r = np.where(fix_r, -rounded_q - rounded_s, rounded_r)
+    return rounded_q.astype(np.int64), rounded_r.astype(np.int64)
+
+
+def _get_hex_grid_bounds(hex_cell_size: float) -> tuple[int, int, int, int]:
+    """ The minimal q, minimal r, number of q values and number of r values of hexagons on half court """
+    corners_x = np.array([_court_loc_x_range[0], _court_loc_x_range[0], _court_loc_x_range[1], _court_loc_x_range[1]])
+    corners_y = np.array([_court_loc_y_range[0], _court_loc_y_range[1], _court_loc_y_range[0], _court_loc_y_range[1]])
+    q, r = _get_hex_axial_coordinates(corners_x, corners_y, hex_cell_size)
+    # One extra hexagon in every direction, for the hexagons that are cut by the borders
+    min_q, min_r = q.min() - 1, r.min() - 1
+    return min_q, min_r, q.max() + 2 - min_q, r.max() + 2 - min_r
+
+
+def get_hex_cells_count(hex_cell_size: float = HEX_CELL_SIZE) -> int:
+    """ The number of possible hex cell codes """
+    _, _, q_count, r_count = _get_hex_grid_bounds(hex_cell_size)
+    return q_count * r_count
+
+
+def get_hex_cell_codes(loc_x: np.ndarray, loc_y: np.ndarray, hex_cell_size: float = HEX_CELL_SIZE) -> np.ndarray:
+    """
+    :param loc_x: LOC_X values
+    :param loc_y: LOC_Y values
+    :param hex_cell_size: The size of every hexagon
+    :return: The code of the hexagon that every location falls in. Codes are the same for every shot chart.
+    """
+    min_q, min_r, q_count, r_count = _get_hex_grid_bounds(hex_cell_size)
+    q, r = _get_hex_axial_coordinates(np.clip(loc_x, *_court_loc_x_range), np.clip(loc_y, *_court_loc_y_range),
+                                      hex_cell_size)
+    return ((r - min_r) * q_count + (q - min_q)).astype(np.int32)
+
+
+def get_hex_cell_centers(hex_cell_codes: np.ndarray, hex_cell_size: float = HEX_CELL_SIZE) -> tuple[np.ndarray, ...]:
+    """
+    :param hex_cell_codes: Codes returned from get_hex_cell_codes
+    :param hex_cell_size: The size of every hexagon
+    :return: The LOC_X and LOC_Y of the centers of the hexagons
+    """
+    min_q, min_r, q_count, _ = _get_hex_grid_bounds(hex_cell_size)
+    r, q = np.divmod(np.asarray(hex_cell_codes, dtype=np.int64), q_count)
+    q, r = q + min_q, r + min_r
+    return hex_cell_size * np.sqrt(3) * (q + r / 2), hex_cell_size * 1.5 * r
+
+
+def get_shot_side_codes(shot_zone_areas: pd.Series) -> np.ndarray:
+    """
+    :param shot_zone_areas: SHOT_ZONE_AREA values
+    :return: The index in SHOT_SIDES of every shot's side of the floor
+    """
+    codes, unique_areas = pd.factorize(shot_zone_areas)
+    # Classifying only the few unique values, and spreading the result to all the shots
+    unique_areas_sides = np.array([
+        SHOT_SIDES.index('Left') if 'left' in area.lower() else
+        SHOT_SIDES.index('Right') if 'right' in area.lower() else
+        SHOT_SIDES.index('Center')
+        for area in unique_areas
+    ] + [SHOT_SIDES.index('Center')], dtype=np.int8)
+    # factorize marks missing values with -1, which takes the last (Center) value
+    return unique_areas_sides[codes]
+
+
+def add_zone_codes(shot_chart_df: DataFrame, hex_cell_size: float = HEX_CELL_SIZE) -> DataFrame:
+    """
+    Adds integer zone codes to every shot. Meant to be done once, when a shot chart is ingested.
+
+    :param shot_chart_df: A shot chart df
+    :param hex_cell_size: The size of every hexagon for the hex cell codes
+    :return: The shot chart with the columns SHOT_SIDE_CODE, SHOT_DISTANCE_BAND_CODE and SHOT_HEX_CELL_CODE
+    """
+    shot_chart_df = shot_chart_df.copy()
+    shot_chart_df['SHOT_SIDE_CODE'] = get_shot_side_codes(shot_chart_df['SHOT_ZONE_AREA'])
+    shot_chart_df['SHOT_DISTANCE_BAND_CODE'] = np.digitize(
+        shot_chart_df['SHOT_DISTANCE'].to_numpy(), _shot_distance_bands_edges).astype(np.int8)
+    shot_chart_df['SHOT_HEX_CELL_CODE'] = get_hex_cell_codes(
+        shot_chart_df['LOC_X'].to_numpy(), shot_chart_df['LOC_Y'].to_numpy(), hex_cell_size)
+    return shot_chart_df
+
+
+def _get_zone_codes_count(zone_column: str, hex_cell_size: float) -> int:
+    if zone_column == 'SHOT_SIDE_CODE':
+        return len(SHOT_SIDES)
+    elif zone_column == 'SHOT_DISTANCE_BAND_CODE':
+        return len(SHOT_DISTANCE_BANDS)
+    elif zone_column == 'SHOT_HEX_CELL_CODE':
+        return get_hex_cells_count(hex_cell_size)
+    else:
+        raise ValueError(f'"{zone_column}" is not a zone code column')
+
+
+def get_efg_percentage_by_zone(shot_chart_df: DataFrame, zone_columns: Union[str, list[str]],
+                               by_player: bool = False, hex_cell_size: float = HEX_CELL_SIZE) -> DataFrame:
+    """
+    Aggregates the shots of a shot chart (with zone codes) for any grouping of zones, in one pass.
+
+    :param shot_chart_df: A shot chart df, after add_zone_codes
+    :param zone_columns: One or more of SHOT_SIDE_CODE, SHOT_DISTANCE_BAND_CODE and SHOT_HEX_CELL_CODE
+    :param by_player: Whether to aggregate every player separately or all the shots together
+    :param hex_cell_size: The size of every hexagon the hex cell codes were calculated with
+    :return: A df with the zone columns (and PLAYER_ID if by_player), FGM, FG3M, FGA and EFG_PCT. Only zones with shots
+    are returned.
+    """
+    zone_columns = [zone_columns] if isinstance(zone_columns, str) else list(zone_columns)
+    codes = [shot_chart_df[zone_column].to_numpy(dtype=np.int64) for zone_column in zone_columns]
+    dimensions = [_get_zone_codes_count(zone_column, hex_cell_size) for zone_column in zone_columns]
+    player_ids = None
+    if by_player:
+        player_codes, player_ids = pd.factorize(shot_chart_df['PLAYER_ID'])
+        codes.insert(0, player_codes)
+        dimensions.insert(0, len(player_ids))
+    number_of_bins = int(np.prod(dimensions))
+    bins = np.ravel_multi_index(codes, dimensions) if codes[0].size else np.zeros(0, dtype=np.int64)
+
+    made = shot_chart_df['SHOT_MADE_FLAG'].to_numpy()
+    three_pointers_made = made * (shot_chart_df['SHOT_TYPE'] == THREE_POINTER_SHOT_TYPE).to_numpy()
+    field_goal_attempts = np.bincount(bins, minlength=number_of_bins)
+    field_goal_makes = np.bincount(bins, weights=made, minlength=number_of_bins).astype(np.int64)
+    three_pointer_makes = np.bincount(bins, weights=three_pointers_made, minlength=number_of_bins).astype(np.int64)
+
+    existing_bins = np.flatnonzero(field_goal_attempts)
+    zone_df = DataFrame(dict(zip(['PLAYER_ID'] * by_player + zone_columns,
+                                 np.unravel_index(existing_bins, dimensions))))
+    if by_player:
+        zone_df['PLAYER_ID'] = np.asarray(player_ids)[zone_df['PLAYER_ID'].to_numpy()]
+    zone_df['FGM'] = field_goal_makes[existing_bins]
+    zone_df['FG3M'] = three_pointer_makes[existing_bins]
+    zone_df['FGA'] = field_goal_attempts[existing_bins]
+    zone_df['EFG_PCT'] = get_efg_percentage_of_arrays(zone_df['FGM'], zone_df['FG3M'], zone_df['FGA'])
+    return zone_df
+
+
+def get_efg_percentage_by_zone_compared_to_league(shot_chart_df: DataFrame, league_shot_chart_df: DataFrame,
+                                                  zone_columns: Union[str, list[str]], by_player: bool = False,
+                                                  league_zone_df: Optional[DataFrame] = None) -> DataFrame:
+    """
+    :param shot_chart_df: A shot chart df, after add_zone_codes
+    :param league_shot_chart_df: The league's shot chart df, after add_zone_codes
+    :param zone_columns: One or more of SHOT_SIDE_CODE, SHOT_DISTANCE_BAND_CODE and SHOT_HEX_CELL_CODE
+    :param by_player: Whether to aggregate every player separately or all the shots together
+    :param league_zone_df: The league's aggregation for the same zones, if it was already calculated
+    :return: get_efg_percentage_by_zone, with the league's EFG% in every zone (LEAGUE_EFG_PCT), and the diff from it
+    (EFG_PCT_DIFF)
+    """
+    zone_columns = [zone_columns] if isinstance(zone_columns, str) else list(zone_columns)
+    if league_zone_df is None:
+        league_zone_df = get_efg_percentage_by_zone(league_shot_chart_df, zone_columns)
+    zone_df = get_efg_percentage_by_zone(shot_chart_df, zone_columns, by_player=by_player)
+    zone_df = zone_df.merge(league_zone_df[zone_columns + ['EFG_PCT']].rename(columns={'EFG_PCT': 'LEAGUE_EFG_PCT'}),
+                            on=zone_columns, how='left')
+    zone_df['EFG_PCT_DIFF'] = zone_df['EFG_PCT'] - zone_df['LEAGUE_EFG_PCT']
+    return zone_df
@@ -0,0 +1,151 @@
+"""
+Similar player-seasons across seasons. Every player-season is a vector of per 100 possessions stats (so seasons with a
+different pace are comparable), standardized over all the player-seasons in the index. The most similar player-seasons
+are the ones with the highest cosine similarity - a single matrix-vector product over all of them.
+"""
+from typing import Optional
+
+import numpy as np
+from pandas import DataFrame
+
+import nameIndexScripts
+import normalizationScripts
+from my_exceptions import NoStatDf
+
+similarity_stats = ['FGM',
+                    'FGA',
+                    'FG3M',
+                    'FG3A',
+                    'FTM',
+                    'FTA',
+                    'OREB',
+                    'DREB',
+                    'AST',
+                    'TOV',
+                    'STL',
+                    'BLK',
+                    'PF',
+                    'PTS',
+                    ]
+
+
+def get_league_pace(features_df: DataFrame) -> float:
+    """
+    :param features_df: The league's players features df of a single season
+    :return: The number of possessions of a team in 48 minutes - the possessions of all the players (see
+    normalizationScripts.get_possessions), over the number of team games (all the minutes, divided by 5 players and 48
+    minutes)
+    """
+    possessions = normalizationScripts.get_possessions(
+        features_df[['FGA', 'OREB', 'TOV', 'FTA']].astype(np.float64))
+    return possessions.sum() / (features_df['MIN'].sum() / 5 / 48)
+
+
+def get_per_100_possessions_df(features_df: DataFrame, stats: Optional[list[str]] = None) -> DataFrame:
+    """
+    :param features_df: The league's players features df of a single season
+    :param stats: The stats to convert. similarity_stats by default
+    :return: The stats of every player per 100 of the possessions he played (estimated from his minutes and the
+    league's pace)
+    """
+    stats = similarity_stats if stats is None else stats
+    possessions_played = features_df['MIN'].to_numpy(dtype=np.float64) / 48 * get_league_pace(features_df)
+    stats_values = features_df[stats].to_numpy(dtype=np.float64)
+    per_100_possessions = np.divide(100 * stats_values, possessions_played[:, None],
+                                    out=np.zeros_like(stats_values), where=possessions_played[:, None] > 0)
+    return DataFrame(per_100_possessions, index=features_df.index, columns=stats)
+
+
+class SimilarityIndex:
+    """
+    An index of player-season vectors. Seasons can be added at any time - the standardization statistics are updated
+    with running sums, and the normalized matrix is rebuilt only on the next query
+    """
+
+    def __init__(self, stats: Optional[list[str]] = None, minutes_limit: float = 500):
+        """
+
+        :param stats: The stats of the vectors. similarity_stats by default
+        :param minutes_limit: Player-seasons with less minutes are not added to the index
+        """
+        self.stats = similarity_stats if stats is None else stats
+        self.minutes_limit = minutes_limit
+        self._vectors_blocks: list[np.ndarray] = []
+        self._player_ids_blocks: list[np.ndarray] = []
+        self._seasons_blocks: list[np.ndarray] = []
+        self.seasons: list[str] = []
+        self._position_by_key: dict[tuple[int, str], int] = {}
+        self._sum = np.zeros(len(self.stats))
+        self._sum_of_squares = np.zeros(len(self.stats))
+        self._normalized_vectors: Optional[np.ndarray] = None
+        self._player_ids: Optional[np.ndarray] = None
+        self._seasons: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._position_by_key)
+
+    def __contains__(self, key: tuple[int, str]) -> bool:
+        return key in self._position_by_key
+
+    def add_season(self, season: str, features_df: DataFrame) -> None:
+        """
+        :param season: The season of the features df
+        :param features_df: The league's players features df of the season
+        """
+        if season in self.seasons:
+            raise ValueError(f'{season} is already in the index')
+        is_over_minutes_limit = features_df['MIN'].to_numpy(dtype=np.float64) > self.minutes_limit
+        vectors = get_per_100_possessions_df(features_df, self.stats).to_numpy()[is_over_minutes_limit]
+        player_ids = features_df.index.to_numpy(dtype=np.int64)[is_over_minutes_limit]
+        for player_id in player_ids.tolist():
+            self._position_by_key[(player_id, season)] = len(self._position_by_key)
+        self.seasons.append(season)
+        self._vectors_blocks.append(vectors)
+        self._player_ids_blocks.append(player_ids)
+        self._seasons_blocks.append(np.full(len(player_ids), season, dtype=object))
+        self._sum += vectors.sum(axis=0)
+        self._sum_of_squares += (vectors ** 2).sum(axis=0)
+        self._normalized_vectors = None
+
+    def _build(self) -> None:
+        """ Standardizes all the vectors, and normalizes them to a length of 1 """
+        vectors = np.concatenate(self._vectors_blocks)
+        self._vectors_blocks = [vectors]
+        self._player_ids = np.concatenate(self._player_ids_blocks)
+        self._player_ids_blocks = [self._player_ids]
+        self._seasons = np.concatenate(self._seasons_blocks)
+        self._seasons_blocks = [self._seasons]
+        mean = self._sum / len(vectors)
+        std = np.sqrt(np.maximum(self._sum_of_squares / len(vectors) - mean ** 2, 0))
+        standardized_vectors = np.divide(vectors - mean, std, out=np.zeros_like(vectors), where=std > 0)
+        norms = np.linalg.norm(standardized_vectors, axis=1, keepdims=True)
+        self._normalized_vectors = np.divide(standardized_vectors, norms, out=np.zeros_like(vectors),
+                                             where=norms > 0)
+
+    def get_most_similar(self, player_id: int, season: str, top_k: int = 10) -> DataFrame:
+        """
+        :param player_id: The player's id
+        :param season: The season
+        :param top_k: The number of player-seasons to return
+        :return: The most similar player-seasons (without the player-season itself) - PLAYER_ID, PLAYER_NAME, SEASON
+        and SIMILARITY (cosine similarity, between -1 and 1), sorted
+        """
+        if (player_id, season) not in self._position_by_key:
+            raise NoStatDf(f'{season} of {player_id} is not in the similarity index')
+        if self._normalized_vectors is None:
+            self._build()
+        position = self._position_by_key[(player_id, season)]
+        similarities = self._normalized_vectors @ self._normalized_vectors[position]
+        similarities[position] = -np.inf
+        top_k = min(top_k, len(similarities) - 1)
+        top_positions = np.argpartition(-similarities, top_k - 1)[:top_k] if top_k > 0 else np.array([], dtype=int)
+        top_positions = top_positions[np.argsort(-similarities[top_positions], kind='stable')]
+        players_name_index = nameIndexScripts.get_players_name_index()
+        top_player_ids = self._player_ids[top_positions]
+        return DataFrame({
+            'PLAYER_ID': top_player_ids,
+            'PLAYER_NAME': [players_name_index.get_name(top_player_id) if top_player_id in players_name_index else None
+                            for top_player_id in top_player_ids.tolist()],
+            'SEASON': self._seasons[top_positions],
+            'SIMILARITY': similarities[top_positions],
+        })
@@ -0,0 +1,101 @@
+"""
+How a team played with every pair (and trio) of its players on the court together, from its lineups. Every lineup is
+a row of a players membership matrix, so the stats of all the pairs are a single weighted product of the matrix with
+itself, instead of filtering the lineups once for every pair.
+"""
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+rating_columns = ['OFF_RATING', 'DEF_RATING', 'NET_RATING']
+
+
+def get_lineups_membership(lineups_df: DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    :param lineups_df: Lineups with a GROUP_ID column ('-id-id-id-id-id-', like TeamDashLineups)
+    :return: tuple of:
+        A (lineups x players) matrix of whether every player is in every lineup
+        The ids of the players, in the order of the columns
+    """
+    lineup_player_ids = lineups_df['GROUP_ID'].str.strip('-').str.split('-', expand=True).astype(np.int64).to_numpy()
+    player_ids, positions = np.unique(lineup_player_ids, return_inverse=True)
+    membership = np.zeros((len(lineups_df), len(player_ids)), dtype=np.float64)
+    np.put_along_axis(membership, positions.reshape(lineup_player_ids.shape), 1, axis=1)
+    return membership, player_ids
+
+
+def _get_weighted_rating(possessions_weighted_sum: np.ndarray, possessions: np.ndarray) -> np.ndarray:
+    """ The rating, from the sum of the ratings weighted by the possessions. NaN where there are no possessions """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(possessions > 0, possessions_weighted_sum / possessions, np.nan)
+
+
+def get_pairwise_synergy_matrices(lineups_df: DataFrame) -> dict[str, DataFrame]:
+    """
+    :param lineups_df: The lineups of a team, with GROUP_ID, MIN, POSS and the rating columns
+    :return: A (players x players) df (indexed by the players ids) for MIN, POSS, and every rating (weighted by the
+    possessions) - of the lineups where both players were on the court. The diagonal is of every player by himself
+    """
+    membership, player_ids = get_lineups_membership(lineups_df)
+    possessions = lineups_df['POSS'].to_numpy(dtype=np.float64)
+    weights = {'MIN': lineups_df['MIN'].to_numpy(dtype=np.float64), 'POSS': possessions}
+    weights |= {rating_column: possessions * lineups_df[rating_column].to_numpy(dtype=np.float64)
+                for rating_column in rating_columns}
+    pair_sums = {column: membership.T @ (membership * column_weights[:, None])
+                 for column, column_weights in weights.items()}
+    pair_stats = {'MIN': pair_sums['MIN'], 'POSS': pair_sums['POSS']}
+    pair_stats |= {rating_column: _get_weighted_rating(pair_sums[rating_column], pair_sums['POSS'])
+                   for rating_column in rating_columns}
+    player_ids_index = pd.Index(player_ids, name='PLAYER_ID')
+    return {column: DataFrame(stat_matrix, index=player_ids_index, columns=player_ids_index)
+            for column, stat_matrix in pair_stats.items()}
+
+
+def get_pairwise_synergy_df(lineups_df: DataFrame) -> DataFrame:
+    """
+    :param lineups_df: The lineups of a team, with GROUP_ID, MIN, POSS and the rating columns
+    :return: A row for every pair of players that played together - PLAYER_ID_1, PLAYER_ID_2 (the smaller id first),
+    MIN, POSS and the ratings, sorted by the minutes
+    """
+    synergy_matrices = get_pairwise_synergy_matrices(lineups_df)
+    player_ids = synergy_matrices['MIN'].index.to_numpy()
+    first_positions, second_positions = np.triu_indices(len(player_ids), k=1)
+    minutes = synergy_matrices['MIN'].to_numpy()[first_positions, second_positions]
+    played_together = minutes > 0
+    first_positions, second_positions = first_positions[played_together], second_positions[played_together]
+    pairwise_synergy_df = DataFrame({'PLAYER_ID_1': player_ids[first_positions],
+                                     'PLAYER_ID_2': player_ids[second_positions]})
+    for column, synergy_matrix in synergy_matrices.items():
+        pairwise_synergy_df[column] = synergy_matrix.to_numpy()[first_positions, second_positions]
+    return pairwise_synergy_df.sort_values('MIN', ascending=False, kind='stable', ignore_index=True)
+
+
+def get_league_pairwise_synergy_df(lineups_df: DataFrame) -> DataFrame:
+    """
+    :param lineups_df: The lineups of any number of teams, with a TEAM_ID column
+    :return: The pairwise synergy rows (see get_pairwise_synergy_df) of every team, with a TEAM_ID column
+    """
+    return pd.concat([get_pairwise_synergy_df(team_lineups_df).assign(TEAM_ID=team_id)
+                      for team_id, team_lineups_df in lineups_df.groupby('TEAM_ID', sort=True)], ignore_index=True)
+
+
+def get_trio_synergy_tensor(lineups_df: DataFrame, column: str = 'NET_RATING') -> tuple[np.ndarray, np.ndarray]:
+    """
+    :param lineups_df: The lineups of a team, with GROUP_ID, MIN, POSS and the rating columns
+    :param column: MIN, POSS or one of the ratings
+    :return: tuple of:
+        A (players x players x players) array of the column in the lineups where all three players were on the court
+        (ratings are weighted by the possessions, and are NaN for trios that didn't play together)
+        The ids of the players, in the order of the axes
+    """
+    membership, player_ids = get_lineups_membership(lineups_df)
+    possessions = lineups_df['POSS'].to_numpy(dtype=np.float64)
+    if column in rating_columns:
+        lineup_values = possessions * lineups_df[column].to_numpy(dtype=np.float64)
+    else:
+        lineup_values = lineups_df[column].to_numpy(dtype=np.float64)
+    trio_sums = np.einsum('li,lj,lk,l->ijk', membership, membership, membership, lineup_values, optimize=True)
+    if column not in rating_columns:
+        return trio_sums, player_ids
+    trio_possessions = np.einsum('li,lj,lk,l->ijk', membership, membership, membership, possessions, optimize=True)
+    return _get_weighted_rating(trio_sums, trio_possessions), player_ids
@@ -5,15 +5,20 @@ import os
 from functools import cached_property
 from typing import Optional, Union
 
+import numpy as np
 from nba_api.stats.endpoints import TeamGameLogs, TeamYearByYearStats, TeamInfoCommon, CommonTeamRoster, \
     TeamDashPtShots, TeamDashPtReb, TeamDashPtPass, TeamDashLineups, TeamPlayerOnOffSummary
 from nba_api.stats.library.parameters import Season, MeasureTypeDetailedDefense
 from pandas import DataFrame
 
-import gameScripts
 import generalStatsScripts
 import leagueScripts
+import lineupArchetypeScripts
+import lineupStintsScripts
+import passingNetworkScripts
+import playerFeaturesScripts
 import playerScripts
+import synergyScripts
 import utilsScripts
 from my_exceptions import NoStatDashboard
 from playersContainerScripts import PlayersContainer
@@ -160,11 +165,11 @@ class NBATeam(generalStatsScripts.NBAStatObject, PlayersContainer):
 
     @cached_property
     def team_info(self) -> TeamInfoCommon:
+        # Only the season independent data (like MIN_YEAR and MAX_YEAR) is used, so it's shared by all the seasons
         kwargs = {
             'team_id': self.id,
-            'season_nullable': self.season
         }
-        return self.get_stat_class(stat_class_class_object=TeamInfoCommon, **kwargs)
+        return self.get_career_stat_class(stat_class_class_object=TeamInfoCommon, **kwargs)
 
     @cached_property
     def team_roster(self) -> CommonTeamRoster:
@@ -176,7 +181,7 @@ class NBATeam(generalStatsScripts.NBAStatObject, PlayersContainer):
 
     @cached_property
     def lineups(self) -> TeamDashLineups:
-        # TODO - THIS IS WRONG - Because I can only get 250 lineups at a time. Find a way to fix.
+        # Only the 250 lineups with the most minutes are returned. full_lineups_df has all of them
         kwargs = {
             'team_id': self.id,
             'season': self.season
@@ -202,7 +207,7 @@ class NBATeam(generalStatsScripts.NBAStatObject, PlayersContainer):
         kwargs = {
             'team_id': self.id
         }
-        return self.get_stat_class(stat_class_class_object=TeamYearByYearStats, **kwargs)
+        return self.get_career_stat_class(stat_class_class_object=TeamYearByYearStats, **kwargs)
 
     @cached_property
     def game_logs(self) -> TeamGameLogs:
@@ -241,13 +246,49 @@ class NBATeam(generalStatsScripts.NBAStatObject, PlayersContainer):
                 nba_player_object.current_team_object = self
                 players_objects_list.append(nba_player_object)
             except playerScripts.NoSuchPlayer:
-                self.logger.warning(
-                    "{player_name} was not found in leagues players, even though he's on the team roster".format(
-                        player_name=player_name))
+                self.logger.warning("%s was not found in leagues players, even though he's on the team roster",
+                                    player_name)
             except Exception as e:
                 raise e
         return players_objects_list
 
+    @property
+    def lineup_stints_df(self) -> DataFrame:
+        """ The team's stints from the league's lineup stints """
+        league_lineup_stints_df = self.current_league_object.league_lineup_stints_df
+        return league_lineup_stints_df[league_lineup_stints_df['TEAM_ID'] == self.id]
+
+    @cached_property
+    def full_lineups_df(self) -> DataFrame:
+        """ All of the team's lineups (not only 250 of them), aggregated from its lineup stints """
+        return lineupStintsScripts.get_lineups_df(self.lineup_stints_df)
+
+    def get_lineups_df(self, full_coverage: bool = False) -> DataFrame:
+        """
+        :param full_coverage: Whether to use all of the team's lineups (from the lineup stints) or only the ones of
+        TeamDashLineups
+        :return: The team's lineups with their advanced stats
+        """
+        if full_coverage:
+            return self.full_lineups_df
+        with self.reinitialize_class_with_new_parameters(
+                'lineups', measure_type_detailed_defense=MeasureTypeDetailedDefense.advanced
+        ):
+            return self.lineups.lineups.get_data_frame()
+
+    def get_pairwise_synergy_matrices(self, full_coverage: bool = False) -> dict[str, DataFrame]:
+        """ The team's stats with every pair of its players on the court together (see synergyScripts) """
+        return synergyScripts.get_pairwise_synergy_matrices(self.get_lineups_df(full_coverage=full_coverage))
+
+    def get_pairwise_synergy_df(self, full_coverage: bool = False) -> DataFrame:
+        """ A row for every pair of the team's players that played together (see synergyScripts) """
+        return synergyScripts.get_pairwise_synergy_df(self.get_lineups_df(full_coverage=full_coverage))
+
+    def get_trio_synergy_tensor(self, column: str = 'NET_RATING',
+                                full_coverage: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """ The team's stat with every trio of its players on the court together (see synergyScripts) """
+        return synergyScripts.get_trio_synergy_tensor(self.get_lineups_df(full_coverage=full_coverage), column=column)
+
     def get_filtered_lineup_df(
             self,
             lineups_df: DataFrame = DataFrame(),
@@ -267,10 +308,7 @@ class NBATeam(generalStatsScripts.NBAStatObject, PlayersContainer):
             ids_black_list = set()
 
         if lineups_df.empty:
-            with self.reinitialize_class_with_new_parameters(
-                    'lineups', measure_type_detailed_defense=MeasureTypeDetailedDefense.advanced
-            ):
-                lineups_df = self.lineups.lineups.get_data_frame()
+            lineups_df = self.get_lineups_df()
         valid_lineups_idx = (
             lineups_df.apply(
                 lambda lineup_row: utilsScripts.is_lineup_valid(lineup_row, ids_white_list, ids_black_list), axis=1
@@ -278,25 +316,45 @@ class NBATeam(generalStatsScripts.NBAStatObject, PlayersContainer):
         )
         return lineups_df[valid_lineups_idx]
 
-    def get_all_shooters_lineups_df(self, attempts_limit: int = 50) -> DataFrame:
-        non_shooter_player_ids = {player_object.id for player_object in self.current_players_objects
-                                  if not player_object.is_three_point_shooter(attempts_limit=attempts_limit)}
-        all_shooters_lineup_dicts = self.get_filtered_lineup_df(ids_black_list=non_shooter_player_ids)
-        return all_shooters_lineup_dicts
+    @property
+    def players_features_df(self) -> DataFrame:
+        return self.current_league_object.players_features_df
 
-    def get_all_time_game_objects(self, initialize_stat_classes=False):
-        """
+    @property
+    def league_shot_chart_df(self) -> DataFrame:
+        return self.current_league_object.league_shot_chart_df
 
-        :param initialize_stat_classes: Whether or not to initialize the stat classes for the game objects
-        :type initialize_stat_classes: bool
-        :return:
-        :rtype: list[NBAGamePlayer]
+    @property
+    def league_on_off_df(self) -> DataFrame:
+        return self.current_league_object.league_on_off_df
+
+    @property
+    def league_contested_shooting_df(self) -> DataFrame:
+        return self.current_league_object.league_contested_shooting_df
+
+    @property
+    def league_rapm_df(self) -> DataFrame:
+        return self.current_league_object.league_rapm_df
+
+    @property
+    def league_passing_network(self) -> passingNetworkScripts.PassingNetwork:
+        return self.current_league_object.league_passing_network
+
+    def get_league_minutes_split_per_df(self, minutes_limit: float = 30, games_limit: int = 20) -> DataFrame:
+        return self.current_league_object.get_league_minutes_split_per_df(minutes_limit=minutes_limit,
+                                                                          games_limit=games_limit)
+
+    def get_all_shooters_lineups_df(self, attempts_limit: int = 50, full_coverage: bool = False) -> DataFrame:
         """
-        # TODO - Check
-        player_all_time_game_logs = [game_log for game_log in self.get_all_time_game_logs()]
-        player_all_time_game_objects = [gameScripts.NBAGameTeam(game_log, initialize_stat_classes) for game_log in
-                                        player_all_time_game_logs]
-        return player_all_time_game_objects
+        :param attempts_limit: The number of attempted three's a player has to shot to count as a shooter
+        :param full_coverage: Whether to use all of the team's lineups (from the lineup stints) or only the ones of
+        TeamDashLineups
+        :return: The lineups where all the players are shooters
+        """
+        shooters_mask = playerFeaturesScripts.get_three_point_shooters_mask(self.players_features_df,
+                                                                           attempts_limit=attempts_limit)
+        return lineupArchetypeScripts.get_all_shooters_lineups_df(self.get_lineups_df(full_coverage=full_coverage),
+                                                                  shooters_mask)
 
     def get_pace(self):
         return self.year_by_year_stats.team_stats.get_data_frame()['PACE']
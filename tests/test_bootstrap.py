@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import bootstrapScripts
+import shotChartScripts
+
+
+@pytest.fixture
+def shooting_df() -> pd.DataFrame:
+    # Player 1 has few shots, player 2 has the same percentages on many more shots, and player 3 didn't shoot
+    yield pd.DataFrame({
+        'OPEN_FGM': [10, 500, 0],
+        'OPEN_FG3M': [4, 200, 0],
+        'OPEN_FGA': [20, 1000, 0],
+        'TIGHT_FGM': [8, 400, 0],
+        'TIGHT_FG3M': [2, 100, 0],
+        'TIGHT_FGA': [20, 1000, 0],
+    }, index=pd.Index([1, 2, 3], name='PLAYER_ID'))
+
+
+def test_get_efg_percentage_resamples(shooting_df: pd.DataFrame):
+    resamples = bootstrapScripts.get_efg_percentage_resamples(
+        shooting_df['OPEN_FGM'].to_numpy(), shooting_df['OPEN_FG3M'].to_numpy(), shooting_df['OPEN_FGA'].to_numpy(),
+        number_of_resamples=5000, random_generator=np.random.default_rng(0))
+    assert resamples.shape == (5000, 3)
+    assert resamples.mean(axis=0)[:2] == pytest.approx([0.6, 0.6], abs=0.01)
+    assert (resamples[:, 2] == 0).all()
+    # The EFG% of a resample can't be more than 1.5 (only made three pointers)
+    assert resamples.max() <= 1.5
+
+
+def test_get_efg_percentage_confidence_intervals_df(shooting_df: pd.DataFrame):
+    confidence_intervals_df = bootstrapScripts.get_efg_percentage_confidence_intervals_df(
+        shooting_df, prefix='OPEN_', random_generator=np.random.default_rng(0))
+    assert confidence_intervals_df['EFG_PCT'].tolist() == [0.6, 0.6, 0]
+    assert (confidence_intervals_df['EFG_PCT_LOW'] <= confidence_intervals_df['EFG_PCT']).all()
+    assert (confidence_intervals_df['EFG_PCT_HIGH'] >= confidence_intervals_df['EFG_PCT']).all()
+    interval_widths = confidence_intervals_df['EFG_PCT_HIGH'] - confidence_intervals_df['EFG_PCT_LOW']
+    # More shots - a narrower interval
+    assert interval_widths[1] > 4 * interval_widths[2]
+    assert interval_widths[3] == 0
+
+
+def test_get_efg_percentage_diff_confidence_intervals_df(shooting_df: pd.DataFrame):
+    confidence_intervals_df = bootstrapScripts.get_efg_percentage_diff_confidence_intervals_df(
+        shooting_df, 'OPEN_', 'TIGHT_', confidence_level=0.9, random_generator=np.random.default_rng(0))
+    assert confidence_intervals_df['EFG_PCT_DIFF'].tolist() == pytest.approx([0.15, 0.15, 0])
+    # The diff of the player with few shots is not significant, and the diff of the player with many shots is
+    assert confidence_intervals_df.loc[1, 'EFG_PCT_DIFF_LOW'] < 0 < confidence_intervals_df.loc[2, 'EFG_PCT_DIFF_LOW']
+    assert confidence_intervals_df.loc[2, 'EFG_PCT_DIFF_HIGH'] > 0.15
+
+
+def test_get_shooting_after_makes_df():
+    shot_chart_df = pd.DataFrame({
+        'GAME_ID': ['001', '001', '001', '001', '001', '001'],
+        'GAME_EVENT_ID': [1, 2, 3, 4, 5, 6],
+        'PLAYER_ID': [1, 1, 1, 1, 2, 2],
+        'SHOT_MADE_FLAG': [1, 1, 0, 1, 1, 1],
+        'SHOT_TYPE': ['2PT Field Goal', '3PT Field Goal', '2PT Field Goal', '3PT Field Goal',
+                      '2PT Field Goal', '3PT Field Goal'],
+    })
+    after_makes_df = bootstrapScripts.get_shooting_after_makes_df(shot_chart_df)
+    assert after_makes_df.loc[1].tolist() == [1, 1, 2]
+    assert after_makes_df.loc[2].tolist() == [1, 1, 1]
+
+
+def test_get_shooting_by_side_df():
+    shot_chart_df = pd.DataFrame({
+        'PLAYER_ID': [1, 1, 1, 2],
+        'SHOT_SIDE_CODE': [shotChartScripts.SHOT_SIDES.index(side) for side in ['Left', 'Left', 'Right', 'Right']],
+        'SHOT_MADE_FLAG': [1, 0, 1, 0],
+        'SHOT_TYPE': ['3PT Field Goal', '2PT Field Goal', '2PT Field Goal', '2PT Field Goal'],
+    })
+    sides_df = bootstrapScripts.get_shooting_by_side_df(shot_chart_df)
+    assert sides_df.loc[1, ['LEFT_FGM', 'LEFT_FG3M', 'LEFT_FGA']].tolist() == [1, 1, 2]
+    assert sides_df.loc[1, 'RIGHT_FGA'] == 1 and sides_df.loc[2, 'LEFT_FGA'] == 0
+    assert sides_df['CENTER_FGA'].tolist() == [0, 0]
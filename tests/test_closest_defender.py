@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+import closestDefenderScripts
+from generalStatsScripts import NBAStatObject
+
+
+@pytest.fixture
+def closest_defender_df() -> pd.DataFrame:
+    yield pd.DataFrame({
+        'PLAYER_ID': [1, 1, 1, 1, 2, 2],
+        'CLOSE_DEF_DIST_RANGE': closestDefenderScripts.close_def_dist_ranges + ['4-6 Feet - Open',
+                                                                                 '6+ Feet - Wide Open'],
+        'FGM': [2, 8, 20, 30, 5, 5],
+        'FGA': [10, 20, 50, 70, 10, 10],
+        'FG3M': [0, 4, 10, 20, 2, 2],
+    })
+
+
+def test_get_contested_shooting_df(closest_defender_df: pd.DataFrame):
+    contested_shooting_df = closestDefenderScripts.get_contested_shooting_df(closest_defender_df)
+    assert list(contested_shooting_df.index) == [1, 2]
+    assert list(contested_shooting_df['TIGHT_FGA']) == [30, 0]
+    assert list(contested_shooting_df['OPEN_FGA']) == [120, 20]
+    assert contested_shooting_df.loc[1, 'TIGHT_EFG_PCT'] == pytest.approx(12 / 30)
+    assert contested_shooting_df.loc[1, 'OPEN_EFG_PCT'] == pytest.approx(65 / 120)
+    assert contested_shooting_df.loc[1, 'EFG_PCT_DIFF'] == pytest.approx(65 / 120 - 12 / 30)
+    assert contested_shooting_df.loc[1, 'OPEN_FGA_PCT'] == pytest.approx(120 / 150)
+    # No contested shots - no diff
+    assert contested_shooting_df.loc[2, 'EFG_PCT_DIFF'] == 0
+    assert contested_shooting_df.loc[2, 'OPEN_FGA_PCT'] == 1
+
+
+def test_get_contested_shooting_df_with_one_distance_group(closest_defender_df: pd.DataFrame):
+    # Only open shots (like a single player with no contested shots, or an empty tight range request)
+    open_shots_df = closest_defender_df[closest_defender_df['PLAYER_ID'] == 2]
+    contested_shooting_df = closestDefenderScripts.get_contested_shooting_df(open_shots_df)
+    assert contested_shooting_df.loc[2, ['TIGHT_FGM', 'TIGHT_FGA', 'OPEN_FGA', 'FGA']].tolist() == [0, 0, 20, 20]
+    assert contested_shooting_df.loc[2, 'EFG_PCT_DIFF'] == 0
+
+    tight_shots_df = closest_defender_df[closest_defender_df['CLOSE_DEF_DIST_RANGE'].isin(
+        closestDefenderScripts.tight_close_def_dist_ranges)]
+    contested_shooting_df = closestDefenderScripts.get_contested_shooting_df(tight_shots_df)
+    assert contested_shooting_df.loc[1, ['TIGHT_FGA', 'OPEN_FGA', 'OPEN_FGA_PCT']].tolist() == [30, 0, 0]
+
+
+def test_groupby_defender_distance(closest_defender_df: pd.DataFrame):
+    player_df = closest_defender_df[closest_defender_df['PLAYER_ID'] == 2]
+    grouped_df = NBAStatObject.groupby_defender_distance(player_df)
+    assert grouped_df.loc['Tight', 'FGA'] == 0
+    assert grouped_df.loc['Open', 'FGM'] == 10
+    # The given df is not changed
+    assert 'DISTANCE_GROUP' not in player_df
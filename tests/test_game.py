@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from nba_api.stats.library.parameters import SeasonTypeAllStar
+
+import gameScripts
+import utilsScripts
+
+
+@pytest.fixture
+def game_table() -> gameScripts.GameTable:
+    games_df = pd.DataFrame({
+        'Player_ID': [201939] * 4,
+        'Game_ID': ['0022300001', '0022300002', '0022300003', '0022300004'],
+        'MIN': [36.5, 20.0, 18.25, 30.0],
+        'PTS': [23, 0, 7, 40],
+    })
+    yield gameScripts.GameTable(games_df, gameScripts.NBAGamePlayer)
+
+
+def test_game_table_records(game_table: gameScripts.GameTable):
+    assert len(game_table) == 4
+    assert list(game_table.games_df.columns[:2]) == ['PLAYER_ID', 'GAME_ID']
+    assert [game_record.game_id for game_record in game_table] == list(game_table.game_ids)
+    assert game_table[-1]['PTS'] == 40
+    with pytest.raises(IndexError):
+        game_table[4]
+
+
+def test_game_table_filter(game_table: gameScripts.GameTable):
+    over_30_minutes_games = game_table.filter(game_table.games_df['MIN'] >= 30)
+    assert list(over_30_minutes_games.game_ids) == ['0022300001', '0022300004']
+    assert over_30_minutes_games[1]['PTS'] == 40
+    assert len(game_table.filter_by_game_ids(['0022300002'])) == 1
+
+
+def test_game_record_to_game_object(game_table: gameScripts.GameTable):
+    game_object = game_table[0].to_game_object()
+    assert isinstance(game_object, gameScripts.NBAGamePlayer)
+    assert game_object.game_id == '0022300001'
+    assert game_object.player_id == 201939
+    # The game object works on a copy, and doesn't change the table
+    assert 'Game_ID' not in game_table.games_df
+
+
+def test_get_season_from_game_id():
+    assert gameScripts.get_season_from_game_id('0022300001') == '2023-24'
+    assert gameScripts.get_season_from_game_id('0049600001') == '1996-97'
+
+
+def test_game_table_is_national_tv_game(game_table: gameScripts.GameTable, monkeypatch):
+    requested_seasons = []
+
+    def get_season_broadcasts_df(season: str) -> pd.DataFrame:
+        requested_seasons.append(season)
+        return pd.DataFrame({
+            'GAME_ID': ['0022300001', '0022300002', '0022300004'],
+            'HOME_TEAM_ID': [1610612744] * 3,
+            'VISITOR_TEAM_ID': [1610612747] * 3,
+            'NATL_TV_BROADCASTER_ABBREVIATION': ['TNT', None, 'NBA TV'],
+        })
+
+    monkeypatch.setattr(gameScripts, 'get_season_broadcasts_df', get_season_broadcasts_df)
+    assert list(game_table.is_national_tv_game()) == [True, False, False, False]
+    assert list(game_table.is_national_tv_game(broadcasters_list=['NBA TV'])) == [False, False, False, True]
+    assert requested_seasons == ['2023-24', '2023-24']
+
+
+def test_add_game_context_columns():
+    game_logs_df = pd.DataFrame({
+        'PLAYER_ID': [1, 1, 1, 2],
+        'GAME_DATE': ['2023-10-30T00:00:00', '2023-10-24T00:00:00', '2023-10-25T00:00:00', '2023-10-27T00:00:00'],
+        'MATCHUP': ['GSW @ SAC', 'GSW vs. PHX', 'GSW @ SEA', 'LAL vs. PHX'],
+    })
+    context_df = gameScripts.add_game_context_columns(game_logs_df)
+    assert list(context_df['IS_HOME']) == [False, True, False, True]
+    assert list(context_df['OPPONENT_TEAM_ABBREVIATION']) == ['SAC', 'PHX', 'SEA', 'PHX']
+    assert context_df['OPPONENT_TEAM_ID'][1] == 1610612756
+    # Teams that don't exist anymore have no id in the static teams data
+    assert pd.isna(context_df['OPPONENT_TEAM_ID'][2])
+    assert context_df['REST_DAYS'][0] == 4
+    assert context_df['REST_DAYS'][2] == 0
+    # First games of every player have no rest days
+    assert pd.isna(context_df['REST_DAYS'][1]) and pd.isna(context_df['REST_DAYS'][3])
+
+
+def test_season_games_rest_days_across_season_types(monkeypatch):
+    season_types_games_dfs = {
+        SeasonTypeAllStar.regular: pd.DataFrame({'TEAM_ID': [1610612744, 1610612756], 'GAME_ID': ['0022300001'] * 2,
+                                                 'GAME_DATE': ['2024-04-14'] * 2,
+                                                 'MATCHUP': ['GSW @ PHX', 'PHX vs. GSW']}),
+        SeasonTypeAllStar.playoffs: pd.DataFrame({'TEAM_ID': [1610612744, 1610612756], 'GAME_ID': ['0042300001'] * 2,
+                                                  'GAME_DATE': ['2024-04-20'] * 2,
+                                                  'MATCHUP': ['GSW vs. PHX', 'PHX @ GSW']}),
+    }
+
+    def get_stat_class(stat_class_class_object, season, season_type_all_star):
+        return SimpleNamespace(league_game_log=SimpleNamespace(
+            get_data_frame=lambda: season_types_games_dfs[season_type_all_star].copy()))
+
+    monkeypatch.setattr(utilsScripts, 'get_stat_class', get_stat_class)
+    season_games = gameScripts.NBASingleSeasonGames(season='2023-24', include_playoffs=True)
+    playoff_games_df = season_games.games_df[season_games.games_df['GAME_ID'].astype(str) == '0042300001']
+    # The rest days of the first playoff game are counted from the last regular season game
+    assert playoff_games_df['REST_DAYS'].tolist() == [5, 5]
+
+
+@pytest.fixture
+def season_games() -> gameScripts.NBASingleSeasonGames:
+    games_df = pd.DataFrame({
+        'TEAM_ID': [1610612744, 1610612756, 1610612744, 1610612747, 1610612747, 1610612756],
+        'GAME_ID': ['0022300001', '0022300001', '0022300002', '0022300002', '0022300003', '0022300003'],
+        'GAME_DATE': ['2023-10-24', '2023-10-24', '2023-10-27', '2023-10-27', '2023-10-29', '2023-10-29'],
+        'MATCHUP': ['GSW @ PHX', 'PHX vs. GSW', 'GSW vs. LAL', 'LAL @ GSW', 'LAL vs. PHX', 'PHX @ LAL'],
+        'PTS': [108, 104, 122, 119, 100, 95],
+    })
+    # Raw league game logs, without the context columns
+    yield gameScripts.NBASingleSeasonGames(season='2023-24', games_df=games_df)
+
+
+def test_season_games_lookups(season_games: gameScripts.NBASingleSeasonGames):
+    assert list(season_games.get_game('0022300002').games_df['TEAM_ID']) == [1610612744, 1610612747]
+    assert len(season_games.get_game('0022300004')) == 0
+    assert list(season_games.get_specific_team_games(1610612744).game_ids) == ['0022300001', '0022300002']
+    assert list(season_games.get_specific_team_home_games(1610612744).game_ids) == ['0022300002']
+    assert list(season_games.get_specific_team_away_games(1610612744).game_ids) == ['0022300001']
+    assert list(season_games.get_specific_team_games(1610612756, date_from='2023-10-25').game_ids) == ['0022300003']
+    assert list(season_games.get_specific_team_games(1610612756, date_to='2023-10-25').game_ids) == ['0022300001']
+    assert len(season_games.get_specific_team_games(1610612756, date_from='2023-10-25', date_to='2023-10-26')) == 0
+
+
+def test_season_games_against_opponent(season_games: gameScripts.NBASingleSeasonGames):
+    assert list(season_games.games_df['OPPONENT_TEAM_ID'][:2]) == [1610612756, 1610612744]
+    lakers_against_suns = season_games.get_specific_team_games_against_opponent(1610612747, 1610612756)
+    assert list(lakers_against_suns.game_ids) == ['0022300003']
+    assert len(season_games.get_specific_team_games_against_opponent(1610612747, 1610612744)) == 1
+    assert len(season_games.get_specific_team_games_against_opponent(1610612744, 1610612747)) == 1
+    assert len(season_games.get_specific_team_games_against_opponent(1610612744, 1610612760)) == 0
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+import lineupArchetypeScripts
+
+
+@pytest.fixture
+def classified_lineups_df() -> pd.DataFrame:
+    lineups_df = pd.DataFrame({
+        'TEAM_ID': [10, 10, 20],
+        'GROUP_ID': ['-1-2-3-4-5-', '-1-2-3-4-6-', '-11-12-13-14-15-'],
+        'MIN': [100.0, 50.0, 20.0],
+        'POSS': [200.0, 100.0, 40.0],
+        'OFF_RATING': [120.0, 100.0, 90.0],
+        'DEF_RATING': [100.0, 110.0, 100.0],
+        'NET_RATING': [20.0, -10.0, -10.0],
+    })
+    player_masks = {
+        'SHOOTERS': pd.Series({1: True, 2: True, 3: True, 4: True, 5: True, 6: False, 11: True}),
+        'BIGS': pd.Series({5: True, 6: True, 15: True}),
+    }
+    yield lineupArchetypeScripts.classify_lineups(lineups_df, player_masks)
+
+
+def test_classify_lineups(classified_lineups_df: pd.DataFrame):
+    assert list(classified_lineups_df['NUM_SHOOTERS']) == [5, 4, 1]
+    assert list(classified_lineups_df['NUM_BIGS']) == [1, 1, 1]
+    assert classified_lineups_df['ARCHETYPE'][0] == '5 SHOOTERS, 1 BIGS'
+
+
+def test_get_archetypes_stats_df(classified_lineups_df: pd.DataFrame):
+    archetypes_stats_df = lineupArchetypeScripts.get_archetypes_stats_df(classified_lineups_df)
+    assert len(archetypes_stats_df) == 3
+    assert list(archetypes_stats_df.columns[:3]) == ['TEAM_ID', 'ARCHETYPE', 'LINEUPS']
+
+    league_archetypes_stats_df = lineupArchetypeScripts.get_archetypes_stats_df(
+        classified_lineups_df, by_team=False, archetype_columns=['NUM_BIGS']).set_index('NUM_BIGS')
+    assert league_archetypes_stats_df.loc[1, 'LINEUPS'] == 3
+    assert league_archetypes_stats_df.loc[1, 'MIN'] == 170
+    assert league_archetypes_stats_df.loc[1, 'NET_RATING'] == pytest.approx((200 * 20 - 100 * 10 - 40 * 10) / 340)
+
+
+def test_get_all_shooters_lineups_df():
+    lineups_df = pd.DataFrame({
+        'TEAM_ID': [10, 10, 20],
+        'GROUP_ID': ['-1-2-3-4-5-', '-1-2-3-4-6-', '-11-12-13-14-15-'],
+        'MIN': [100.0, 50.0, 20.0],
+    })
+    # Player 6 is not a shooter, and players that are missing from the mask (no features) aren't either
+    shooters_mask = pd.Series({1: True, 2: True, 3: True, 4: True, 5: True, 6: False, 11: True})
+    all_shooters_lineups_df = lineupArchetypeScripts.get_all_shooters_lineups_df(lineups_df, shooters_mask)
+    assert all_shooters_lineups_df['GROUP_ID'].tolist() == ['-1-2-3-4-5-']
+    assert list(all_shooters_lineups_df.columns) == ['TEAM_ID', 'GROUP_ID', 'MIN']
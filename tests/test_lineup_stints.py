@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import lineupStintsScripts
+import schemaScripts
+import utilsScripts
+
+HOME_TEAM_ID = 10
+AWAY_TEAM_ID = 20
+
+
+@pytest.fixture
+def rotation_df() -> pd.DataFrame:
+    # Home players 1-6 (6 replaces 5 after 6 minutes), away players 11-15 play the whole first quarter
+    rotation_rows = [(HOME_TEAM_ID, True, player_id, 0, 7200) for player_id in [1, 2, 3, 4]]
+    rotation_rows += [(HOME_TEAM_ID, True, 5, 0, 3600), (HOME_TEAM_ID, True, 6, 3600, 7200)]
+    rotation_rows += [(AWAY_TEAM_ID, False, player_id, 0, 7200) for player_id in [15, 14, 13, 12, 11]]
+    rotation_df = pd.DataFrame(rotation_rows, columns=['TEAM_ID', 'IS_HOME', 'PERSON_ID', 'IN_TIME_REAL',
+                                                       'OUT_TIME_REAL'])
+    rotation_df.insert(0, 'GAME_ID', '0022300001')
+    yield rotation_df
+
+
+@pytest.fixture
+def play_by_play_df() -> pd.DataFrame:
+    columns = ['actionNumber', 'period', 'clock', 'teamId', 'actionType', 'isFieldGoal', 'shotResult', 'description',
+               'scoreHome', 'scoreAway']
+    yield pd.DataFrame([
+        (1, 1, 'PT12M00.00S', 0, 'period', 0, '', 'Start of 1st Period', '', ''),
+        (2, 1, 'PT11M30.00S', HOME_TEAM_ID, 'Made Shot', 1, 'Made', 'Jump Shot', '2', '0'),
+        (3, 1, 'PT11M00.00S', AWAY_TEAM_ID, 'Missed Shot', 1, 'Missed', 'MISS 3PT', '', ''),
+        (4, 1, 'PT10M58.00S', AWAY_TEAM_ID, 'Rebound', 0, '', 'REBOUND', '', ''),
+        (5, 1, 'PT10M50.00S', AWAY_TEAM_ID, 'Made Shot', 1, 'Made', '3PT Jump Shot', '2', '3'),
+        # Free throws at the substitution time are counted for the lineup of the foul
+        (6, 1, 'PT6M00.00S', HOME_TEAM_ID, 'Free Throw', 0, 'Made', 'Free Throw 1 of 1', '3', '3'),
+        (7, 1, 'PT5M00.00S', HOME_TEAM_ID, 'Turnover', 0, '', 'Bad Pass', '', ''),
+        (8, 1, 'PT1M00.00S', AWAY_TEAM_ID, 'Made Shot', 1, 'Made', 'Layup', '3', '5'),
+    ], columns=columns)
+
+
+def test_get_elapsed_time():
+    elapsed_time = lineupStintsScripts.get_elapsed_time(np.array([1, 4, 5]),
+                                                       pd.Series(['PT11M34.00S', 'PT00M00.00S', 'PT04M59.50S']))
+    assert list(elapsed_time) == [260, 28800, 28805]
+
+
+def test_get_game_stints_df(rotation_df: pd.DataFrame, play_by_play_df: pd.DataFrame):
+    stints_df = lineupStintsScripts.get_game_stints_df(rotation_df, play_by_play_df)
+    assert len(stints_df) == 4
+    home_stints_df = stints_df[stints_df['TEAM_ID'] == HOME_TEAM_ID]
+    assert home_stints_df[lineupStintsScripts.lineup_player_columns].values.tolist() == [[1, 2, 3, 4, 5],
+                                                                                         [1, 2, 3, 4, 6]]
+    assert list(home_stints_df['OPPONENT_P1']) == [11, 11]
+    assert list(home_stints_df['MIN']) == [6, 6]
+    assert list(home_stints_df['PTS_FOR']) == [3, 0]
+    assert list(home_stints_df['PTS_AGAINST']) == [3, 2]
+    # FGA + 0.44 * FTA + TOV
+    assert home_stints_df['POSS_FOR'].tolist() == pytest.approx([1.44, 1])
+    away_stints_df = stints_df[stints_df['TEAM_ID'] == AWAY_TEAM_ID]
+    # The offensive rebound continues the possession
+    assert away_stints_df['POSS_FOR'].tolist() == pytest.approx([1, 1])
+    assert list(away_stints_df['OPPONENT_P5']) == [5, 6]
+
+
+def test_get_lineups_df(rotation_df: pd.DataFrame, play_by_play_df: pd.DataFrame):
+    stints_df = schemaScripts.compact_stints_df(lineupStintsScripts.get_game_stints_df(rotation_df, play_by_play_df))
+    lineups_df = lineupStintsScripts.get_lineups_df(pd.concat([stints_df, stints_df.assign(GAME_ID='0022300002')]))
+    assert len(lineups_df) == 3
+    away_lineup = lineups_df[lineups_df['TEAM_ID'] == AWAY_TEAM_ID].iloc[0]
+    assert away_lineup['GROUP_ID'] == '-11-12-13-14-15-'
+    assert away_lineup['GP'] == 2
+    assert away_lineup['MIN'] == 24
+    assert away_lineup['OFF_RATING'] == pytest.approx(100 * 10 / 4)
+    assert away_lineup['DEF_RATING'] == pytest.approx(100 * 6 / 4.88)
+    assert away_lineup['PLUS_MINUS'] == 4
+
+
+def test_get_stints_df_skips_games_without_rotation(rotation_df: pd.DataFrame, play_by_play_df: pd.DataFrame,
+                                                    monkeypatch):
+    home_rotation_df, away_rotation_df = (rotation_df[rotation_df['IS_HOME'] == is_home].drop(columns='IS_HOME')
+                                          for is_home in [True, False])
+    empty_rotation_df = home_rotation_df.iloc[:0]
+    games_rotations = {
+        '0022300001': SimpleNamespace(home_team=SimpleNamespace(get_data_frame=lambda: home_rotation_df),
+                                      away_team=SimpleNamespace(get_data_frame=lambda: away_rotation_df)),
+        # A game with empty GameRotation data
+        '0022300002': SimpleNamespace(home_team=SimpleNamespace(get_data_frame=lambda: empty_rotation_df),
+                                      away_team=SimpleNamespace(get_data_frame=lambda: empty_rotation_df)),
+    }
+
+    def get_stat_classes_concurrently(stat_class_class_object, kwargs_list, max_workers):
+        if stat_class_class_object is lineupStintsScripts.GameRotation:
+            return [games_rotations[kwargs['game_id']] for kwargs in kwargs_list]
+        return [SimpleNamespace(play_by_play=SimpleNamespace(get_data_frame=lambda: play_by_play_df))
+                for _ in kwargs_list]
+
+    monkeypatch.setattr(utilsScripts, 'get_stat_classes_concurrently', get_stat_classes_concurrently)
+    stints_df = lineupStintsScripts.get_stints_df(['0022300002', '0022300001'])
+    assert stints_df['GAME_ID'].astype(str).unique().tolist() == ['0022300001']
+    assert len(stints_df) == 4
@@ -0,0 +1,37 @@
+import pytest
+
+import nameIndexScripts
+
+
+@pytest.fixture
+def name_index() -> nameIndexScripts.NameIndex:
+    yield nameIndexScripts.NameIndex([
+        ('Stephen Curry', 201939),
+        ('Seth Curry', 203552),
+        ('Nikola Jokić', 203999),
+        ("D'Angelo Russell", 1626156),
+        ('Mike James', 1628455),
+        ('Mike James', 2229),
+    ])
+
+
+def test_normalize_name():
+    assert nameIndexScripts.normalize_name('Nikola Jokić') == 'nikola jokic'
+    assert nameIndexScripts.normalize_name('stephen_curry') == 'stephen curry'
+    assert nameIndexScripts.normalize_name(" D'Angelo  Russell ") == 'dangelo russell'
+
+
+def test_find_ids(name_index: nameIndexScripts.NameIndex):
+    assert name_index.find_ids('nikola jokic') == {203999}
+    assert name_index.find_ids('stephen_curry') == {201939}
+    assert name_index.find_ids('Mike James') == {1628455, 2229}
+    # Start of the name or of one of its words
+    assert name_index.find_ids('curry') == {201939, 203552}
+    assert name_index.find_ids('step') == {201939}
+    # Misspelled
+    assert name_index.find_ids('Stepen Cury') == {201939}
+    assert name_index.find_ids('Dangello Rusel') == {1626156}
+    assert name_index.find_ids('Michael Jordan') == set()
+    assert name_index.find_ids('Stepen Cury', fuzzy=False) == set()
+    assert name_index.find_ids('curry', ids_subset={203552}) == {203552}
+    assert name_index.get_name(203999) == 'Nikola Jokić'
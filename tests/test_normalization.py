@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import normalizationScripts
+import utilsScripts
+
+
+@pytest.fixture
+def game_logs_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        'GAME_ID': ['0022300001', '0022300002', '0022300003'],
+        'WL': ['W', 'L', 'W'],
+        'MIN': [36, 0, 18],
+        'FGM': [10, 0, 3],
+        'FGA': [20, 1, 6],
+        'FG3M': [2, 0, 1],
+        'FTM': [1, 0, 0],
+        'FTA': [2, 0, 0],
+        'OREB': [1, 0, 1],
+        'TOV': [2, 0, 1],
+        'PTS': [23, 0, 7],
+        'PLUS_MINUS': [5, -1, 2],
+    })
+
+
+def test_per_36(game_logs_df):
+    per_36_df = normalizationScripts.get_per_36_stats(game_logs_df)
+    # Game with no minutes is dropped
+    assert len(per_36_df) == 2
+    assert per_36_df['PTS'].tolist() == [23, 14]
+    # Minutes and non counting stats are not normalized
+    assert per_36_df['MIN'].tolist() == [36, 18]
+    assert per_36_df['PLUS_MINUS'].tolist() == [5, 2]
+
+
+def test_per_game():
+    totals_df = pd.DataFrame({'GP': [10, 4], 'PTS': [200, 40], 'FG_PCT': [0.5, 0.4]})
+    per_game_df = normalizationScripts.get_per_game_stats(totals_df)
+    assert per_game_df['PTS'].tolist() == [20, 10]
+    assert per_game_df['FG_PCT'].tolist() == [0.5, 0.4]
+
+
+def test_per_100_possessions(game_logs_df):
+    per_100_df = normalizationScripts.get_per_100_possessions_stats(game_logs_df)
+    possessions = normalizationScripts.get_possessions(game_logs_df)
+    assert np.allclose(per_100_df['POSS'], possessions)
+    assert np.allclose(per_100_df['PTS'], game_logs_df['PTS'] / possessions * 100)
+
+
+def test_join_single_game_stats(game_logs_df):
+    joined_df = utilsScripts.join_single_game_stats(game_logs_df, per_36=True)
+    assert joined_df['NUM_OF_ITEMS'].item() == 2
+    assert joined_df['TOTAL_W'].item() == 2
+    assert joined_df['TOTAL_L'].item() == 0
+    assert joined_df['PTS'].item() == 18.5
+    assert joined_df['TOTAL_PLUS_MINUS'].item() == 7
+
+
+def test_join_single_game_stats_discards_game_context_columns(game_logs_df):
+    game_logs_df = game_logs_df.assign(IS_HOME=[True, False, True], REST_DAYS=[np.nan, 1, 2])
+    joined_df = utilsScripts.join_single_game_stats(game_logs_df)
+    assert 'IS_HOME' not in joined_df and 'REST_DAYS' not in joined_df
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+import onOffScripts
+
+
+def _get_court_df(court_status: str, net_ratings: list[float]) -> pd.DataFrame:
+    return pd.DataFrame({
+        'GROUP_SET': ['Players On/Off Court'] * 3,
+        'TEAM_ID': [10, 10, 20],
+        'TEAM_ABBREVIATION': ['AAA', 'AAA', 'BBB'],
+        'TEAM_NAME': ['A', 'A', 'B'],
+        'VS_PLAYER_ID': [1, 2, 1],
+        'VS_PLAYER_NAME': ['One, Player', 'Two, Player', 'One, Player'],
+        'COURT_STATUS': [court_status] * 3,
+        'MIN': [500.0, 1500.0, 300.0],
+        'NET_RATING': net_ratings,
+    })
+
+
+@pytest.fixture
+def on_off_df() -> pd.DataFrame:
+    yield onOffScripts.get_on_off_df(_get_court_df('On', [5.0, 2.0, -1.0]), _get_court_df('Off', [-3.0, 4.0, 1.0]))
+
+
+def test_get_on_off_df(on_off_df: pd.DataFrame):
+    assert list(on_off_df.columns) == ['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'ON_MIN', 'ON_NET_RATING', 'OFF_MIN',
+                                       'OFF_NET_RATING', 'MIN_DIFF', 'NET_RATING_DIFF']
+    assert list(on_off_df['NET_RATING_DIFF']) == [8.0, -2.0, -2.0]
+
+
+def test_get_on_off_leaderboard(on_off_df: pd.DataFrame):
+    leaderboard_df = onOffScripts.get_on_off_leaderboard(on_off_df, 'NET_RATING')
+    assert list(leaderboard_df['PLAYER_ID']) == [1, 2, 1]
+    assert list(leaderboard_df['RANK']) == [1, 2, 2]
+
+    # Only the most recent team of every player
+    leaderboard_df = onOffScripts.get_on_off_leaderboard(on_off_df, 'NET_RATING',
+                                                         team_id_by_player_id=pd.Series({1: 20, 2: 10}))
+    assert list(leaderboard_df['TEAM_ID']) == [10, 20]
+
+    leaderboard_df = onOffScripts.get_on_off_leaderboard(on_off_df, 'NET_RATING', ascending=True, top_k=1,
+                                                         eligibility_mask=pd.Series({1: True, 2: False}))
+    assert list(leaderboard_df['ON_NET_RATING']) == [-1.0]
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+import passingNetworkScripts
+
+
+def _get_passes_df(teammate_id_column: str, rows: list[tuple]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=['PLAYER_ID', 'TEAM_ID', teammate_id_column, 'PASS', 'AST', 'FGM', 'FGA', 'FG3M'])
+
+
+@pytest.fixture
+def passing_network() -> passingNetworkScripts.PassingNetwork:
+    passes_made_df = _get_passes_df('PASS_TEAMMATE_PLAYER_ID', [
+        (1, 10, 2, 300, 40, 50, 100, 10),
+        (1, 10, 3, 100, 60, 70, 120, 20),
+        (2, 10, 1, 250, 30, 40, 90, 0),
+        (3, 10, 1, 50, 10, 12, 20, 4),
+        # Player 4 played for two teams with player 1
+        (4, 10, 1, 20, 2, 3, 10, 1),
+        (4, 20, 1, 20, 3, 5, 10, 1),
+    ])
+    yield passingNetworkScripts.PassingNetwork(passingNetworkScripts.get_passes_edges_df(passes_made_df=passes_made_df))
+
+
+def test_top_partners(passing_network: passingNetworkScripts.PassingNetwork):
+    assert list(passing_network.player_ids) == [1, 2, 3, 4]
+    assert passing_network.get_top_partner(1, 'PASS', 'TO') == 2
+    assert passing_network.get_top_partner(1, 'AST', 'TO') == 3
+    assert passing_network.get_top_partner(1, 'PASS', 'FROM') == 2
+    assert passing_network.get_top_partner(2, 'PASS', 'FROM') == 1
+    # Player 4 didn't receive any passes
+    assert passing_network.get_top_partner(4, 'PASS', 'FROM') is None
+    assert passing_network.get_top_partner(5) is None
+
+
+def test_connections(passing_network: passingNetworkScripts.PassingNetwork):
+    assert passing_network.get_connection_stats(4, 1)['AST'] == 5
+    assert passing_network.get_connection_stats(2, 3)['PASS'] == 0
+    connections_df = passing_network.get_player_connections_df(1, direction='FROM')
+    assert list(connections_df['PASS_TEAMMATE_PLAYER_ID']) == [2, 3, 4]
+    assert list(connections_df['PASS']) == [250, 50, 40]
+
+
+def test_teammates_efg_percentage_from_passes(passing_network: passingNetworkScripts.PassingNetwork):
+    efg_df = passing_network.get_teammates_efg_percentage_from_passes_df()
+    assert efg_df.loc[1, 'FGA'] == 220
+    assert efg_df.loc[1, 'EFG_PCT'] == pytest.approx((120 + 0.5 * 30) / 220)
+    assert efg_df.loc[3, 'EFG_PCT'] == pytest.approx(14 / 20)
+
+
+def test_passes_edges_df_from_both_directions():
+    passes_made_df = _get_passes_df('PASS_TEAMMATE_PLAYER_ID', [(1, 10, 2, 300, 40, 50, 100, 10)])
+    passes_received_df = _get_passes_df('PASS_TEAMMATE_PLAYER_ID', [(1, 10, 2, 250, 30, 40, 90, 0)])
+    edges_df = passingNetworkScripts.get_passes_edges_df(passes_made_df=passes_made_df,
+                                                         passes_received_df=passes_received_df)
+    assert list(zip(edges_df['PASSER_ID'], edges_df['RECEIVER_ID'])) == [(1, 2), (2, 1)]
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import perScripts
+import utilsScripts
+
+league_per_factors = {'ASSIST_FACTOR': 0.6, 'PPP': 1.05, 'DREB_PCT': 0.75, 'FOUL_FACTOR': 0.4}
+
+
+class FakeLeague:
+    @staticmethod
+    def get_league_per_factors() -> dict[str, float]:
+        return league_per_factors
+
+
+class FakeTeam:
+    current_league_object = FakeLeague()
+
+    def __init__(self, teams_per_factors_df: pd.DataFrame, team_id: int):
+        self.id = team_id
+        self._team_factors = teams_per_factors_df.loc[[team_id]]
+
+    def get_assist_percentage(self) -> pd.Series:
+        return self._team_factors['AST_PCT']
+
+    def get_pace_adjustment(self) -> pd.Series:
+        return self._team_factors['PACE_ADJUSTMENT']
+
+
+@pytest.fixture
+def teams_per_factors_df() -> pd.DataFrame:
+    yield perScripts.get_teams_per_factors_df(
+        pd.DataFrame({'TEAM_ID': [1, 2], 'AST': [2000, 1500], 'FGM': [3200, 3000]}),
+        pd.DataFrame({'TEAM_ID': [1, 2], 'POSS': [8000, 8400], 'MIN': [3940, 3940], 'PACE': [97.5, 102.3]}))
+
+
+@pytest.fixture
+def game_logs_df() -> pd.DataFrame:
+    # Player 10 plays 25 long games and 25 short games, and is much better in the long ones. Player 20 plays only long
+    # games
+    random_generator = np.random.default_rng(0)
+    number_of_games = 50
+    game_logs_df = pd.DataFrame({
+        'PLAYER_ID': [10] * number_of_games + [20] * number_of_games,
+        'TEAM_ID': [1] * number_of_games + [2] * number_of_games,
+        'MIN': np.concatenate([np.tile([35, 20], number_of_games // 2), np.full(number_of_games, 36)]),
+    })
+    for stat in ['FGM', 'FG3M', 'FTM', 'OREB', 'DREB', 'AST', 'TOV', 'STL', 'BLK', 'PF']:
+        game_logs_df[stat] = random_generator.integers(0, 4, len(game_logs_df)).astype(np.int8)
+    game_logs_df.loc[game_logs_df['MIN'] == 35, 'FGM'] += 15
+    game_logs_df['FGA'] = (game_logs_df['FGM'] + random_generator.integers(0, 4, len(game_logs_df))).astype(np.int8)
+    game_logs_df['FG3A'] = (2 * game_logs_df['FG3M']).astype(np.int8)
+    game_logs_df['FTA'] = game_logs_df['FTM']
+    game_logs_df['REB'] = game_logs_df['OREB'] + game_logs_df['DREB']
+    game_logs_df['PTS'] = (2 * game_logs_df['FGM'] + game_logs_df['FG3M'] + game_logs_df['FTM']).astype(np.int16)
+    yield game_logs_df
+
+
+def test_get_aper(teams_per_factors_df: pd.DataFrame):
+    stats_df = pd.DataFrame(0, index=range(4), columns=['MIN', 'FG3M', 'AST', 'FGM', 'FTM', 'TOV', 'FGA', 'FTA',
+                                                        'REB', 'OREB', 'STL', 'BLK', 'PF'])
+    stats_df['TEAM_ID'] = [1, 2, 1, 1]
+    stats_df['MIN'] = [36, 36, 18, 0]
+    stats_df['FG3M'] = [36, 36, 0, 0]
+    stats_df['PF'] = [0, 0, 9, 0]
+    aper = perScripts.get_aper(stats_df, teams_per_factors_df, league_per_factors)
+    # A three pointer per minute is 1 before the pace adjustment
+    assert aper[:2].tolist() == pytest.approx(teams_per_factors_df.loc[[1, 2], 'PACE_ADJUSTMENT'].tolist())
+    assert aper[2] == pytest.approx(
+        -0.5 * league_per_factors['FOUL_FACTOR'] * teams_per_factors_df.loc[1, 'PACE_ADJUSTMENT'])
+    assert np.isnan(aper[3])
+
+
+def test_get_aper_from_stat_dict(teams_per_factors_df: pd.DataFrame, game_logs_df: pd.DataFrame):
+    player_game_logs_df = game_logs_df[game_logs_df['PLAYER_ID'] == 10].drop(columns='TEAM_ID')
+    stats_df = utilsScripts.join_single_game_stats(player_game_logs_df)
+    aper = utilsScripts.get_aPER_from_stat_dict(stats_df, FakeTeam(teams_per_factors_df, 2))
+    expected_aper = perScripts.get_aper(stats_df.assign(TEAM_ID=2), teams_per_factors_df, league_per_factors)
+    assert isinstance(aper, float)
+    assert aper == pytest.approx(expected_aper.item())
+
+
+def test_get_minutes_split_per_36_stats_df(game_logs_df: pd.DataFrame):
+    split_stats_df = perScripts.get_minutes_split_per_36_stats_df(game_logs_df, minutes_limit=30)
+    assert split_stats_df.loc[(10, True), 'GP'] == 25 and split_stats_df.loc[(10, False), 'GP'] == 25
+    assert split_stats_df.loc[(10, True), 'MIN'] == 25 * 35
+    long_games_df = game_logs_df[(game_logs_df['PLAYER_ID'] == 10) & (game_logs_df['MIN'] == 35)]
+    assert split_stats_df.loc[(10, True), 'PTS'] == pytest.approx(long_games_df['PTS'].sum() * 36 / (25 * 35))
+    assert (20, False) not in split_stats_df.index
+
+
+def test_get_minutes_split_per_df(teams_per_factors_df: pd.DataFrame, game_logs_df: pd.DataFrame):
+    player_team_ids = pd.Series([1, 2], index=[10, 20])
+    minutes_split_per_df = perScripts.get_minutes_split_per_df(game_logs_df, player_team_ids, teams_per_factors_df,
+                                                               league_per_factors, minutes_limit=30, games_limit=20)
+    # Player 20 has no games under the minutes limit
+    assert minutes_split_per_df.index.tolist() == [10]
+    assert minutes_split_per_df.loc[10, 'OVER_GP'] == 25 and minutes_split_per_df.loc[10, 'UNDER_GP'] == 25
+    assert minutes_split_per_df.loc[10, 'APER_DIFF'] > 0
+    assert minutes_split_per_df.loc[10, 'APER_DIFF'] == pytest.approx(
+        minutes_split_per_df.loc[10, 'OVER_APER'] - minutes_split_per_df.loc[10, 'UNDER_APER'])
+    # With a higher games limit nobody qualifies
+    assert perScripts.get_minutes_split_per_df(game_logs_df, player_team_ids, teams_per_factors_df,
+                                               league_per_factors, games_limit=30).empty
@@ -1,10 +1,14 @@
+from types import SimpleNamespace
+
 import numpy as np
+import pandas as pd
 import pytest
 from nba_api.stats.library.parameters import Season
 from nba_api.stats.static.players import find_player_by_id, find_players_by_full_name
 
-from my_exceptions import NoStatDashboard
-from playerScripts import NBAPlayer, PASS_OR_ASSIST, TO_OR_FROM
+import generalStatsScripts
+from my_exceptions import NoStatDashboard, NoSuchPlayer
+from playerScripts import NBAPlayer, NBAPlayerCareer, PASS_OR_ASSIST, TO_OR_FROM
 from tests.conftest import PLAYERS_TO_TEAM_COUNT
 
 
@@ -178,3 +182,43 @@ class TestRegression:
         except NoStatDashboard:
             pytest.skip("aPER only works for 1996-1997 season")
         print(aPER)
+
+
+def test_career_stat_classes_are_shared_between_seasons(monkeypatch):
+    requested_stat_classes = []
+
+    def get_stat_class(stat_class_class_object, custom_filters=None, **kwargs):
+        requested_stat_classes.append(stat_class_class_object)
+        return object()
+
+    monkeypatch.setattr('utilsScripts.get_stat_class', get_stat_class)
+    monkeypatch.setattr(generalStatsScripts, '_career_stat_classes_cache', {})
+    first_season_object = NBAPlayer(name_or_id=-1, season='2021-22', initialize_stat_classes=False)
+    second_season_object = NBAPlayer(name_or_id=-1, season='2022-23', initialize_stat_classes=False)
+    assert first_season_object.year_by_year_stats is second_season_object.year_by_year_stats
+    assert first_season_object.demographics is second_season_object.demographics
+    assert len(requested_stat_classes) == 2
+
+
+def test_career_seasons_do_not_cache_a_season_object(monkeypatch):
+    seasons_df = pd.DataFrame({'SEASON_ID': ['2001-02', '2002-03', '2002-03', '2003-04']})
+
+    def get_stat_class(stat_class_class_object, custom_filters=None, **kwargs):
+        return SimpleNamespace(season_totals_regular_season=SimpleNamespace(get_data_frame=lambda: seasons_df))
+
+    monkeypatch.setattr('utilsScripts.get_stat_class', get_stat_class)
+    monkeypatch.setattr(generalStatsScripts, '_career_stat_classes_cache', {})
+    player_career = NBAPlayerCareer(-1)
+    # A player who was traded has a row for every team in a season
+    assert player_career.seasons == ['2001-02', '2002-03', '2003-04']
+    assert player_career._season_objects == {}
+    assert [season_object.season for season_object in player_career] == ['2001-02', '2002-03', '2003-04']
+    assert Season.current_season not in player_career._season_objects
+
+
+def test_get_player_id_from_name_does_not_resolve_fuzzy_matches():
+    chris_paul_id = find_players_by_full_name('^Chris Paul$')[0]['id']
+    assert NBAPlayer._get_player_id_from_name('chris_paul') == chris_paul_id
+    # A similar name can be a different player, so it's only suggested
+    with pytest.raises(NoSuchPlayer, match='did you mean Chris Paul'):
+        NBAPlayer._get_player_id_from_name('Chris Paulson')
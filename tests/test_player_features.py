@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+import playerFeaturesScripts
+
+
+@pytest.fixture
+def features_df() -> pd.DataFrame:
+    game_logs_df = pd.DataFrame({
+        'PLAYER_ID': [1, 1, 1, 2, 2],
+        'TEAM_ID': [10, 10, 20, 30, 30],
+        'GAME_DATE': ['2023-10-24T00:00:00', '2023-10-26T00:00:00', '2023-12-01T00:00:00', '2023-10-24T00:00:00',
+                      '2023-10-25T00:00:00'],
+        'MIN': [30, 32, 35, 20, 10],
+        'AST': [5, 7, 9, 1, 0],
+        'FG3A': [10, 0, 30, 60, 1],
+    })
+    yield playerFeaturesScripts.get_players_features_df(game_logs_df)
+
+
+def test_get_players_features_df(features_df: pd.DataFrame):
+    assert features_df.loc[1, 'TEAM_ID'] == 20
+    assert features_df.loc[1, 'NUM_OF_TEAMS'] == 2
+    assert features_df.loc[1, 'GP'] == 3
+    assert features_df.loc[1, 'MIN'] == 97
+    assert features_df.loc[1, 'RECENT_TEAM_MIN'] == 35
+    assert features_df.loc[2, 'RECENT_TEAM_AST'] == 1
+
+
+def test_masks(features_df: pd.DataFrame):
+    assert playerFeaturesScripts.get_masked_player_ids(
+        playerFeaturesScripts.get_minutes_limit_mask(features_df, 40)) == {1}
+    assert playerFeaturesScripts.get_masked_player_ids(
+        playerFeaturesScripts.get_minutes_limit_mask(features_df, 40, only_recent_team=True)) == set()
+    assert playerFeaturesScripts.get_masked_player_ids(
+        playerFeaturesScripts.get_three_point_shooters_mask(features_df, attempts_limit=35)) == {1, 2}
+    assert playerFeaturesScripts.get_masked_player_ids(playerFeaturesScripts.get_single_team_mask(features_df)) == {2}
+
+
+def test_get_per_36_stat_limit_mask(features_df: pd.DataFrame):
+    # Player 1 - 21 assists in 97 minutes, player 2 - 1 assist in 30 minutes
+    assert list(playerFeaturesScripts.get_per_36_stat_limit_mask(features_df, 'AST', 5)) == [True, False]
+    assert list(playerFeaturesScripts.get_per_36_stat_limit_mask(features_df, 'AST', 1, minutes_limit=50)) == [True,
+                                                                                                             False]
@@ -0,0 +1,92 @@
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+
+import pandas as pd
+import pytest
+
+import utilsScripts
+from my_exceptions import PlayerHasNoTeam
+from playersContainerScripts import PlayersContainer
+
+
+@dataclass
+class FakePlayer:
+    id: int
+    name: str
+    minutes: int
+    plus_minus: float
+
+    def get_plus_minus(self) -> float:
+        if self.plus_minus is None:
+            raise PlayerHasNoTeam()
+        return self.plus_minus
+
+
+class FakePlayersContainer(utilsScripts.Loggable, PlayersContainer):
+    def __init__(self, players):
+        self._players = players
+
+    @property
+    def current_players_objects(self):
+        return self._players
+
+
+@pytest.fixture
+def players_container() -> FakePlayersContainer:
+    # Made up ids, so the names are taken from the objects
+    yield FakePlayersContainer([
+        FakePlayer(-1, 'first_player', 2000, 3.5),
+        FakePlayer(-2, 'second_player', 500, 10.0),
+        FakePlayer(-3, 'third_player', 1500, -2.0),
+        FakePlayer(-4, 'fourth_player', 1800, None),
+        FakePlayer(-5, 'fifth_player', 2500, 7.0),
+    ])
+
+
+def test_rank_players(players_container: FakePlayersContainer):
+    ranked_players_df = players_container.rank_players(
+        metric=FakePlayer.get_plus_minus,
+        players_filter=lambda player_object: player_object.minutes > 800,
+        sample_size=lambda player_object: player_object.minutes)
+    assert list(ranked_players_df['PLAYER_ID']) == [-5, -1, -3]
+    assert list(ranked_players_df['RANK']) == [1, 2, 3]
+    assert list(ranked_players_df['SAMPLE_SIZE']) == [2500, 2000, 1500]
+    assert ranked_players_df['PLAYER_NAME'][0] == 'fifth_player'
+
+
+def test_rank_players_top_k(players_container: FakePlayersContainer):
+    ranked_players_df = players_container.rank_players(metric=FakePlayer.get_plus_minus, top_k=2, ascending=True)
+    assert list(ranked_players_df['PLAYER_ID']) == [-3, -1]
+    assert list(ranked_players_df['RANK']) == [1, 2]
+
+
+def test_rank_players_eligibility_mask(players_container: FakePlayersContainer):
+    eligibility_mask = pd.Series([True, False, True], index=[-1, -3, -5])
+    ranked_players_df = players_container.rank_players(metric=FakePlayer.get_plus_minus,
+                                                       eligibility_mask=eligibility_mask)
+    assert list(ranked_players_df['PLAYER_ID']) == [-5, -1]
+
+
+def test_get_player_object_by_name_after_roster_change(players_container: FakePlayersContainer):
+    assert players_container.get_player_object_by_name('first_player').id == -1
+    players_container.current_players_objects.append(FakePlayer(-6, 'sixth_player', 1000, 1.0))
+    assert players_container.get_player_object_by_name('sixth_player').id == -6
+
+
+class SlowFakePlayer(FakePlayer):
+    # Every player waits for the other one inside its stat class, so they can only get it concurrently
+    barrier = threading.Barrier(2, timeout=5)
+
+    @cached_property
+    def stat_class(self) -> float:
+        self.barrier.wait()
+        return self.plus_minus
+
+
+def test_rank_players_prefetches_stat_classes_concurrently():
+    players_container = FakePlayersContainer([SlowFakePlayer(-1, 'first_player', 2000, 3.5),
+                                              SlowFakePlayer(-2, 'second_player', 500, 10.0)])
+    ranked_players_df = players_container.rank_players(metric=lambda player_object: player_object.stat_class,
+                                                       stat_classes_to_prefetch=['stat_class'], max_workers=2)
+    assert list(ranked_players_df['PLAYER_ID']) == [-2, -1]
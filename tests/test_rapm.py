@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import lineupStintsScripts
+import rapmScripts
+
+
+@pytest.fixture
+def stints_df() -> pd.DataFrame:
+    # Random lineups of 20 players, where player 0 adds 10 points per 100 possessions on offense, and player 1 allows 10
+    # more on defense
+    random_generator = np.random.default_rng(0)
+    number_of_stints = 4000
+    lineups = np.array([random_generator.choice(20, size=10, replace=False) for _ in range(number_of_stints)])
+    possessions = np.full(number_of_stints, 10.0)
+    points_per_possession = (1.1 + 0.1 * (lineups[:, :5] == 0).any(axis=1) + 0.1 * (lineups[:, 5:] == 1).any(axis=1) +
+                             random_generator.normal(0, 0.1, number_of_stints))
+    stints_df = pd.DataFrame(lineups, columns=lineupStintsScripts.lineup_player_columns +
+                             lineupStintsScripts.opponent_lineup_player_columns)
+    stints_df['POSS_FOR'] = possessions
+    stints_df['PTS_FOR'] = points_per_possession * possessions
+    yield stints_df
+
+
+def test_get_rapm_design_matrix(stints_df: pd.DataFrame):
+    design_matrix, player_ids = rapmScripts.get_rapm_design_matrix(stints_df.head(2))
+    assert design_matrix.shape == (2, 2 * len(player_ids))
+    assert list(design_matrix.sum(axis=1).A1) == [10, 10]
+    first_offense_positions = np.searchsorted(player_ids, stints_df.loc[0, lineupStintsScripts.lineup_player_columns])
+    assert design_matrix[0, first_offense_positions].sum() == 5
+
+
+def test_get_rapm_df(stints_df: pd.DataFrame):
+    rapm_df = rapmScripts.get_rapm_df(stints_df, alpha=100)
+    assert rapm_df.loc[0, 'ORAPM'] == pytest.approx(10, abs=1)
+    assert rapm_df.loc[1, 'DRAPM'] == pytest.approx(-10, abs=1)
+    assert rapm_df.index[0] == 0 and rapm_df.index[-1] == 1
+    assert rapm_df['ORAPM'].drop([0]).abs().max() < 2.5
+    # Stronger regularization shrinks the estimates
+    assert rapmScripts.get_rapm_df(stints_df, alpha=100000).loc[0, 'ORAPM'] < rapm_df.loc[0, 'ORAPM']
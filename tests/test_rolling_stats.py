@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import rollingStatsScripts
+import schemaScripts
+
+
+@pytest.fixture
+def game_logs_df() -> pd.DataFrame:
+    # Two players with 12 games each, in a shuffled order (like the league's game logs, which are from the latest game)
+    random_generator = np.random.default_rng(0)
+    number_of_games = 12
+    game_dates = pd.date_range('2023-10-25', periods=number_of_games, freq='2D').strftime('%Y-%m-%dT00:00:00')
+    game_logs_df = pd.DataFrame({
+        'PLAYER_ID': np.repeat([1, 2], number_of_games),
+        'GAME_ID': [f'{game_number:010d}' for game_number in range(2 * number_of_games)],
+        'GAME_DATE': np.tile(game_dates, 2),
+    })
+    for stat in rollingStatsScripts.rolling_stats:
+        game_logs_df[stat] = random_generator.integers(0, 20, len(game_logs_df))
+    game_logs_df['FGA'] = game_logs_df['FGM'] + game_logs_df['FG3A']
+    game_logs_df['PTS'] = random_generator.integers(30, 60, len(game_logs_df))
+    game_logs_df = schemaScripts.compact_game_logs_df(game_logs_df)
+    yield game_logs_df.sample(frac=1, random_state=0)
+
+
+def test_get_rolling_stats_df(game_logs_df: pd.DataFrame):
+    rolling_stats_df = rollingStatsScripts.get_rolling_stats_df(game_logs_df, window=5)
+    assert rolling_stats_df['PLAYER_ID'].tolist() == [1] * 12 + [2] * 12
+    assert rolling_stats_df['GP'].tolist() == [1, 2, 3, 4] + [5] * 8 + [1, 2, 3, 4] + [5] * 8
+
+    expected_df = game_logs_df.sort_values(['PLAYER_ID', 'GAME_DATE'])
+    expected_rolling_sums = expected_df.groupby('PLAYER_ID')[['PTS', 'FGA']].rolling(5, min_periods=1).sum()
+    assert rolling_stats_df['PTS'].tolist() == expected_rolling_sums['PTS'].tolist()
+    assert rolling_stats_df['PTS_MEAN'].tolist() == pytest.approx(
+        (expected_rolling_sums['PTS'] / rolling_stats_df['GP'].to_numpy()).tolist())
+    # Stats are accumulated without overflowing the compact dtypes
+    assert rolling_stats_df['PTS'].max() > np.iinfo(game_logs_df['PTS'].dtype).max
+
+    last_row = rolling_stats_df.iloc[-1]
+    assert last_row['EFG_PCT'] == pytest.approx((last_row['FGM'] + 0.5 * last_row['FG3M']) / last_row['FGA'])
+    assert last_row['TS_PCT'] == pytest.approx(last_row['PTS'] / (2 * (last_row['FGA'] + 0.44 * last_row['FTA'])))
+
+
+def test_get_recent_form_df(game_logs_df: pd.DataFrame):
+    recent_form_df = rollingStatsScripts.get_recent_form_df(game_logs_df, last_n_games=3, stats=['PTS'])
+    assert recent_form_df.index.tolist() == [1, 2]
+    last_games_df = game_logs_df[game_logs_df['PLAYER_ID'] == 2].sort_values('GAME_DATE').tail(3)
+    assert recent_form_df.loc[2, 'PTS'] == last_games_df['PTS'].sum()
+    assert recent_form_df.loc[2, 'GP'] == 3
+
+
+def test_rolling_stats_update(game_logs_df: pd.DataFrame):
+    expected_rolling_stats_df = rollingStatsScripts.get_rolling_stats_df(game_logs_df, window=4)
+    game_dates = game_logs_df['GAME_DATE'].astype(str)
+    rolling_stats = rollingStatsScripts.RollingStats(window=4)
+    # The games arrive in three batches
+    updated_rolling_stats_dfs = [rolling_stats.update(game_logs_df[(game_dates >= start) & (game_dates < end)])
+                                 for start, end in [('', '2023-10-31'), ('2023-10-31', '2023-11-10'),
+                                                    ('2023-11-10', '~')]]
+    updated_rolling_stats_df = pd.concat(updated_rolling_stats_dfs).loc[expected_rolling_stats_df.index]
+    pd.testing.assert_frame_equal(updated_rolling_stats_df[['GP', 'PTS', 'AST_MEAN', 'TS_PCT']],
+                                  expected_rolling_stats_df[['GP', 'PTS', 'AST_MEAN', 'TS_PCT']])
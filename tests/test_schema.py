@@ -0,0 +1,31 @@
+import pandas as pd
+
+import schemaScripts
+
+
+def test_compact_game_logs_df():
+    game_logs_df = pd.DataFrame({
+        'GAME_ID': ['0022300001', '0022300002', '0022300003', '0022300004'],
+        'WL': ['W', 'L', 'W', 'W'],
+        'MIN': [36.5, 20.0, 18.25, 30.0],
+        'PTS': [23, 0, 7, 40],
+    })
+    compact_df = schemaScripts.compact_game_logs_df(game_logs_df)
+    assert isinstance(compact_df['WL'].dtype, pd.CategoricalDtype)
+    # Unique values are left as is - categories would not save memory
+    assert not isinstance(compact_df['GAME_ID'].dtype, pd.CategoricalDtype)
+    assert compact_df['PTS'].dtype == 'int8'
+    assert compact_df['MIN'].dtype == 'float32'
+    assert (compact_df['PTS'] == game_logs_df['PTS']).all()
+
+    report_df = schemaScripts.get_memory_usage_report(game_logs_df, compact_df)
+    assert report_df.loc['TOTAL', 'COMPACT_BYTES'] < report_df.loc['TOTAL', 'ORIGINAL_BYTES']
+
+
+def test_concat_compact_dfs():
+    first_df = schemaScripts.compact_df(pd.DataFrame({'SHOT_TYPE': ['2PT Field Goal'] * 3, 'LOC_X': [1, 2, 3]}))
+    second_df = schemaScripts.compact_df(pd.DataFrame({'SHOT_TYPE': ['3PT Field Goal'] * 3, 'LOC_X': [1, 2, 300]}))
+    concatenated_df = schemaScripts.concat_compact_dfs([first_df, second_df])
+    assert isinstance(concatenated_df['SHOT_TYPE'].dtype, pd.CategoricalDtype)
+    assert set(concatenated_df['SHOT_TYPE'].cat.categories) == {'2PT Field Goal', '3PT Field Goal'}
+    assert concatenated_df['LOC_X'].dtype == 'int16'
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import shotChartScripts
+
+
+@pytest.fixture
+def shot_chart_df() -> pd.DataFrame:
+    # Two games for player 1 (make, make, miss, make | miss, miss) and one game for player 2 (miss, make)
+    return pd.DataFrame({
+        'GAME_ID': ['001', '001', '001', '001', '002', '002', '001', '001'],
+        'GAME_EVENT_ID': [1, 2, 3, 4, 1, 2, 5, 6],
+        'PLAYER_ID': [1, 1, 1, 1, 1, 1, 2, 2],
+        'SHOT_MADE_FLAG': [1, 1, 0, 1, 0, 0, 0, 1],
+        'SHOT_TYPE': ['2PT Field Goal', '3PT Field Goal', '2PT Field Goal', '3PT Field Goal',
+                      '2PT Field Goal', '2PT Field Goal', '3PT Field Goal', '3PT Field Goal'],
+    })
+
+
+def test_previous_shots_streaks(shot_chart_df):
+    streaks_df = shotChartScripts.get_previous_shots_streaks(shot_chart_df)
+    assert streaks_df['PREV_MAKES_STREAK'].tolist() == [0, 1, 2, 0, 0, 0, 0, 0]
+    assert streaks_df['PREV_MISSES_STREAK'].tolist() == [0, 0, 0, 1, 0, 1, 0, 1]
+
+
+def test_efg_percentage_by_previous_shots_results(shot_chart_df):
+    df = shotChartScripts.get_efg_percentage_by_previous_shots_results(shot_chart_df, max_number_of_previous_shots=2)
+    df = df.set_index(['PLAYER_ID', 'PREVIOUS_SHOTS_RESULT', 'NUMBER_OF_PREVIOUS_SHOTS'])
+    # Every shot which is not the first in its game comes after a make or a miss
+    assert df.loc[(1, 1, 1), 'FGA'] + df.loc[(1, 0, 1), 'FGA'] == 4
+    assert df.loc[(1, 1, 1), 'FGA'] == 2
+    assert df.loc[(1, 1, 1), 'EFG_PCT'] == 0.75
+    assert df.loc[(1, 1, 2), 'FGA'] == 1
+    assert df.loc[(1, 1, 2), 'EFG_PCT'] == 0
+    assert df.loc[(2, 0, 1), 'EFG_PCT'] == 1.5
+
+
+def test_zone_codes():
+    df = shotChartScripts.add_zone_codes(pd.DataFrame({
+        'SHOT_ZONE_AREA': ['Left Side(L)', 'Right Side Center(RC)', 'Center(C)', 'Back Court(BC)'],
+        'SHOT_DISTANCE': [23, 25, 0, 40],
+        'LOC_X': [-230, 150, 0, 10],
+        'LOC_Y': [30, 200, 0, 400],
+        'SHOT_MADE_FLAG': [1, 0, 1, 1],
+        'SHOT_TYPE': ['2PT Field Goal', '3PT Field Goal', '2PT Field Goal', '3PT Field Goal'],
+    }))
+    assert [shotChartScripts.SHOT_SIDES[code] for code in df['SHOT_SIDE_CODE']] == ['Left', 'Right', 'Center', 'Center']
+    assert [shotChartScripts.SHOT_DISTANCE_BANDS[code] for code in df['SHOT_DISTANCE_BAND_CODE']] == \
+           ['16-24 ft', '24+ ft', 'Less than 4 ft', '24+ ft']
+    loc_x, loc_y = shotChartScripts.get_hex_cell_centers(df['SHOT_HEX_CELL_CODE'].to_numpy())
+    assert (np.hypot(loc_x - df['LOC_X'], loc_y - df['LOC_Y']) <= shotChartScripts.HEX_CELL_SIZE).all()
+
+    side_df = shotChartScripts.get_efg_percentage_by_zone(df, 'SHOT_SIDE_CODE').set_index('SHOT_SIDE_CODE')
+    assert side_df['FGA'].sum() == len(df)
+    assert side_df.loc[shotChartScripts.SHOT_SIDES.index('Center'), 'EFG_PCT'] == 1.25
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import similarityScripts
+from my_exceptions import NoStatDf
+
+
+def _get_features_df(player_ids: list[int], stats_per_minute: np.ndarray, minutes: float = 2000) -> pd.DataFrame:
+    features_df = pd.DataFrame(stats_per_minute * minutes, columns=similarityScripts.similarity_stats,
+                               index=pd.Index(player_ids, name='PLAYER_ID'))
+    features_df['MIN'] = minutes
+    return features_df
+
+
+@pytest.fixture
+def features_dfs() -> dict[str, pd.DataFrame]:
+    random_generator = np.random.default_rng(0)
+    number_of_stats = len(similarityScripts.similarity_stats)
+    base_stats_per_minute = random_generator.uniform(0.05, 0.5, (30, number_of_stats))
+    # The players of the second season are the players of the first season, with slightly different stats
+    yield {'2000-01': _get_features_df(list(range(30)), base_stats_per_minute),
+           '2001-02': _get_features_df(list(range(100, 130)),
+                                       base_stats_per_minute * random_generator.uniform(0.98, 1.02, (30, 1)))}
+
+
+def test_get_per_100_possessions_df():
+    features_df = pd.DataFrame({'MIN': [240.0, 0.0], 'FGA': [100, 0], 'FTA': [0, 0], 'OREB': [0, 0],
+                                'TOV': [0, 0], 'PTS': [50, 0]})
+    assert similarityScripts.get_league_pace(features_df) == pytest.approx(100)
+    per_100_possessions_df = similarityScripts.get_per_100_possessions_df(features_df, ['PTS'])
+    # 240 minutes at a pace of 100 are 500 possessions
+    assert per_100_possessions_df['PTS'].tolist() == pytest.approx([10, 0])
+
+
+def test_similarity_index(features_dfs: dict[str, pd.DataFrame]):
+    similarity_index = similarityScripts.SimilarityIndex()
+    similarity_index.add_season('2000-01', features_dfs['2000-01'])
+    assert len(similarity_index) == 30 and (0, '2000-01') in similarity_index
+    most_similar_df = similarity_index.get_most_similar(0, '2000-01', top_k=5)
+    assert len(most_similar_df) == 5 and 0 not in most_similar_df['PLAYER_ID'].tolist()
+    assert most_similar_df['SIMILARITY'].is_monotonic_decreasing
+
+    # Adding a season updates the index - every player is the most similar to his own other season
+    similarity_index.add_season('2001-02', features_dfs['2001-02'])
+    assert len(similarity_index) == 60 and similarity_index.seasons == ['2000-01', '2001-02']
+    for player_id in range(30):
+        most_similar_df = similarity_index.get_most_similar(player_id, '2000-01', top_k=3)
+        assert most_similar_df.loc[0, 'PLAYER_ID'] == player_id + 100
+        assert most_similar_df.loc[0, 'SEASON'] == '2001-02'
+        assert most_similar_df.loc[0, 'SIMILARITY'] == pytest.approx(1, abs=0.01)
+
+    with pytest.raises(ValueError):
+        similarity_index.add_season('2001-02', features_dfs['2001-02'])
+    with pytest.raises(NoStatDf):
+        similarity_index.get_most_similar(0, '1999-00')
+
+
+def test_similarity_index_minutes_limit(features_dfs: dict[str, pd.DataFrame]):
+    features_df = features_dfs['2000-01'].copy()
+    features_df.loc[[0, 1], 'MIN'] = 100
+    similarity_index = similarityScripts.SimilarityIndex(minutes_limit=500)
+    similarity_index.add_season('2000-01', features_df)
+    assert len(similarity_index) == 28 and (0, '2000-01') not in similarity_index
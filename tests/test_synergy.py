@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import synergyScripts
+
+
+@pytest.fixture
+def lineups_df() -> pd.DataFrame:
+    yield pd.DataFrame({
+        'GROUP_ID': ['-1-2-3-4-5-', '-1-2-3-4-6-', '-2-3-4-5-7-'],
+        'MIN': [100.0, 50.0, 20.0],
+        'POSS': [200.0, 100.0, 40.0],
+        'OFF_RATING': [120.0, 100.0, 90.0],
+        'DEF_RATING': [100.0, 110.0, 100.0],
+        'NET_RATING': [20.0, -10.0, -10.0],
+    })
+
+
+def test_get_lineups_membership(lineups_df: pd.DataFrame):
+    membership, player_ids = synergyScripts.get_lineups_membership(lineups_df)
+    assert list(player_ids) == [1, 2, 3, 4, 5, 6, 7]
+    assert membership.sum(axis=1).tolist() == [5, 5, 5]
+    assert membership[:, 0].tolist() == [1, 1, 0]
+
+
+def test_get_pairwise_synergy_matrices(lineups_df: pd.DataFrame):
+    synergy_matrices = synergyScripts.get_pairwise_synergy_matrices(lineups_df)
+    assert synergy_matrices['MIN'].loc[1, 2] == 150
+    assert synergy_matrices['MIN'].loc[2, 5] == 120
+    assert synergy_matrices['MIN'].loc[5, 5] == 120
+    assert synergy_matrices['NET_RATING'].loc[1, 2] == pytest.approx((200 * 20 - 100 * 10) / 300)
+    assert synergy_matrices['NET_RATING'].loc[6, 2] == pytest.approx(-10)
+    assert np.isnan(synergy_matrices['NET_RATING'].loc[6, 7])
+
+
+def test_get_pairwise_synergy_df(lineups_df: pd.DataFrame):
+    pairwise_synergy_df = synergyScripts.get_pairwise_synergy_df(lineups_df)
+    # 10 pairs in the first lineup, 4 new ones in the second and 4 in the third
+    assert len(pairwise_synergy_df) == 18
+    assert (pairwise_synergy_df['PLAYER_ID_1'] < pairwise_synergy_df['PLAYER_ID_2']).all()
+    assert pairwise_synergy_df['MIN'].iloc[0] == 170
+
+    league_pairwise_synergy_df = synergyScripts.get_league_pairwise_synergy_df(
+        pd.concat([lineups_df.assign(TEAM_ID=10), lineups_df.head(1).assign(TEAM_ID=20)]))
+    assert league_pairwise_synergy_df['TEAM_ID'].value_counts().to_dict() == {10: 18, 20: 10}
+
+
+def test_get_trio_synergy_tensor(lineups_df: pd.DataFrame):
+    trio_minutes, player_ids = synergyScripts.get_trio_synergy_tensor(lineups_df, column='MIN')
+    assert trio_minutes.shape == (7, 7, 7)
+    assert trio_minutes[1, 2, 3] == 170
+    assert trio_minutes[0, 4, 5] == 0
+    trio_net_rating, _ = synergyScripts.get_trio_synergy_tensor(lineups_df)
+    assert trio_net_rating[0, 1, 4] == pytest.approx(20)
+    assert np.isnan(trio_net_rating[0, 4, 5])
@@ -3,52 +3,30 @@ All sort of util functions to help other classes with calculations
 """
 import collections
 import csv
-import functools
+import inspect
+import itertools
 import logging
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import cached_property
 # This import is only for type hinting, so I don't care it's private
 # noinspection PyProtectedMember
 from nba_api.stats.endpoints._base import Endpoint
 from pandas import DataFrame
+from pandas.api.types import is_numeric_dtype
 from typing import TypeVar, Optional
 
+import normalizationScripts
+import perScripts
+
 pickles_folder_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pythonPickles')
 csvs_folder_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'csvs')
 
-values_to_adjust_to_per_game_mode = ['AST',
-                                     'BLK',
-                                     'DREB',
-                                     'FG2A',
-                                     'FG2M',
-                                     'FG3A',
-                                     'FG3M',
-                                     'FGA',
-                                     'FGM',
-                                     'FTA',
-                                     'FTM',
-                                     'MIN',
-                                     'OREB',
-                                     'PF',
-                                     'PTS',
-                                     'REB',
-                                     'STL',
-                                     'TOV',
-                                     'D_FGA',
-                                     'D_FGM',
-                                     'PASS',
-                                     'C_DREB',
-                                     'C_OREB',
-                                     'C_REB',
-                                     'UC_DREB',
-                                     'UC_OREB',
-                                     'UC_REB',
-                                     ]
-
-
 class PrettyFloat(float):
     """
     A float that has a better print
@@ -58,100 +36,111 @@ class PrettyFloat(float):
         return "%0.2f" % self
 
 
+class _CustomFormatter(logging.Formatter):
+    grey = "\x1b[38;21m"
+    yellow = "\x1b[33;21m"
+    red = "\x1b[31;21m"
+    bold_red = "\x1b[31;1m"
+    reset = "\x1b[0m"
+    format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s (%(filename)s:%(lineno)d)"
+    datefmt = '%Y-%m-%d %H:%M:%S'
+
+    # Formatters are created once, and not for every record
+    FORMATTERS = {
+        logging.DEBUG: logging.Formatter(grey + format + reset, datefmt),
+        logging.INFO: logging.Formatter(grey + format + reset, datefmt),
+        logging.WARNING: logging.Formatter(yellow + format + reset, datefmt),
+        logging.ERROR: logging.Formatter(red + format + reset, datefmt),
+        logging.CRITICAL: logging.Formatter(bold_red + format + reset, datefmt)
+    }
+
+    def format(self, record):
+        return self.FORMATTERS.get(record.levelno, self.FORMATTERS[logging.INFO]).format(record)
+
+
+def _get_configured_logger() -> logging.Logger:
+    """ The project's logger. The handler is configured only once, no matter how many times this is called """
+    project_logger = logging.getLogger(__name__)
+    if not project_logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_CustomFormatter())
+        project_logger.addHandler(handler)
+        project_logger.setLevel(logging.INFO)
+        project_logger.propagate = False
+    return project_logger
+
+
+logger = _get_configured_logger()
+
+
 class Loggable:
     """
-    Class that can log
+    Class that can log. All the objects share the module's logger, so creating an object doesn't touch the logging
+    configuration.
     """
-    logger: logging.Logger = None
+    logger: logging.Logger = logger
 
-    class __CustomFormatter(logging.Formatter):
-        grey = "\x1b[38;21m"
-        yellow = "\x1b[33;21m"
-        red = "\x1b[31;21m"
-        bold_red = "\x1b[31;1m"
-        reset = "\x1b[0m"
-        format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s (%(filename)s:%(lineno)d)"
 
-        FORMATS = {
-            logging.DEBUG: grey + format + reset,
-            logging.INFO: grey + format + reset,
-            logging.WARNING: yellow + format + reset,
-            logging.ERROR: red + format + reset,
-            logging.CRITICAL: bold_red + format + reset
-        }
-
-        def format(self, record):
-            log_fmt = self.FORMATS.get(record.levelno)
-            formatter = logging.Formatter(log_fmt)
-            return formatter.format(record)
+def iterate_with_progress_log(iterable, description: str, total: Optional[int] = None,
+                              number_of_logs: int = 10, level: int = logging.INFO):
+    """
+    Iterates over the iterable, logging the progress only a few times (and not once for every item)
 
-    def __init__(self):
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(self.__CustomFormatter())
-        logging.basicConfig(level=logging.INFO,
-                            datefmt='%Y-%m-%d %H:%M:%S',
-                            handlers=[handler])
-        self.logger = logging.getLogger(__name__)
-
-
-def get_per_game_from_total_stats(stats_df: DataFrame):
-    if 'GP' in stats_df:
-        games_denominator = stats_df['GP']
-    elif 'G' in stats_df:
-        games_denominator = stats_df['G']
-    else:
-        raise Exception('No "games" value in dict')
+    :param iterable: The iterable to iterate over
+    :param description: The description of the items (for example - 'Player')
+    :param total: The number of items. Taken from the iterable if not given
+    :param number_of_logs: How many progress lines to log along the loop
+    :param level: The logging level of the progress lines
+    :return: The items of the iterable
+    """
+    if total is None:
+        total = len(iterable)
+    log_every = max(1, -(-total // number_of_logs))
+    is_enabled = logger.isEnabledFor(level)
+    for i, item in enumerate(iterable, start=1):
+        if is_enabled and (i % log_every == 0 or i == total):
+            logger.log(level, '%s %s/%s', description, i, total)
+        yield item
 
-    per_game_stat_df = stats_df.copy()
-    for k, v in per_game_stat_df.items():
-        if k in values_to_adjust_to_per_game_mode:
-            per_game_stat_df[k] = v / games_denominator
-        else:
-            per_game_stat_df[k] = v
 
-    return per_game_stat_df
+def get_per_game_from_total_stats(stats_df: DataFrame) -> DataFrame:
+    return normalizationScripts.get_per_game_stats(stats_df)
 
 
-def join_single_game_stats(game_logs_list, per_36=False):
+def join_single_game_stats(game_logs_df: DataFrame, per_36: bool = False) -> DataFrame:
     """
 
-    :param game_logs_list:
-    :type game_logs_list:list[dict]
+    :param game_logs_df: A df of game logs, where every row represents a single game
     :param per_36: Whether to measure all the relevant stats categories so they will be per 36 minutes
-    :type per_36: bool
-    :return:
-    :rtype: dict
+    :return: A single row df of the joined stats
     """
     keys_to_discard = ['GAME_DATE',
                        'Game_ID',
                        'GAME_ID',
                        'MATCHUP',
+                       'OPPONENT_TEAM_ABBREVIATION',
+                       'OPPONENT_TEAM_ID',
+                       'IS_HOME',
+                       'REST_DAYS',
                        'VIDEO_AVAILABLE',
                        'SEASON_ID'
                        ]
     keys_to_sum = ['PLUS_MINUS',
                    'WL']
     keys_to_take_first = ['Player_ID',
+                          'PLAYER_ID',
                           'SEASON_ID']
 
     percentage_keys_to_create_back = ['FG3_PCT',
                                       'FG_PCT',
                                       'FT_PCT']
+    if game_logs_df.empty:
+        return game_logs_df
     if per_36:
-        game_logs_to_remove = []
-        keys_to_not_divide = keys_to_discard + keys_to_sum + keys_to_take_first + percentage_keys_to_create_back + [
-            'MIN']
-        for game_log in game_logs_list:
-            if not game_log['MIN']:
-                game_logs_to_remove.append(game_log)
-            else:
-                for category_name, category_value in game_log.items():
-                    if category_name not in keys_to_not_divide:
-                        game_log[category_name] = (category_value / game_log['MIN']) * 36
-        for game_log in game_logs_to_remove:
-            game_logs_list.remove(game_log)
+        # Games with no minutes can't be normalized, so they are removed
+        game_logs_df = normalizationScripts.get_per_36_stats(game_logs_df, drop_zero_minutes=True)
 
-    combined_game_stats = join_stat_df(game_logs_list, keys_to_discard, keys_to_sum, keys_to_take_first,
+    combined_game_stats = join_stat_df(game_logs_df, keys_to_discard, keys_to_sum, keys_to_take_first,
                                        percentage_keys_to_create_back)
     return combined_game_stats
 
@@ -164,7 +153,17 @@ def join_stat_df(
         percentage_keys_to_create_back: Optional[list[str]] = None,
         wage_key: str = None
 ) -> DataFrame:
-    # TODO - Check!
+    """
+    Joins all the rows of a stat df into a single row, column by column
+
+    :param df: The stat df to join
+    :param keys_to_discard: Columns that will not appear in the joined df
+    :param keys_to_sum: Columns that will be summed (as TOTAL_<key>) rather than averaged
+    :param keys_to_take_first: Columns that will take the value of the first row
+    :param percentage_keys_to_create_back: Percentage columns that will be calculated from the joined makes/attempts
+    :param wage_key: If passed, averages are weighted by this column
+    :return: A single row df
+    """
     keys_to_discard = [] if keys_to_discard is None else keys_to_discard
     keys_to_sum = [] if keys_to_sum is None else keys_to_sum
     keys_to_take_first = [] if keys_to_take_first is None else keys_to_take_first
@@ -175,55 +174,41 @@ def join_stat_df(
     if df.empty:
         return df
 
-    dict1 = {}
-    for key in df.columns:
-        dict1[key] = []
-
-    for _, row in df.iterrows():
-        for key, value in row.items():
-            dict1[key].append(value)
-
-    dict2 = {}
-    for key, value in dict1.items():
-        value = [i for i in value if i is not None]
-        if not value:
-            dict2[key] = None
+    joined_stats = {}
+    for key, column in df.items():
+        column = column.dropna()
         if key in keys_to_discard or key.endswith('RANK'):  # Ranks averages are useless, so we discard them.
-            # dict1.pop(key)
             continue
+        elif column.empty:
+            joined_stats[key] = None
         elif key in keys_to_take_first:
-            dict2[key] = value[0]
+            joined_stats[key] = column.iloc[0]
         elif key in keys_to_sum:
-            # Can't use "sum" cause WL are strings
-            dict2['TOTAL_' + key] = functools.reduce(lambda x, y: x + y, value)
-        elif key not in percentage_keys_to_create_back and key is not wage_key:
+            if key == 'WL':
+                joined_stats['TOTAL_W'] = int((column == 'W').sum())
+                joined_stats['TOTAL_L'] = int((column == 'L').sum())
+            else:
+                joined_stats['TOTAL_' + key] = column.sum()
+        elif key not in percentage_keys_to_create_back and key != wage_key and is_numeric_dtype(column):
             if wage_key is None:
-                dict2[key] = functools.reduce(lambda x, y: x + y, value) / float(len(value))
+                joined_stats[key] = column.mean()
             else:
-                numerator = 0
-                divisor = 0
-                for index in range(number_of_entries):
-                    numerator += value[index] * dict1[wage_key][index]
-                    divisor += dict1[wage_key][index]
-                dict2[key] = numerator / divisor if divisor != 0 else 0
+                wages = df.loc[column.index, wage_key]
+                divisor = wages.sum()
+                joined_stats[key] = (column * wages).sum() / divisor if divisor != 0 else 0
 
     if wage_key:
-        dict2['TOTAL_' + wage_key] = sum(dict1[wage_key])
+        joined_stats['TOTAL_' + wage_key] = df[wage_key].sum()
 
     for key in percentage_keys_to_create_back:
-        try:
-            dict2[key] = dict2[key.replace('_PCT', 'M')] / float(dict2[key.replace('_PCT', 'A')])
-        except ZeroDivisionError:
-            dict2[key] = 0
-
-    if 'TOTAL_WL' in dict2.keys():
-        wins_and_losses = dict2.pop('TOTAL_WL')
-        dict2['TOTAL_W'] = wins_and_losses.count('W')
-        dict2['TOTAL_L'] = wins_and_losses.count('L')
+        makes_key, attempts_key = key.replace('_PCT', 'M'), key.replace('_PCT', 'A')
+        if makes_key in joined_stats and attempts_key in joined_stats:
+            attempts = joined_stats[attempts_key]
+            joined_stats[key] = joined_stats[makes_key] / float(attempts) if attempts else 0
 
-    dict2['NUM_OF_ITEMS'] = number_of_entries
+    joined_stats['NUM_OF_ITEMS'] = number_of_entries
 
-    return DataFrame({k: [v] for k, v in dict2.items()})
+    return DataFrame({k: [v] for k, v in joined_stats.items()})
 
 
 def join_advanced_lineup_df(lineups_df: DataFrame) -> DataFrame:
@@ -494,49 +479,17 @@ def get_most_recent_stat_dict(stats_df: DataFrame) -> Optional[DataFrame]:
 # noinspection PyPep8Naming
 def get_aPER_from_stat_dict(stat_df: DataFrame, team_object) -> float:
     """
-    :param stat_df:
-    :type stat_df: dict[str, float or str]
-    :param team_object:
+    :param stat_df: A single row stat df (of a player)
+    :param team_object: The team whose factors are used
     :type team_object: teamScripts.NBATeam
-    :return: The aPER, which is the PER measurement BEFORE normalization.
-    """
-    # TODO - Check
-    MIN = stat_df['MIN'].item()
-    FG3M = stat_df['FG3M'].item()
-    AST = stat_df['AST'].item()
-    FGM = stat_df['FGM'].item()
-    FTM = stat_df['FTM'].item()
-    TOV = stat_df['TOV'].item()
-    FGA = stat_df['FGA'].item()
-    FTA = stat_df['FTA'].item()
-    REB = stat_df['REB'].item()
-    OREB = stat_df['OREB'].item()
-    STL = stat_df['STL'].item()
-    BLK = stat_df['BLK'].item()
-    PF = stat_df['PF'].item()
-
-    team_ast_percentage = team_object.get_assist_percentage().item()
-    pace_adjustment = team_object.get_pace_adjustment().item()
-
-    league_ast_factor = team_object.current_league_object.get_league_assist_factor()
-    league_ppp = team_object.current_league_object.get_league_ppp()
-    league_dreb_percentage = team_object.current_league_object.get_league_defensive_reb_percentage()
-    league_foul_factor = team_object.current_league_object.get_league_foul_factor()
-
-    uPER = (1 / MIN) * (FG3M
-                        + (2 / 3) * AST
-                        + (2 - league_ast_factor * team_ast_percentage) * FGM
-                        + (FTM * 0.5 * (1 + (1 - team_ast_percentage) + (2 / 3) * team_ast_percentage))
-                        - league_ppp * TOV
-                        - league_ppp * league_dreb_percentage * (FGA - FGM)
-                        - league_ppp * 0.44 * (0.44 + (0.56 * league_dreb_percentage)) * (FTA - FTM)
-                        + league_ppp * (1 - league_dreb_percentage) * (REB - OREB)
-                        + league_ppp * league_dreb_percentage * OREB
-                        + league_ppp * STL
-                        + league_ppp * league_dreb_percentage * BLK
-                        - PF * league_foul_factor)
-
-    return uPER * pace_adjustment
+    :return: The aPER, which is the PER measurement BEFORE normalization (see perScripts.get_aper)
+    """
+    teams_per_factors_df = DataFrame({'AST_PCT': [team_object.get_assist_percentage().item()],
+                                      'PACE_ADJUSTMENT': [team_object.get_pace_adjustment().item()]},
+                                     index=[team_object.id])
+    league_per_factors = team_object.current_league_object.get_league_per_factors()
+    return perScripts.get_aper(stat_df.assign(TEAM_ID=team_object.id), teams_per_factors_df,
+                               league_per_factors).item()
 
 
 def get_season_from_year(year: int) -> str:
@@ -550,11 +503,15 @@ def get_season_from_year(year: int) -> str:
 
 
 class ActionGapManager:
-    """ This is due to the NBA API blocking us if we make requests too frequently. It's a cooldown mechanism"""
+    """
+    This is due to the NBA API blocking us if we make requests too frequently. It's a cooldown mechanism.
+    Thread safe - concurrent actions start at least a gap apart from each other, but can run at the same time.
+    """
 
     def __init__(self, gap=0.6):
         self.gap = gap
         self.last_action_time = None
+        self._lock = threading.Lock()
 
     def _wait_for_gap(self):
         if self.last_action_time is not None:
@@ -563,15 +520,18 @@ class ActionGapManager:
                 time.sleep(self.gap - elapsed_time)
 
     def _update_last_action_time(self):
-        self.last_action_time = time.time()
+        self.last_action_time = max(time.time(), self.last_action_time or 0)
 
     @contextmanager
     def action_gap(self):
         try:
-            self._wait_for_gap()
+            with self._lock:
+                self._wait_for_gap()
+                self._update_last_action_time()
             yield
         finally:
-            self._update_last_action_time()
+            with self._lock:
+                self._update_last_action_time()
 
 
 # This is for not overloading the NBA API and getting blocked
@@ -594,6 +554,50 @@ def get_stat_class(stat_class_class_object: type[T], custom_filters: list[tuple[
     return stat_class
 
 
+def get_stat_classes_concurrently(stat_class_class_object: type[T], kwargs_list: list[dict],
+                                  max_workers: int = 4) -> list[T]:
+    """
+    Requests the stat class with every kwargs in parallel. The requests still keep the gap between them, but don't
+    wait for each other's responses.
+
+    :param stat_class_class_object: The stat class to request
+    :param kwargs_list: The kwargs of every request
+    :param max_workers: The maximum number of requests that are sent at the same time
+    :return: The stat classes, in the order of the kwargs
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda kwargs: get_stat_class(stat_class_class_object, **kwargs), kwargs_list))
+
+
+
+def cache_properties_concurrently(objects: list, property_names: list[str],
+                                  ignored_exceptions: tuple[type[Exception], ...] = (), max_workers: int = 4) -> None:
+    """
+    Evaluates cached properties (usually stat classes) of all the objects in parallel, and caches them on the objects.
+    Before python 3.12 every cached_property holds a single lock for all of its instances, so getting it from several
+    threads waits for each other's requests - the functions of the properties are called directly instead.
+
+    :param objects: The objects (player objects, team objects...)
+    :param property_names: The names of the cached properties to evaluate for every object
+    :param ignored_exceptions: Objects whose property raises one of these exceptions are left without it
+    :param max_workers: The maximum number of properties that are evaluated at the same time
+    """
+    def cache_property(object_and_property_name: tuple) -> None:
+        any_object, property_name = object_and_property_name
+        if property_name in any_object.__dict__:
+            return
+        property_descriptor = inspect.getattr_static(any_object, property_name)
+        try:
+            if isinstance(property_descriptor, cached_property):
+                any_object.__dict__[property_name] = property_descriptor.func(any_object)
+            else:
+                getattr(any_object, property_name)
+        except ignored_exceptions:
+            pass
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(cache_property, itertools.product(objects, property_names)))
+
 def get_all_seasons_of_pickle_files() -> list[str]:
     pickle_files = os.listdir(pickles_folder_path)
     pattern = r"league_object_(\d{4}-\d{2}).pickle"